@@ -3,6 +3,8 @@ from backend.app.admin.iqos_admin_model import IqosAdmin
 from backend.app.admin.terea_admin_model import TereaAdmin
 from backend.app.admin.category_admin_madel import DevicesCategoryAdmin, IqosCategoryAdmin, TereaCategoryAdmin
 from backend.app.admin.orders_admin_model import OrdersAdmin, OrdersProductAdmin
+from backend.app.admin.customers_admin_model import CustomersAdmin
+from backend.app.admin.pool_stats_view import PoolStatsAdmin
 
 admin_views = [
     DevicesAdmin,
@@ -12,5 +14,7 @@ admin_views = [
     IqosCategoryAdmin,
     TereaCategoryAdmin,
     OrdersAdmin,
-    OrdersProductAdmin
+    OrdersProductAdmin,
+    CustomersAdmin,
+    PoolStatsAdmin
 ]
\ No newline at end of file
@@ -0,0 +1,42 @@
+import logging
+
+from backend.app.cache.catalog_cache import catalog_cache
+from backend.app.repositories.products_repository import ProductsRepository
+from backend.core.db_helper import db_helper
+from backend.core.models import (
+    DevicesModel, DevicesCategoryModel,
+    IqosModel, IqosCategoryModel,
+    TereaModel, TereaCategoryModel
+)
+
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_TYPES = {TereaModel: "terea", IqosModel: "iqos", DevicesModel: "devices"}
+CATEGORY_TYPES = {TereaCategoryModel: "terea", IqosCategoryModel: "iqos", DevicesCategoryModel: "devices"}
+
+
+class CatalogInvalidationMixin:
+    async def after_model_change(self, data, model, is_created, request):
+        await super().after_model_change(data, model, is_created, request)
+        db_helper.mark_written()
+        await self._sync_products(model)
+        await catalog_cache.invalidate()
+
+    async def after_model_delete(self, model, request):
+        await super().after_model_delete(model, request)
+        db_helper.mark_written()
+        await self._sync_products(model)
+        await catalog_cache.invalidate()
+
+    @staticmethod
+    async def _sync_products(model) -> None:
+        # Витрина Products обновляется после коммита админки; изменение уже сохранено, поэтому ошибку только логируем,
+        # а расхождение устранит полная сверка после пересборки снапшота
+        try:
+            if type(model) in PRODUCT_TYPES:
+                await ProductsRepository.sync_product(PRODUCT_TYPES[type(model)], model.id)
+            elif type(model) in CATEGORY_TYPES:
+                await ProductsRepository.sync_category(CATEGORY_TYPES[type(model)], model.id)
+        except Exception as error:
+            logger.error(f"Не удалось обновить витрину Products для {model}: {str(error)}", exc_info=True)
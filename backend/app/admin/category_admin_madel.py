@@ -1,9 +1,10 @@
 from sqladmin import ModelView
 
+from backend.app.admin.catalog_invalidation_mixin import CatalogInvalidationMixin
 from backend.core.models import DevicesCategoryModel, IqosCategoryModel, TereaCategoryModel
 
 
-class DevicesCategoryAdmin(ModelView, model=DevicesCategoryModel):
+class DevicesCategoryAdmin(CatalogInvalidationMixin, ModelView, model=DevicesCategoryModel):
     name = "Категории Devices"
     name_plural = "Таблица категорий Devices"
 
@@ -31,7 +32,7 @@ class DevicesCategoryAdmin(ModelView, model=DevicesCategoryModel):
     page_size_options = [10, 25, 50, 100]
 
 
-class IqosCategoryAdmin(ModelView, model=IqosCategoryModel):
+class IqosCategoryAdmin(CatalogInvalidationMixin, ModelView, model=IqosCategoryModel):
     name = "Категории Iqos"
     name_plural = "Таблица категорий Iqos"
 
@@ -59,7 +60,7 @@ class IqosCategoryAdmin(ModelView, model=IqosCategoryModel):
     page_size_options = [10, 25, 50, 100]
 
 
-class TereaCategoryAdmin(ModelView, model=TereaCategoryModel):
+class TereaCategoryAdmin(CatalogInvalidationMixin, ModelView, model=TereaCategoryModel):
     name = "Категории Terea"
     name_plural = "Таблица категорий Terea"
 
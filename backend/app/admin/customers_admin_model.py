@@ -0,0 +1,49 @@
+from sqladmin import ModelView
+
+from backend.core.models import CustomerModel
+
+
+class CustomersAdmin(ModelView, model=CustomerModel):
+    name = "Покупатель"
+    name_plural = "Таблица с покупателями"
+
+    column_list = [
+        CustomerModel.id,
+        CustomerModel.phone,
+        CustomerModel.orders_count,
+        CustomerModel.total_amount,
+        CustomerModel.first_order_at,
+        CustomerModel.last_order_at
+    ]
+
+    column_searchable_list = [CustomerModel.phone]
+    column_sortable_list = [
+        CustomerModel.id,
+        CustomerModel.orders_count,
+        CustomerModel.total_amount,
+        CustomerModel.first_order_at,
+        CustomerModel.last_order_at,
+    ]
+    column_default_sort = [(CustomerModel.last_order_at, True)]
+
+    column_formatters = {
+        CustomerModel.total_amount: lambda m, a: f"{m.total_amount:.2f}"
+    }
+
+    column_labels = {
+        CustomerModel.id: "ID",
+        CustomerModel.phone: "Номер телефона",
+        CustomerModel.orders_count: "Количество заказов",
+        CustomerModel.total_amount: "Сумма заказов",
+        CustomerModel.first_order_at: "Первый заказ",
+        CustomerModel.last_order_at: "Последний заказ",
+    }
+
+    # Счётчики ведёт API при создании заказа, поэтому таблица только для просмотра
+    can_create = False
+    can_edit = False
+    can_delete = False
+    can_view_details = True
+
+    page_size = 25
+    page_size_options = [10, 25, 50, 100]
@@ -1,10 +1,11 @@
 from sqladmin import ModelView
 
+from backend.app.admin.catalog_invalidation_mixin import CatalogInvalidationMixin
 from backend.core.models import DevicesModel
 from backend.core.models.emun_for_models import ENUM_COLORS
 
 
-class DevicesAdmin(ModelView, model=DevicesModel):
+class DevicesAdmin(CatalogInvalidationMixin, ModelView, model=DevicesModel):
     name = "Devices"
     name_plural = "Таблица Devices"
 
@@ -1,10 +1,11 @@
 from sqladmin import ModelView
 
+from backend.app.admin.catalog_invalidation_mixin import CatalogInvalidationMixin
 from backend.core.models import IqosModel
 from backend.core.models.emun_for_models import ENUM_COLORS
 
 
-class IqosAdmin(ModelView, model=IqosModel):
+class IqosAdmin(CatalogInvalidationMixin, ModelView, model=IqosModel):
     name = "Iqos"
     name_plural = "Таблица Iqos"
 
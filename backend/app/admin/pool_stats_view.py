@@ -0,0 +1,14 @@
+from sqladmin import BaseView, expose
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from backend.core.db_helper import db_helper
+
+
+class PoolStatsAdmin(BaseView):
+    name = "Пулы соединений"
+    icon = "fa-solid fa-database"
+
+    @expose("/pool-stats", methods=["GET"])
+    async def pool_stats(self, request: Request) -> JSONResponse:
+        return JSONResponse(db_helper.pool_stats())
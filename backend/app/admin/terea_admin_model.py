@@ -1,6 +1,7 @@
 from sqladmin import ModelView
 from wtforms import TextAreaField
 
+from backend.app.admin.catalog_invalidation_mixin import CatalogInvalidationMixin
 from backend.core.models import TereaModel
 from backend.core.models.emun_for_models import SET_FLAVORS
 
@@ -36,7 +37,7 @@ class MySQLSetField(TextAreaField):
             self.data = None
 
 
-class TereaAdmin(ModelView, model=TereaModel):
+class TereaAdmin(CatalogInvalidationMixin, ModelView, model=TereaModel):
     name = "Terea"
     name_plural = "Таблица Terea"
 
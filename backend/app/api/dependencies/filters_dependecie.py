@@ -0,0 +1,80 @@
+import decimal
+from typing import List
+
+from fastapi import Query
+
+from backend.app.api.schemas.filters_schemas import ProductFilters, SortEnum, FlavorEnum, ColorEnum
+from backend.app.api.schemas.terea_schemas import StrengthEnum
+
+
+def get_terea_filters(
+        search: str | None = Query(None, max_length=256, description="Поиск по названию"),
+        price_min: decimal.Decimal | None = Query(None, ge=0, description="Минимальная цена"),
+        price_max: decimal.Decimal | None = Query(None, ge=0, description="Максимальная цена"),
+        in_stock: bool | None = Query(None, description="Наличие: 1 - в наличии, 0 - нет"),
+        new: bool | None = Query(None, description="Только новинки"),
+        hit: bool | None = Query(None, description="Только хиты"),
+        category_id: int | None = Query(None, description="ID категории"),
+        sort: SortEnum = Query('id_desc', description="Сортировка"),
+        flavor: List[FlavorEnum] | None = Query(None, description="Вкус, можно несколько"),
+        strength: List[StrengthEnum] | None = Query(None, description="Крепость, можно несколько"),
+        country: List[str] | None = Query(None, description="Страна, можно несколько"),
+        brend: List[str] | None = Query(None, description="Бренд, можно несколько"),
+        has_capsule: bool | None = Query(None, description="С капсулой"),
+) -> ProductFilters:
+    return ProductFilters(
+        search=search, price_min=price_min, price_max=price_max, in_stock=in_stock, new=new, hit=hit,
+        category_id=category_id, sort=sort,
+        flavor=flavor, strength=strength, country=country, brend=brend, has_capsule=has_capsule
+    )
+
+
+def get_iqos_filters(
+        search: str | None = Query(None, max_length=256, description="Поиск по названию и модели"),
+        price_min: decimal.Decimal | None = Query(None, ge=0, description="Минимальная цена"),
+        price_max: decimal.Decimal | None = Query(None, ge=0, description="Максимальная цена"),
+        in_stock: bool | None = Query(None, description="Наличие: 1 - в наличии, 0 - нет"),
+        new: bool | None = Query(None, description="Только новинки"),
+        hit: bool | None = Query(None, description="Только хиты"),
+        category_id: int | None = Query(None, description="ID категории"),
+        sort: SortEnum = Query('id_desc', description="Сортировка"),
+        color: List[ColorEnum] | None = Query(None, description="Цвет, можно несколько"),
+        model: List[str] | None = Query(None, description="Модель, можно несколько"),
+) -> ProductFilters:
+    return ProductFilters(
+        search=search, price_min=price_min, price_max=price_max, in_stock=in_stock, new=new, hit=hit,
+        category_id=category_id, sort=sort,
+        color=color, model=model
+    )
+
+
+def get_devices_filters(
+        search: str | None = Query(None, max_length=256, description="Поиск по названию"),
+        price_min: decimal.Decimal | None = Query(None, ge=0, description="Минимальная цена"),
+        price_max: decimal.Decimal | None = Query(None, ge=0, description="Максимальная цена"),
+        in_stock: bool | None = Query(None, description="Наличие: 1 - в наличии, 0 - нет"),
+        new: bool | None = Query(None, description="Только новинки"),
+        hit: bool | None = Query(None, description="Только хиты"),
+        category_id: int | None = Query(None, description="ID категории"),
+        sort: SortEnum = Query('id_desc', description="Сортировка"),
+        color: List[ColorEnum] | None = Query(None, description="Цвет, можно несколько"),
+) -> ProductFilters:
+    return ProductFilters(
+        search=search, price_min=price_min, price_max=price_max, in_stock=in_stock, new=new, hit=hit,
+        category_id=category_id, sort=sort,
+        color=color
+    )
+
+
+def get_products_filters(
+        search: str | None = Query(None, max_length=256, description="Поиск по названию"),
+        price_min: decimal.Decimal | None = Query(None, ge=0, description="Минимальная цена"),
+        price_max: decimal.Decimal | None = Query(None, ge=0, description="Максимальная цена"),
+        in_stock: bool | None = Query(None, description="Наличие: 1 - в наличии, 0 - нет"),
+        new: bool | None = Query(None, description="Только новинки"),
+        hit: bool | None = Query(None, description="Только хиты"),
+        sort: SortEnum = Query('id_desc', description="Сортировка"),
+) -> ProductFilters:
+    return ProductFilters(
+        search=search, price_min=price_min, price_max=price_max, in_stock=in_stock, new=new, hit=hit, sort=sort
+    )
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Literal, Tuple
 
 from fastapi import Query
 
@@ -7,4 +7,20 @@ def get_pagination(
         skip: int = Query(0, ge=0, description="Количество пропущенных записей"),
         limit: int = Query(50, ge=1, le=1000, description="Лимит записей на странице")
 ) -> Tuple[int, int]:
-    return skip, limit
\ No newline at end of file
+    return skip, limit
+
+
+def get_cursor_pagination(
+        cursor: str | None = Query(None, description="Курсор из next_cursor предыдущей страницы, при нём skip игнорируется"),
+        with_total: bool = Query(True, description="Возвращать ли общее количество записей")
+) -> Tuple[str | None, bool]:
+    return cursor, with_total
+
+
+def get_projection(
+        view: Literal['full', 'card'] = Query('full', description="full - все поля, card - поля карточки без описания"),
+        fields: str | None = Query(None, description="Поля через запятую, например id,name,price; важнее view")
+) -> Tuple[str, List[str] | None]:
+    if fields is None:
+        return view, None
+    return view, [field.strip() for field in fields.split(",") if field.strip()]
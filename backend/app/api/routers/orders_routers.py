@@ -1,9 +1,10 @@
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header, Response
 from starlette import status
 
-from backend.app.api.schemas.orders_schemas import OrderResponse, OrderCreate
+from backend.app.api.schemas.orders_schemas import OrderResponse, OrderCreate, OrderIntakeResponse
+from backend.app.cache.idempotency_store import IdempotencyKeyReusedError, IdempotencyKeyInProgressError
 from backend.app.services.orders_services import OrdersService
 
 
@@ -12,12 +13,43 @@ router = APIRouter(prefix="/orders", tags=["Заказы"])
 
 
 @router.post("", summary="Создать новый заказ", status_code=status.HTTP_201_CREATED)
-async def create_order(order: OrderCreate) -> OrderResponse:
+async def create_order(
+        order: OrderCreate,
+        response: Response,
+        idempotency_key: str | None = Header(
+            None,
+            min_length=1,
+            max_length=255,
+            description="Ключ идемпотентности: повтор с тем же ключом вернёт исходный ответ, не создавая заказ заново"
+        )
+) -> OrderResponse | OrderIntakeResponse:
     logger.info(f"POST /orders запрос: создание заказа {order.model_dump()}")
     try:
-        result = await OrdersService.create_order(order)
-        logger.info(f"POST /orders успешно: заказ создан с ID {result.order.id}")
+        if idempotency_key is None:
+            status_code, result = await OrdersService.submit_order(order)
+        else:
+            status_code, result, replayed = await OrdersService.submit_order_once(order, idempotency_key)
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+        # В режиме журнала заказ только принят (202) и попадёт в БД фоновой выгрузкой
+        response.status_code = status_code
+        if isinstance(result, OrderIntakeResponse):
+            logger.info(f"POST /orders успешно: заказ принят в журнал {result.intake_id}")
+        else:
+            logger.info(f"POST /orders успешно: заказ создан с ID {result.order.id}")
         return result
+    except IdempotencyKeyReusedError as error:
+        logger.warning(f"POST /orders ключ идемпотентности использован повторно: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(error)
+        )
+    except IdempotencyKeyInProgressError as error:
+        logger.warning(f"POST /orders запрос с тем же ключом ещё выполняется: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(error)
+        )
     except ValueError as error:
         logger.warning(f"POST /orders ошибка валидации: {str(error)}")
         raise HTTPException(
@@ -1,17 +1,36 @@
 import logging
-from typing import Tuple
+from typing import List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from starlette import status
 
-from backend.app.api.dependencies.pagination_dependecie import get_pagination
+from backend.app.api.dependencies.filters_dependecie import (
+    get_terea_filters, get_iqos_filters, get_devices_filters, get_products_filters
+)
+from backend.app.api.dependencies.pagination_dependecie import get_pagination, get_cursor_pagination, get_projection
 from backend.app.api.schemas import (
-    GetDevicesResponse, GetDeviceByIdResponse,
-    GetIqosResponse, GetIqosByIdResponse,
-    GetTereaResponse, GetTereaByIdResponse,
-    GetAllProductsResponse
+    GetDevicesResponse, GetDevicesProjectionResponse, GetDeviceByIdResponse,
+    GetIqosResponse, GetIqosProjectionResponse, GetIqosByIdResponse,
+    GetTereaResponse, GetTereaProjectionResponse, GetTereaByIdResponse,
+    GetAllProductsResponse,
+    GetCategoriesResponse,
+    GetFacetsResponse,
+    GetProductByRefResponse,
+    GetProductsBatchRequest,
+    GetProductsBatchResponse,
+    GetProductsListResponse,
+    GetProductsRailResponse,
+    GetProductsSearchResponse,
+    GetStockRequest,
+    GetStockResponse,
+    GetSuggestResponse,
+    ProductTypeEnum
 )
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.app.cache.response_cache import response_cache
 from backend.app.services.products_service import DevicesService
+from backend.core.config import settings
 
 
 logger = logging.getLogger(__name__)
@@ -20,13 +39,27 @@ router = APIRouter(prefix="/products", tags=["Products"])
 
 
 @router.get("/devices", summary="Получить все девайсы с пагинацией")
-async def get_devices(pagination: Tuple[int, int] = Depends(get_pagination)) -> GetDevicesResponse:
+async def get_devices(
+        request: Request,
+        pagination: Tuple[int, int] = Depends(get_pagination),
+        filters: ProductFilters = Depends(get_devices_filters),
+        cursor_pagination: Tuple[str | None, bool] = Depends(get_cursor_pagination),
+        projection: Tuple[str, List[str] | None] = Depends(get_projection)
+) -> GetDevicesResponse | GetDevicesProjectionResponse:
     skip, limit = pagination
-    logger.info(f"GET /products/devices запрос: skip={skip}, limit={limit}")
+    cursor, with_total = cursor_pagination
+    view, fields = projection
+    logger.info(f"GET /products/devices запрос: skip={skip}, limit={limit}, cursor={cursor}, filters={filters}")
     try:
-        result = await DevicesService.get_devices(skip=skip, limit=limit)
-        logger.info(f"GET /products/devices успешно: {len(result.devices)} девайсов возвращено")
-        return result
+        response = await response_cache.get_or_build(
+            request,
+            lambda: DevicesService.get_devices(
+                skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total,
+                view=view, fields=fields
+            )
+        )
+        logger.info(f"GET /products/devices успешно")
+        return response
 
     except ValueError as error:
         logger.warning(f"GET /products/devices ошибка клиента: {str(error)}")
@@ -42,13 +75,83 @@ async def get_devices(pagination: Tuple[int, int] = Depends(get_pagination)) ->
         )
 
 
+@router.get("/devices/facets", summary="Получить счётчики фильтров девайсов для текущих фильтров")
+async def get_devices_facets(
+        request: Request,
+        filters: ProductFilters = Depends(get_devices_filters)
+) -> GetFacetsResponse:
+    logger.info(f"GET /products/devices/facets запрос: filters={filters}")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_facets("devices", filters))
+        logger.info(f"GET /products/devices/facets успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/devices/facets ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/devices/facets внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении фасетов"
+        )
+
+
+@router.get("/devices/categories/{category}", summary="Получить девайсов категории с пагинацией")
+async def get_devices_by_category(
+        request: Request,
+        category: int,
+        pagination: Tuple[int, int] = Depends(get_pagination),
+        filters: ProductFilters = Depends(get_devices_filters),
+        cursor_pagination: Tuple[str | None, bool] = Depends(get_cursor_pagination),
+        projection: Tuple[str, List[str] | None] = Depends(get_projection)
+) -> GetDevicesResponse | GetDevicesProjectionResponse:
+    skip, limit = pagination
+    cursor, with_total = cursor_pagination
+    view, fields = projection
+    logger.info(f"GET /products/devices/categories/{category} запрос: skip={skip}, limit={limit}, cursor={cursor}, filters={filters}")
+    try:
+        response = await response_cache.get_or_build(
+            request,
+            lambda: DevicesService.get_category_products(
+                "devices", category, skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total,
+                view=view, fields=fields
+            )
+        )
+        logger.info(f"GET /products/devices/categories/{category} успешно")
+        return response
+
+    except ValueError as error:
+        if "не найден" in str(error).lower():
+            logger.warning(f"GET /products/devices/categories/{category} категория не найдена")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Категория не найдена"
+            )
+
+        logger.warning(f"GET /products/devices/categories/{category} ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/devices/categories/{category} внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении девайсов категории"
+        )
+
+
 @router.get("/devices/{id}", summary="Получить девайс по id")
-async def get_devices_by_id(devices_id: int) -> GetDeviceByIdResponse:
+async def get_devices_by_id(request: Request, devices_id: int) -> GetDeviceByIdResponse:
     logger.info(f"GET /products/devices/{devices_id} запрос")
     try:
-        result = await DevicesService.get_device(devices_id)
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_device(devices_id))
         logger.info(f"GET /products/devices/{devices_id} успешно")
-        return result
+        return response
 
     except ValueError as error:
         if "не найден" in str(error).lower():
@@ -70,15 +173,57 @@ async def get_devices_by_id(devices_id: int) -> GetDeviceByIdResponse:
             detail="Внутренняя ошибка сервера при получении девайса"
         )
 
+@router.get("/devices/by-ref/{ref}", summary="Получить девайс по ref")
+async def get_devices_by_ref(request: Request, ref: str) -> GetDeviceByIdResponse:
+    logger.info(f"GET /products/devices/by-ref/{ref} запрос")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_device_by_ref(ref))
+        logger.info(f"GET /products/devices/by-ref/{ref} успешно")
+        return response
+
+    except ValueError as error:
+        if "не найден" in str(error).lower():
+            logger.warning(f"GET /products/devices/by-ref/{ref} девайс не найден")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Девайс не найден"
+            )
+
+        logger.warning(f"GET /products/devices/by-ref/{ref} ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/devices/by-ref/{ref} внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении девайса"
+        )
+
 
 @router.get("/iqos", summary="Получить все продукты iqos с пагинацией")
-async def get_iqos(pagination: Tuple[int, int] = Depends(get_pagination)) -> GetIqosResponse:
+async def get_iqos(
+        request: Request,
+        pagination: Tuple[int, int] = Depends(get_pagination),
+        filters: ProductFilters = Depends(get_iqos_filters),
+        cursor_pagination: Tuple[str | None, bool] = Depends(get_cursor_pagination),
+        projection: Tuple[str, List[str] | None] = Depends(get_projection)
+) -> GetIqosResponse | GetIqosProjectionResponse:
     skip, limit = pagination
-    logger.info(f"GET /products/iqos запрос: skip={skip}, limit={limit}")
+    cursor, with_total = cursor_pagination
+    view, fields = projection
+    logger.info(f"GET /products/iqos запрос: skip={skip}, limit={limit}, cursor={cursor}, filters={filters}")
     try:
-        result = await DevicesService.get_iqos_list(skip=skip, limit=limit)
-        logger.info(f"GET /products/iqos успешно: {len(result.iqos)} iqos возвращено")
-        return result
+        response = await response_cache.get_or_build(
+            request,
+            lambda: DevicesService.get_iqos_list(
+                skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total,
+                view=view, fields=fields
+            )
+        )
+        logger.info(f"GET /products/iqos успешно")
+        return response
 
     except ValueError as error:
         logger.warning(f"GET /products/iqos ошибка клиента: {str(error)}")
@@ -94,13 +239,83 @@ async def get_iqos(pagination: Tuple[int, int] = Depends(get_pagination)) -> Get
         )
 
 
+@router.get("/iqos/facets", summary="Получить счётчики фильтров iqos для текущих фильтров")
+async def get_iqos_facets(
+        request: Request,
+        filters: ProductFilters = Depends(get_iqos_filters)
+) -> GetFacetsResponse:
+    logger.info(f"GET /products/iqos/facets запрос: filters={filters}")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_facets("iqos", filters))
+        logger.info(f"GET /products/iqos/facets успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/iqos/facets ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/iqos/facets внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении фасетов"
+        )
+
+
+@router.get("/iqos/categories/{category}", summary="Получить продуктов iqos категории с пагинацией")
+async def get_iqos_by_category(
+        request: Request,
+        category: int,
+        pagination: Tuple[int, int] = Depends(get_pagination),
+        filters: ProductFilters = Depends(get_iqos_filters),
+        cursor_pagination: Tuple[str | None, bool] = Depends(get_cursor_pagination),
+        projection: Tuple[str, List[str] | None] = Depends(get_projection)
+) -> GetIqosResponse | GetIqosProjectionResponse:
+    skip, limit = pagination
+    cursor, with_total = cursor_pagination
+    view, fields = projection
+    logger.info(f"GET /products/iqos/categories/{category} запрос: skip={skip}, limit={limit}, cursor={cursor}, filters={filters}")
+    try:
+        response = await response_cache.get_or_build(
+            request,
+            lambda: DevicesService.get_category_products(
+                "iqos", category, skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total,
+                view=view, fields=fields
+            )
+        )
+        logger.info(f"GET /products/iqos/categories/{category} успешно")
+        return response
+
+    except ValueError as error:
+        if "не найден" in str(error).lower():
+            logger.warning(f"GET /products/iqos/categories/{category} категория не найдена")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Категория не найдена"
+            )
+
+        logger.warning(f"GET /products/iqos/categories/{category} ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/iqos/categories/{category} внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении продуктов iqos категории"
+        )
+
+
 @router.get("/iqos/{id}", summary="Получить продукт iqos по id")
-async def get_iqos_by_id(iqos_id: int) -> GetIqosByIdResponse:
+async def get_iqos_by_id(request: Request, iqos_id: int) -> GetIqosByIdResponse:
     logger.info(f"GET /products/iqos/{iqos_id} запрос")
     try:
-        result = await DevicesService.get_iqos(iqos_id)
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_iqos(iqos_id))
         logger.info(f"GET /products/iqos/{iqos_id} успешно")
-        return result
+        return response
 
     except ValueError as error:
         if "не найден" in str(error).lower():
@@ -122,15 +337,57 @@ async def get_iqos_by_id(iqos_id: int) -> GetIqosByIdResponse:
             detail="Внутренняя ошибка сервера при получении продукта iqos"
         )
 
+@router.get("/iqos/by-ref/{ref}", summary="Получить продукт iqos по ref")
+async def get_iqos_by_ref(request: Request, ref: str) -> GetIqosByIdResponse:
+    logger.info(f"GET /products/iqos/by-ref/{ref} запрос")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_iqos_by_ref(ref))
+        logger.info(f"GET /products/iqos/by-ref/{ref} успешно")
+        return response
+
+    except ValueError as error:
+        if "не найден" in str(error).lower():
+            logger.warning(f"GET /products/iqos/by-ref/{ref} продукт iqos не найден")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Продукт iqos не найден"
+            )
+
+        logger.warning(f"GET /products/iqos/by-ref/{ref} ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/iqos/by-ref/{ref} внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении продукта iqos"
+        )
+
 
 @router.get("/terea", summary="Получить все продукты terea с пагинацией")
-async def get_terea(pagination: Tuple[int, int] = Depends(get_pagination)) -> GetTereaResponse:
+async def get_terea(
+        request: Request,
+        pagination: Tuple[int, int] = Depends(get_pagination),
+        filters: ProductFilters = Depends(get_terea_filters),
+        cursor_pagination: Tuple[str | None, bool] = Depends(get_cursor_pagination),
+        projection: Tuple[str, List[str] | None] = Depends(get_projection)
+) -> GetTereaResponse | GetTereaProjectionResponse:
     skip, limit = pagination
-    logger.info(f"GET /products/terea запрос: skip={skip}, limit={limit}")
+    cursor, with_total = cursor_pagination
+    view, fields = projection
+    logger.info(f"GET /products/terea запрос: skip={skip}, limit={limit}, cursor={cursor}, filters={filters}")
     try:
-        result = await DevicesService.get_terea_list(skip=skip, limit=limit)
-        logger.info(f"GET /products/terea успешно: {len(result.terea)} продуктов terea возвращено")
-        return result
+        response = await response_cache.get_or_build(
+            request,
+            lambda: DevicesService.get_terea_list(
+                skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total,
+                view=view, fields=fields
+            )
+        )
+        logger.info(f"GET /products/terea успешно")
+        return response
 
     except ValueError as error:
         logger.warning(f"GET /products/terea ошибка клиента: {str(error)}")
@@ -146,13 +403,83 @@ async def get_terea(pagination: Tuple[int, int] = Depends(get_pagination)) -> Ge
         )
 
 
+@router.get("/terea/facets", summary="Получить счётчики фильтров terea для текущих фильтров")
+async def get_terea_facets(
+        request: Request,
+        filters: ProductFilters = Depends(get_terea_filters)
+) -> GetFacetsResponse:
+    logger.info(f"GET /products/terea/facets запрос: filters={filters}")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_facets("terea", filters))
+        logger.info(f"GET /products/terea/facets успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/terea/facets ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/terea/facets внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении фасетов"
+        )
+
+
+@router.get("/terea/categories/{category}", summary="Получить продуктов terea категории с пагинацией")
+async def get_terea_by_category(
+        request: Request,
+        category: int,
+        pagination: Tuple[int, int] = Depends(get_pagination),
+        filters: ProductFilters = Depends(get_terea_filters),
+        cursor_pagination: Tuple[str | None, bool] = Depends(get_cursor_pagination),
+        projection: Tuple[str, List[str] | None] = Depends(get_projection)
+) -> GetTereaResponse | GetTereaProjectionResponse:
+    skip, limit = pagination
+    cursor, with_total = cursor_pagination
+    view, fields = projection
+    logger.info(f"GET /products/terea/categories/{category} запрос: skip={skip}, limit={limit}, cursor={cursor}, filters={filters}")
+    try:
+        response = await response_cache.get_or_build(
+            request,
+            lambda: DevicesService.get_category_products(
+                "terea", category, skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total,
+                view=view, fields=fields
+            )
+        )
+        logger.info(f"GET /products/terea/categories/{category} успешно")
+        return response
+
+    except ValueError as error:
+        if "не найден" in str(error).lower():
+            logger.warning(f"GET /products/terea/categories/{category} категория не найдена")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Категория не найдена"
+            )
+
+        logger.warning(f"GET /products/terea/categories/{category} ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/terea/categories/{category} внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении продуктов terea категории"
+        )
+
+
 @router.get("/terea/{id}", summary="Получить продукт terea по id")
-async def get_terea_by_id(terea_id: int) -> GetTereaByIdResponse:
+async def get_terea_by_id(request: Request, terea_id: int) -> GetTereaByIdResponse:
     logger.info(f"GET /products/terea/{terea_id} запрос")
     try:
-        result = await DevicesService.get_terea(terea_id)
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_terea(terea_id))
         logger.info(f"GET /products/terea/{terea_id} успешно")
-        return result
+        return response
 
     except ValueError as error:
         if "не найден" in str(error).lower():
@@ -174,17 +501,351 @@ async def get_terea_by_id(terea_id: int) -> GetTereaByIdResponse:
             detail="Внутренняя ошибка сервера при получении продукта terea"
         )
 
+
+@router.get("/terea/by-ref/{ref}", summary="Получить продукт terea по ref")
+async def get_terea_by_ref(request: Request, ref: str) -> GetTereaByIdResponse:
+    logger.info(f"GET /products/terea/by-ref/{ref} запрос")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_terea_by_ref(ref))
+        logger.info(f"GET /products/terea/by-ref/{ref} успешно")
+        return response
+
+    except ValueError as error:
+        if "не найден" in str(error).lower():
+            logger.warning(f"GET /products/terea/by-ref/{ref} продукт terea не найден")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Продукт terea не найден"
+            )
+
+        logger.warning(f"GET /products/terea/by-ref/{ref} ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/terea/by-ref/{ref} внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении продукта terea"
+        )
+
+
+@router.get("/export.ndjson", summary="Потоковая выгрузка всего каталога, один продукт на строку")
+async def export_products() -> StreamingResponse:
+    logger.info(f"GET /products/export.ndjson запрос")
+    return StreamingResponse(
+        DevicesService.export_products(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="products.ndjson"'}
+    )
+
+
+@router.get("/list", summary="Получить продукты всех типов одним списком с общей сортировкой")
+async def get_products_list(
+        request: Request,
+        pagination: Tuple[int, int] = Depends(get_pagination),
+        filters: ProductFilters = Depends(get_products_filters),
+        cursor_pagination: Tuple[str | None, bool] = Depends(get_cursor_pagination),
+        types: List[ProductTypeEnum] | None = Query(None, description="Ограничить выдачу типами продуктов")
+) -> GetProductsListResponse:
+    skip, limit = pagination
+    cursor, with_total = cursor_pagination
+    logger.info(f"GET /products/list запрос: skip={skip}, limit={limit}, cursor={cursor}, types={types}, filters={filters}")
+    try:
+        response = await response_cache.get_or_build(
+            request,
+            lambda: DevicesService.get_products_list(
+                skip=skip, limit=limit, filters=filters, product_types=types, cursor=cursor, with_total=with_total
+            )
+        )
+        logger.info(f"GET /products/list успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/list ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/list внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении продуктов"
+        )
+
+
+@router.get("/categories", summary="Получить категории всех типов продуктов с количеством товаров")
+async def get_categories(request: Request) -> GetCategoriesResponse:
+    logger.info(f"GET /products/categories запрос")
+    try:
+        response = await response_cache.get_or_build(request, DevicesService.get_categories)
+        logger.info(f"GET /products/categories успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/categories ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/categories внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении категорий"
+        )
+
+
+@router.get("/by-ref/{ref}", summary="Получить продукт любого типа по ref")
+async def get_product_by_ref(
+        request: Request,
+        ref: str,
+        types: List[ProductTypeEnum] | None = Query(None, description="Ограничить поиск типами продуктов")
+) -> GetProductByRefResponse:
+    logger.info(f"GET /products/by-ref/{ref} запрос: types={types}")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_product_by_ref(ref, types))
+        logger.info(f"GET /products/by-ref/{ref} успешно")
+        return response
+
+    except ValueError as error:
+        if "не найден" in str(error).lower():
+            logger.warning(f"GET /products/by-ref/{ref} продукт не найден")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Продукт не найден"
+            )
+
+        logger.warning(f"GET /products/by-ref/{ref} ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/by-ref/{ref} внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении продукта"
+        )
+
+
+@router.post("/batch", summary="Получить несколько продуктов по ref или (тип, id) за один запрос")
+async def get_products_batch(batch: GetProductsBatchRequest) -> GetProductsBatchResponse:
+    logger.info(f"POST /products/batch запрос: {len(batch.refs)} ref, {len(batch.items)} пар")
+    try:
+        response = await DevicesService.get_products_batch(batch)
+        logger.info(f"POST /products/batch успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"POST /products/batch ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"POST /products/batch внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при пакетном получении продуктов"
+        )
+
+
+@router.get("/stock", summary="Получить наличие и цены по списку ref")
+async def get_stock(
+        request: Request,
+        refs: List[str] = Query(..., description="ref через запятую или повтором параметра")
+) -> GetStockResponse:
+    refs = [ref.strip() for value in refs for ref in value.split(",") if ref.strip()]
+    logger.info(f"GET /products/stock запрос: {len(refs)} ref")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_stock(refs))
+        logger.info(f"GET /products/stock успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/stock ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/stock внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении остатков"
+        )
+
+
+@router.post("/stock", summary="Получить наличие и цены по списку ref (тело запроса)")
+async def post_stock(stock_request: GetStockRequest) -> GetStockResponse:
+    logger.info(f"POST /products/stock запрос: {len(stock_request.refs)} ref")
+    try:
+        response = await DevicesService.get_stock(stock_request.refs)
+        logger.info(f"POST /products/stock успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"POST /products/stock ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"POST /products/stock внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении остатков"
+        )
+
+
+@router.get("/search", summary="Полнотекстовый поиск по каталогу")
+async def search_products(
+        request: Request,
+        q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+        types: List[ProductTypeEnum] | None = Query(None, description="Ограничить поиск типами продуктов"),
+        limit: int = Query(20, ge=1, le=100, description="Количество продуктов")
+) -> GetProductsSearchResponse:
+    logger.info(f"GET /products/search запрос: q={q}, types={types}, limit={limit}")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.search_products(q, types, limit))
+        logger.info(f"GET /products/search успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/search ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/search внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при поиске продуктов"
+        )
+
+
+@router.get("/suggest", summary="Подсказки для строки поиска по префиксу")
+async def suggest_products(
+        request: Request,
+        prefix: str = Query(..., min_length=1, max_length=100, description="Начало поискового запроса"),
+        limit: int = Query(10, ge=1, le=50, description="Количество подсказок")
+) -> GetSuggestResponse:
+    logger.debug(f"GET /products/suggest запрос: prefix={prefix}, limit={limit}")
+    try:
+        return await response_cache.get_or_build(request, lambda: DevicesService.suggest_products(prefix, limit))
+
+    except ValueError as error:
+        logger.warning(f"GET /products/suggest ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/suggest внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении подсказок"
+        )
+
+
+@router.get("/best-sellers", summary="Получить хиты продаж в наличии")
+async def get_best_sellers(
+        request: Request,
+        limit: int = Query(12, ge=1, le=settings.catalog.rail_size, description="Количество продуктов")
+) -> GetProductsRailResponse:
+    logger.info(f"GET /products/best-sellers запрос: limit={limit}")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_best_sellers(limit))
+        logger.info(f"GET /products/best-sellers успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/best-sellers ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/best-sellers внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении хитов продаж"
+        )
+
+
+@router.get("/new", summary="Получить новинки в наличии")
+async def get_new_products(
+        request: Request,
+        limit: int = Query(12, ge=1, le=settings.catalog.rail_size, description="Количество продуктов")
+) -> GetProductsRailResponse:
+    logger.info(f"GET /products/new запрос: limit={limit}")
+    try:
+        response = await response_cache.get_or_build(request, lambda: DevicesService.get_new_products(limit))
+        logger.info(f"GET /products/new успешно")
+        return response
+
+    except ValueError as error:
+        logger.warning(f"GET /products/new ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/new внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении новинок"
+        )
+
+
+@router.get("/{product_type}/{product_id}/similar", summary="Получить похожие продукты того же типа")
+async def get_similar_products(
+        request: Request,
+        product_type: ProductTypeEnum,
+        product_id: int,
+        limit: int = Query(8, ge=1, le=settings.catalog.similar_size, description="Количество продуктов")
+) -> GetProductsRailResponse:
+    logger.info(f"GET /products/{product_type}/{product_id}/similar запрос: limit={limit}")
+    try:
+        response = await response_cache.get_or_build(
+            request,
+            lambda: DevicesService.get_similar(product_type, product_id, limit)
+        )
+        logger.info(f"GET /products/{product_type}/{product_id}/similar успешно")
+        return response
+
+    except ValueError as error:
+        if "не найден" in str(error).lower():
+            logger.warning(f"GET /products/{product_type}/{product_id}/similar продукт не найден")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Продукт не найден"
+            )
+
+        logger.warning(f"GET /products/{product_type}/{product_id}/similar ошибка клиента: {str(error)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+    except Exception as error:
+        logger.error(f"GET /products/{product_type}/{product_id}/similar внутренняя ошибка: {str(error)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера при получении похожих продуктов"
+        )
+
+
 @router.get("", summary="Получить все продукты (devices, iqos, terea)")
-async def get_all_products() -> GetAllProductsResponse:
+async def get_all_products(request: Request) -> GetAllProductsResponse:
     logger.info(f"GET /products запрос")
     try:
-        devices_result = await DevicesService.get_devices(skip=0, limit=1000)
-        iqos_result = await DevicesService.get_iqos_list(skip=0, limit=1000)
-        terea_result = await DevicesService.get_terea_list(skip=0, limit=1000)
-
-        response_data = GetAllProductsResponse(devices=devices_result.devices, iqos=iqos_result.iqos, terea=terea_result.terea)
-        logger.info(f"GET /products успешно: {len(response_data.devices)} devices, {len(response_data.iqos)} iqos, {len(response_data.terea)} terea возвращено")
-        return response_data
+        response = await response_cache.get_or_build(request, DevicesService.get_all_products)
+        logger.info(f"GET /products успешно")
+        return response
 
     except ValueError as error:
         logger.warning(f"GET /products ошибка клиента: {str(error)}")
@@ -1,19 +1,42 @@
 from backend.app.api.schemas.devices_schemas import (
     DevicesSchema,
     GetDevicesResponse,
+    GetDevicesProjectionResponse,
     GetDeviceByIdResponse
 )
 
 from backend.app.api.schemas.iqos_schemas import (
     IqosSchema,
     GetIqosResponse,
+    GetIqosProjectionResponse,
     GetIqosByIdResponse
 )
 
 from backend.app.api.schemas.terea_schemas import (
     TereaSchema,
     GetTereaResponse,
+    GetTereaProjectionResponse,
     GetTereaByIdResponse
 )
 
-from backend.app.api.schemas.all_products_schemas import GetAllProductsResponse
+from backend.app.api.schemas.all_products_schemas import (
+    GetAllProductsResponse,
+    GetCategoriesResponse,
+    CategoryListItemSchema,
+    GetFacetsResponse,
+    FacetValueSchema,
+    PriceBucketSchema,
+    GetProductByRefResponse,
+    GetProductsBatchRequest,
+    GetProductsBatchResponse,
+    GetProductsListResponse,
+    ProductRowSchema,
+    GetProductsRailResponse,
+    GetProductsSearchResponse,
+    GetStockRequest,
+    GetStockResponse,
+    GetSuggestResponse,
+    SuggestionSchema,
+    ProductKeySchema,
+    ProductTypeEnum
+)
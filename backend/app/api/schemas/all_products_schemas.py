@@ -1,4 +1,5 @@
-from typing import List
+import decimal
+from typing import Dict, List, Literal, Tuple, Union
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -11,3 +12,122 @@ class GetAllProductsResponse(BaseModel):
     terea: List[TereaSchema] = Field(..., description="Список продуктов Terea")
 
     model_config = ConfigDict(from_attributes=True, str_strip_whitespace=True)
+
+
+ProductTypeEnum = Literal['terea', 'iqos', 'devices']
+
+
+class GetProductByRefResponse(BaseModel):
+    type: ProductTypeEnum = Field(..., description="Тип продукта", examples=["terea"])
+    product: Union[TereaSchema, IqosSchema, DevicesSchema] = Field(..., description="Продукт")
+
+
+PRODUCTS_BATCH_LIMIT = 500
+
+
+class ProductKeySchema(BaseModel):
+    type: ProductTypeEnum = Field(..., description="Тип продукта", examples=["terea"])
+    id: int = Field(..., description="ID продукта", examples=[1])
+
+
+class GetProductsBatchRequest(BaseModel):
+    refs: List[str] = Field(default_factory=list, max_length=PRODUCTS_BATCH_LIMIT, description="Список ref продуктов", examples=[["terea-amber"]])
+    items: List[ProductKeySchema] = Field(default_factory=list, max_length=PRODUCTS_BATCH_LIMIT, description="Список пар (тип, id)")
+
+
+class GetProductsBatchResponse(BaseModel):
+    products: Dict[str, GetProductByRefResponse] = Field(..., description="Найденные продукты: ключ - ref или \"тип:id\" для items")
+    missing_refs: List[str] = Field(..., description="ref, которые не найдены")
+    missing_items: List[ProductKeySchema] = Field(..., description="Пары (тип, id), которые не найдены")
+
+
+class GetStockRequest(BaseModel):
+    refs: List[str] = Field(..., min_length=1, max_length=PRODUCTS_BATCH_LIMIT, description="Список ref продуктов", examples=[["terea-amber"]])
+
+
+class GetStockResponse(BaseModel):
+    stock: Dict[str, Tuple[int, int, int | None, int | None]] = Field(
+        ...,
+        description="ref -> [наличие, цена, цена блока, цена со скидкой]",
+        examples=[{"terea-amber": [1, 350, 3400, None]}]
+    )
+    missing: List[str] = Field(..., description="ref, которые не найдены")
+
+
+class GetProductsRailResponse(BaseModel):
+    products: List[GetProductByRefResponse] = Field(..., description="Продукты в наличии, в порядке ранжирования")
+
+
+class GetProductsSearchResponse(BaseModel):
+    query: str = Field(..., description="Поисковый запрос", examples=["ментол"])
+    total: int = Field(..., description="Общее количество найденных продуктов")
+    products: List[GetProductByRefResponse] = Field(..., description="Найденные продукты, по убыванию релевантности")
+
+
+SuggestionKindEnum = Literal['product', 'flavor', 'brand', 'country', 'model']
+
+
+class SuggestionSchema(BaseModel):
+    text: str = Field(..., description="Текст подсказки", examples=["Terea Amber"])
+    kind: SuggestionKindEnum = Field(..., description="Вид подсказки: товар или значение атрибута", examples=["product"])
+    type: ProductTypeEnum = Field(..., description="Тип продукта", examples=["terea"])
+    ref: str | None = Field(None, description="ref товара (только для kind=product)", examples=["terea-amber"])
+    weight: int = Field(..., description="Популярность подсказки")
+
+
+class GetSuggestResponse(BaseModel):
+    prefix: str = Field(..., description="Введённый префикс", examples=["ter"])
+    suggestions: List[SuggestionSchema] = Field(..., description="Подсказки по убыванию популярности")
+
+
+class FacetValueSchema(BaseModel):
+    value: str = Field(..., description="Значение атрибута; для флагов 1/0, для категорий id", examples=["Ментол"])
+    label: str | None = Field(None, description="Подпись значения (название категории)", examples=["arm"])
+    count: int = Field(..., description="Количество продуктов с этим значением при остальных фильтрах")
+
+
+class PriceBucketSchema(BaseModel):
+    min: decimal.Decimal = Field(..., description="Нижняя граница цены (включительно)", examples=[300])
+    max: decimal.Decimal | None = Field(None, description="Верхняя граница цены (не включительно), NULL - без ограничения", examples=[500])
+    count: int = Field(..., description="Количество продуктов в диапазоне при остальных фильтрах")
+
+
+class GetFacetsResponse(BaseModel):
+    type: ProductTypeEnum = Field(..., description="Тип продукта", examples=["terea"])
+    total: int = Field(..., description="Количество продуктов, подходящих под все фильтры")
+    facets: Dict[str, List[FacetValueSchema]] = Field(..., description="Счётчики по значениям каждого фасета")
+    price: List[PriceBucketSchema] = Field(..., description="Счётчики по ценовым диапазонам")
+
+
+class CategoryListItemSchema(BaseModel):
+    id: int = Field(..., description="Уникальный идентификатор категории", examples=[3])
+    category_name: str = Field(..., description="Название категории", examples=["arm"])
+    count: int = Field(..., description="Количество продуктов в категории")
+
+
+class GetCategoriesResponse(BaseModel):
+    devices: List[CategoryListItemSchema] = Field(..., description="Категории устройств Devices")
+    iqos: List[CategoryListItemSchema] = Field(..., description="Категории продуктов IQOS")
+    terea: List[CategoryListItemSchema] = Field(..., description="Категории продуктов Terea")
+
+
+class ProductRowSchema(BaseModel):
+    type: ProductTypeEnum = Field(..., description="Тип продукта", examples=["terea"])
+    id: int = Field(..., description="ID продукта в таблице своего типа", examples=[1])
+    ref: str = Field(..., description="Уникальная ссылка/слаг продукта", examples=["terea-amber"])
+    name: str = Field(..., description="Название продукта", examples=["Terea Amber"])
+    price: decimal.Decimal = Field(..., description="Цена продукта", examples=[350], max_digits=10, decimal_places=0)
+    image: str = Field(..., description="Ссылка на изображение", examples=["/images/terea-amber.webp"])
+    nalichie: int = Field(..., description="Наличие (обычно 0 или 1)", examples=[1], ge=0, le=1)
+    new: int = Field(..., description="Флаг новинки (обычно 0 или 1)", examples=[0], ge=0, le=1)
+    hit: int | None = Field(None, description="Флаг хита (обычно 0 или 1, может быть NULL)", examples=[0], ge=0, le=1)
+    category_id: int = Field(..., description="ID категории", examples=[3])
+    category_name: str = Field(..., description="Название категории", examples=["arm"])
+
+
+class GetProductsListResponse(BaseModel):
+    products: List[ProductRowSchema] = Field(..., description="Продукты всех типов в общей сортировке")
+    skip: int = Field(..., description="Количество пропущенных записей")
+    limit: int = Field(..., description="Максимальное количество возвращённых записей")
+    total: int | None = Field(None, description="Общее количество записей (NULL при with_total=0)")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы (NULL, если страница последняя)")
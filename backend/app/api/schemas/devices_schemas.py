@@ -1,9 +1,25 @@
 import decimal
-from typing import Literal, List
+from typing import Any, Dict, Literal, List
 
 from pydantic import BaseModel, Field, ConfigDict
 
 
+# Поля карточки для списков: без LONGTEXT description
+DEVICES_CARD_FIELDS = (
+    'id',
+    'name',
+    'image',
+    'price',
+    'nalichie',
+    'new',
+    'hit',
+    'color',
+    'ref',
+    'type',
+    'device_id'
+)
+
+
 class DevicesCategorySchema(BaseModel):
     id: int = Field(..., description="Уникальный идентификатор категории", examples=[1])
     category_name: str = Field(..., description="Название категории", examples=["ringsiluma"], max_length=256)
@@ -49,7 +65,16 @@ class GetDevicesResponse(BaseModel):
     devices: List[DevicesSchema] = Field(..., description="Список устройств")
     skip: int
     limit: int
-    total: int
+    total: int | None = Field(None, description="Общее количество записей (NULL при with_total=0)")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы (NULL, если страница последняя)")
+
+
+class GetDevicesProjectionResponse(BaseModel):
+    devices: List[Dict[str, Any]] = Field(..., description="Список устройств, только выбранные поля (view/fields)")
+    skip: int = Field(..., description="Количество пропущенных записей")
+    limit: int = Field(..., description="Максимальное количество возвращённых записей")
+    total: int | None = Field(None, description="Общее количество записей (NULL при with_total=0)")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы (NULL, если страница последняя)")
 
 
 class GetDeviceByIdResponse(BaseModel):
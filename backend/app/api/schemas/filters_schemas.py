@@ -0,0 +1,35 @@
+import decimal
+from typing import List, Literal
+
+from pydantic import BaseModel, Field, ConfigDict
+
+from backend.app.api.schemas.terea_schemas import StrengthEnum
+
+
+SortEnum = Literal['id_desc', 'id_asc', 'price_asc', 'price_desc', 'name_asc', 'name_desc']
+FlavorEnum = Literal['Табачный вкус', 'Фруктовый вкус', 'Ментол', 'Экзотические']
+ColorEnum = Literal['Красный', 'Черный', 'Бежевый', 'Синий', 'Оранжевый', 'Зеленый', 'Фиолетовый', 'Желтый', 'Серый']
+
+
+class ProductFilters(BaseModel):
+    search: str | None = Field(None, description="Поиск по названию", max_length=256)
+    price_min: decimal.Decimal | None = Field(None, description="Минимальная цена", ge=0)
+    price_max: decimal.Decimal | None = Field(None, description="Максимальная цена", ge=0)
+    in_stock: bool | None = Field(None, description="Только в наличии (1) или только отсутствующие (0)")
+    new: bool | None = Field(None, description="Флаг новинки")
+    hit: bool | None = Field(None, description="Флаг хита")
+    category_id: int | None = Field(None, description="ID категории")
+    sort: SortEnum = Field('id_desc', description="Сортировка")
+
+    flavor: List[FlavorEnum] | None = Field(None, description="Вкусы (terea)")
+    strength: List[StrengthEnum] | None = Field(None, description="Крепость (terea)")
+    country: List[str] | None = Field(None, description="Страна (terea)")
+    brend: List[str] | None = Field(None, description="Бренд (terea)")
+    has_capsule: bool | None = Field(None, description="Наличие капсулы (terea)")
+    color: List[ColorEnum] | None = Field(None, description="Цвет (iqos, devices)")
+    model: List[str] | None = Field(None, description="Модель (iqos)")
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    def is_active(self) -> bool:
+        return self.sort != 'id_desc' or bool(self.model_dump(exclude={'sort'}, exclude_none=True))
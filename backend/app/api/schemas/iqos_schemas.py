@@ -1,9 +1,28 @@
 import decimal
-from typing import Literal, List
+from typing import Any, Dict, Literal, List
 
 from pydantic import BaseModel, Field, ConfigDict
 
 
+# Поля карточки для списков: без LONGTEXT description
+IQOS_CARD_FIELDS = (
+    'id',
+    'name',
+    'model',
+    'image',
+    'price',
+    'sale_price',
+    'color',
+    'nalichie',
+    'new',
+    'hit',
+    'exclusive',
+    'ref',
+    'type',
+    'id_category'
+)
+
+
 class IqosCategorySchema(BaseModel):
     id: int = Field(..., description="Уникальный идентификатор категории", examples=[4])
     category_name: str = Field(..., description="Название категории", examples=["onei"], max_length=256)
@@ -44,7 +63,16 @@ class GetIqosResponse(BaseModel):
     iqos: List[IqosSchema] = Field(..., description="Список продуктов IQOS")
     skip: int = Field(..., description="Количество пропущенных записей")
     limit: int = Field(..., description="Максимальное количество возвращённых записей")
-    total: int = Field(..., description="Общее количество записей")
+    total: int | None = Field(None, description="Общее количество записей (NULL при with_total=0)")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы (NULL, если страница последняя)")
+
+
+class GetIqosProjectionResponse(BaseModel):
+    iqos: List[Dict[str, Any]] = Field(..., description="Список продуктов IQOS, только выбранные поля (view/fields)")
+    skip: int = Field(..., description="Количество пропущенных записей")
+    limit: int = Field(..., description="Максимальное количество возвращённых записей")
+    total: int | None = Field(None, description="Общее количество записей (NULL при with_total=0)")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы (NULL, если страница последняя)")
 
 
 class GetIqosByIdResponse(BaseModel):
@@ -47,3 +47,8 @@ class OrderResponse(BaseModel):
     order: GetOrder
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class OrderIntakeResponse(BaseModel):
+    intake_id: str = Field(description="Идентификатор принятого заказа в журнале", examples=["3f1c2b9e-7a4d-4c1e-9b8a-2d6e5f4a3b21"])
+    provisional_number: int = Field(description="Предварительный номер заказа до записи в БД", examples=[1024])
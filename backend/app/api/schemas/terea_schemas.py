@@ -1,7 +1,27 @@
 import decimal
-from typing import Literal, List, Union, Set
+from typing import Any, Dict, Literal, List, Union, Set
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_serializer
+
+
+# Поля карточки для списков: без LONGTEXT description
+TEREA_CARD_FIELDS = (
+    'id',
+    'name',
+    'image',
+    'imagePack',
+    'price',
+    'pricePack',
+    'has_capsule',
+    'flavor',
+    'strength',
+    'nalichie',
+    'new',
+    'hit',
+    'ref',
+    'type',
+    'terea_id'
+)
 
 
 StrengthEnum = Literal['Легкие', 'Средние', 'Крепкие']
@@ -58,12 +78,26 @@ class TereaSchema(BaseModel):
 
     model_config = ConfigDict(from_attributes=True, str_strip_whitespace=True)
 
+    @field_serializer("flavor")
+    def serialize_flavor(self, flavor):
+        # Порядок элементов множества зависит от хэш-сида процесса, сортируем для стабильного JSON и ETag
+        return sorted(flavor)
+
 
 class GetTereaResponse(BaseModel):
     terea: List[TereaSchema] = Field(..., description="Список продуктов Terea")
     skip: int = Field(..., description="Количество пропущенных записей")
     limit: int = Field(..., description="Максимальное количество возвращённых записей")
-    total: int = Field(..., description="Общее количество записей")
+    total: int | None = Field(None, description="Общее количество записей (NULL при with_total=0)")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы (NULL, если страница последняя)")
+
+
+class GetTereaProjectionResponse(BaseModel):
+    terea: List[Dict[str, Any]] = Field(..., description="Список продуктов Terea, только выбранные поля (view/fields)")
+    skip: int = Field(..., description="Количество пропущенных записей")
+    limit: int = Field(..., description="Максимальное количество возвращённых записей")
+    total: int | None = Field(None, description="Общее количество записей (NULL при with_total=0)")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы (NULL, если страница последняя)")
 
 
 class GetTereaByIdResponse(BaseModel):
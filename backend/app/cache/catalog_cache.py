@@ -0,0 +1,348 @@
+import asyncio
+import hashlib
+import logging
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, Type
+
+from backend.app.api.schemas import DevicesSchema, IqosSchema, TereaSchema
+from backend.app.api.schemas.devices_schemas import DevicesCategorySchema
+from backend.app.api.schemas.iqos_schemas import IqosCategorySchema
+from backend.app.api.schemas.terea_schemas import TereaCategorySchema
+from backend.app.cache.facet_index import FacetIndex
+from backend.app.cache.search_index import SearchIndex
+from backend.app.cache.similarity_index import SimilarityIndex
+from backend.app.cache.stock_index import StockIndex
+from backend.app.cache.suggest_index import SuggestIndex
+from backend.app.repositories.orders_repository import OrderRepository
+from backend.app.repositories.products_repository import DevicesRepository, ProductsRepository
+from backend.core.config import settings
+from backend.core.db_helper import db_helper
+
+
+logger = logging.getLogger(__name__)
+
+
+Product = DevicesSchema | IqosSchema | TereaSchema
+
+
+def category_key(model) -> str:
+    return next(iter(type(model).category.property.local_columns)).key
+
+
+def product_values(model, categories: Mapping[int, Any]) -> Dict[str, Any]:
+    # Колонки строки плюс категория из справочника снапшота вместо selectinload
+    values = {column.key: getattr(model, column.key) for column in model.__table__.columns}
+    values["category"] = categories[values[category_key(model)]]
+    return values
+
+
+def build_product(schema: Type[Product], model, categories: Mapping[int, Any]) -> Product:
+    return schema.model_validate(product_values(model, categories))
+
+
+# Неизменяемый срез каталога, списки отсортированы по id desc, как и выдача из БД
+class CatalogSnapshot:
+    def __init__(
+            self,
+            version: int,
+            devices_models,
+            iqos_models,
+            terea_models,
+            categories_models,
+            sales: Mapping[str, int] | None = None,
+            previous: "CatalogSnapshot | None" = None
+    ):
+        devices_categories, iqos_categories, terea_categories = categories_models
+
+        self.version: int = version
+        self.sales: Mapping[str, int] = MappingProxyType(dict(sales or {}))
+
+        self.devices_categories: Mapping[int, DevicesCategorySchema] = MappingProxyType(
+            {category.id: DevicesCategorySchema.model_validate(category) for category in devices_categories}
+        )
+        self.iqos_categories: Mapping[int, IqosCategorySchema] = MappingProxyType(
+            {category.id: IqosCategorySchema.model_validate(category) for category in iqos_categories}
+        )
+        self.terea_categories: Mapping[int, TereaCategorySchema] = MappingProxyType(
+            {category.id: TereaCategorySchema.model_validate(category) for category in terea_categories}
+        )
+
+        self.devices: Tuple[DevicesSchema, ...] = tuple(
+            build_product(DevicesSchema, device, self.devices_categories) for device in devices_models
+        )
+        self.iqos: Tuple[IqosSchema, ...] = tuple(
+            build_product(IqosSchema, iqos, self.iqos_categories) for iqos in iqos_models
+        )
+        self.terea: Tuple[TereaSchema, ...] = tuple(
+            build_product(TereaSchema, terea, self.terea_categories) for terea in terea_models
+        )
+
+        self.by_category: Mapping[str, Mapping[int, Tuple[Product, ...]]] = MappingProxyType({
+            product_type: MappingProxyType(self._group_by_category(product_type))
+            for product_type in ("terea", "iqos", "devices")
+        })
+
+        self.devices_by_id: Mapping[int, DevicesSchema] = MappingProxyType({device.id: device for device in self.devices})
+        self.iqos_by_id: Mapping[int, IqosSchema] = MappingProxyType({iqos.id: iqos for iqos in self.iqos})
+        self.terea_by_id: Mapping[int, TereaSchema] = MappingProxyType({terea.id: terea for terea in self.terea})
+
+        self.devices_by_ref: Mapping[str, DevicesSchema] = MappingProxyType({device.ref: device for device in self.devices})
+        self.iqos_by_ref: Mapping[str, IqosSchema] = MappingProxyType({iqos.ref: iqos for iqos in self.iqos})
+        self.terea_by_ref: Mapping[str, TereaSchema] = MappingProxyType({terea.ref: terea for terea in self.terea})
+        self.refs: Mapping[str, Tuple[str, int]] = MappingProxyType(self._build_refs())
+        self.stock: StockIndex = StockIndex(self.get_product(*located) for located in self.refs.values())
+        all_products = [
+            (product_type, product)
+            for product_type in ("terea", "iqos", "devices")
+            for product in self.get_products(product_type)
+        ]
+        self.search_index: SearchIndex = SearchIndex(all_products, previous.search_index if previous else None)
+        self.suggest_index: SuggestIndex = SuggestIndex(all_products, self.sales)
+        self.facets: Mapping[str, FacetIndex] = MappingProxyType({
+            product_type: FacetIndex(product_type, self.get_products(product_type))
+            for product_type in ("terea", "iqos", "devices")
+        })
+
+        # Готовые витрины главной страницы, пересчитываются вместе со снапшотом
+        self.best_sellers: Tuple[Tuple[str, Product], ...] = self._build_best_sellers(self.sales)
+        self.new_products: Tuple[Tuple[str, Product], ...] = self._build_new_products()
+        self.similar: Mapping[str, SimilarityIndex] = MappingProxyType({
+            product_type: SimilarityIndex(product_type, self.get_products(product_type), settings.catalog.similar_size)
+            for product_type in ("terea", "iqos", "devices")
+        })
+
+        self.fingerprint: str = self._build_fingerprint()
+
+    def _build_fingerprint(self) -> str:
+        # Хэш содержимого одинаков во всех воркерах и после рестарта, в отличие от version
+        digest = hashlib.blake2b(digest_size=16)
+        for products in (self.devices, self.iqos, self.terea):
+            for product in products:
+                digest.update(product.model_dump_json().encode())
+            digest.update(b"|")
+        for categories in (self.devices_categories, self.iqos_categories, self.terea_categories):
+            for category in categories.values():
+                digest.update(category.model_dump_json().encode())
+            digest.update(b"|")
+        # Продажи меняют порядок витрины и подсказок, от них зависят тела ответов, а значит и ETag
+        for product_name, quantity in sorted(self.sales.items()):
+            digest.update(f"{product_name}:{quantity},".encode())
+        return digest.hexdigest()
+
+    def _in_stock_products(self) -> List[Tuple[str, Product]]:
+        return [
+            (product_type, product)
+            for product_type in ("terea", "iqos", "devices")
+            for product in self.get_products(product_type)
+            if product.nalichie
+        ]
+
+    def _build_best_sellers(self, sales: Mapping[str, int]) -> Tuple[Tuple[str, Product], ...]:
+        # Хиты и всё, что реально продавалось; сначала по количеству продаж, хиты выше при равенстве
+        candidates = [
+            (product_type, product)
+            for product_type, product in self._in_stock_products()
+            if product.hit or sales.get(product.name)
+        ]
+        candidates.sort(key=lambda item: (-sales.get(item[1].name, 0), -(item[1].hit or 0), -item[1].id))
+        return tuple(candidates[:settings.catalog.rail_size])
+
+    def _build_new_products(self) -> Tuple[Tuple[str, Product], ...]:
+        candidates = [(product_type, product) for product_type, product in self._in_stock_products() if product.new]
+        candidates.sort(key=lambda item: -item[1].id)
+        return tuple(candidates[:settings.catalog.rail_size])
+
+    def _group_by_category(self, product_type: str) -> Dict[int, Tuple[Product, ...]]:
+        # Порядок внутри категории тот же, что и у всего списка (id desc)
+        grouped: Dict[int, List[Product]] = {category_id: [] for category_id in self.get_categories(product_type)}
+        for product in self.get_products(product_type):
+            grouped.setdefault(product.category.id, []).append(product)
+        return {category_id: tuple(products) for category_id, products in grouped.items()}
+
+    def _build_refs(self) -> Dict[str, Tuple[str, int]]:
+        # Уникальность ref гарантирована индексом только внутри таблицы, при совпадении между таблицами побеждает первая
+        refs: Dict[str, Tuple[str, int]] = {}
+        for product_type, products in (("terea", self.terea), ("iqos", self.iqos), ("devices", self.devices)):
+            for product in products:
+                if product.ref in refs:
+                    logger.warning(f"ref {product.ref} ({product_type} id {product.id}) уже занят {refs[product.ref]}")
+                    continue
+                refs[product.ref] = (product_type, product.id)
+        return refs
+
+    def find_by_ref(self, ref: str, product_types: Sequence[str] | None = None) -> Tuple[str, DevicesSchema | IqosSchema | TereaSchema] | None:
+        if not product_types:
+            located = self.refs.get(ref)
+            if located is None:
+                return None
+            return located[0], self.get_product(*located)
+
+        products_by_ref = {
+            "terea": self.terea_by_ref,
+            "iqos": self.iqos_by_ref,
+            "devices": self.devices_by_ref,
+        }
+        for product_type in products_by_ref:
+            if product_type in product_types and ref in products_by_ref[product_type]:
+                return product_type, products_by_ref[product_type][ref]
+        return None
+
+    def get_products(self, product_type: str) -> Tuple[DevicesSchema, ...] | Tuple[IqosSchema, ...] | Tuple[TereaSchema, ...]:
+        return {
+            "devices": self.devices,
+            "iqos": self.iqos,
+            "terea": self.terea,
+        }[product_type]
+
+    def get_categories(self, product_type: str) -> Mapping[int, DevicesCategorySchema] | Mapping[int, IqosCategorySchema] | Mapping[int, TereaCategorySchema]:
+        return {
+            "devices": self.devices_categories,
+            "iqos": self.iqos_categories,
+            "terea": self.terea_categories,
+        }[product_type]
+
+    def get_product(self, product_type: str, product_id: int) -> DevicesSchema | IqosSchema | TereaSchema | None:
+        products_by_id = {
+            "devices": self.devices_by_id,
+            "iqos": self.iqos_by_id,
+            "terea": self.terea_by_id,
+        }[product_type]
+        return products_by_id.get(product_id)
+
+
+# Снапшот подменяется целиком одним присваиванием. Сброс из админки действует только в своём процессе,
+# остальные воркеры замечают изменение по маркеру каталога не позже чем через check_seconds
+class CatalogCache:
+    def __init__(self, ttl_seconds: int, check_seconds: float):
+        self._ttl_seconds = ttl_seconds
+        self._check_seconds = check_seconds
+        self._snapshot: CatalogSnapshot | None = None
+        self._marker: Tuple[Any, ...] | None = None
+        self._sales: Mapping[str, int] | None = None
+        self._checked_monotonic = 0.0
+        self._sales_checked_monotonic = 0.0
+        self._version = 0
+        self._invalidated = False
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+        self._reconcile_task: asyncio.Task | None = None
+        self._products_stale = False
+
+    @property
+    def snapshot(self) -> CatalogSnapshot | None:
+        return self._snapshot
+
+    async def get_snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            async with self._lock:
+                if self._snapshot is not None:
+                    return self._snapshot
+                return await self._load(force=True)
+
+        # Проверка изменений идёт в фоне, запросы тем временем получают текущий снапшот
+        if self._is_expired() and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return snapshot
+
+    async def get_categories(self, product_type: str, category_ids: Iterable[int] = ()) -> Mapping[int, Any]:
+        # Строки из БД могут ссылаться на категорию новее снапшота: тогда снапшот перечитывается один раз для всех ждущих
+        category_ids = set(category_ids)
+        categories = (await self.get_snapshot()).get_categories(product_type)
+        if category_ids <= categories.keys():
+            return categories
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if not category_ids <= snapshot.get_categories(product_type).keys():
+                snapshot = await self._load(force=True)
+            return snapshot.get_categories(product_type)
+
+    async def reload(self) -> CatalogSnapshot:
+        async with self._lock:
+            return await self._load(force=True)
+
+    async def invalidate(self) -> None:
+        self._invalidated = True
+        try:
+            await self.reload()
+        except Exception as error:
+            logger.error(f"Ошибка при перезагрузке снапшота каталога: {str(error)}", exc_info=True)
+
+    def _is_expired(self) -> bool:
+        if self._invalidated:
+            return True
+        return time.monotonic() - self._checked_monotonic > self._check_seconds
+
+    async def _refresh(self) -> None:
+        async with self._lock:
+            if not self._is_expired():
+                return
+            try:
+                await self._load()
+            except Exception as error:
+                # Следующая попытка не раньше check_seconds, чтобы при недоступной БД не дёргать её каждым запросом
+                self._checked_monotonic = time.monotonic()
+                logger.error(f"Не удалось обновить снапшот каталога, отдаём версию {self._snapshot.version}: {str(error)}")
+
+    async def _reconcile_products(self) -> None:
+        # Изменение во время сверки запускает её ещё раз, чтобы витрина не осталась на промежуточном состоянии
+        while self._products_stale:
+            self._products_stale = False
+            try:
+                await ProductsRepository.rebuild()
+            except Exception as error:
+                logger.error(f"Не удалось сверить витрину Products с каталогом: {str(error)}")
+                return
+
+    async def _load(self, force: bool = False) -> CatalogSnapshot:
+        # Маркер и строки каталога читаются с primary: воркер, не знающий о чужой записи, иначе мог бы собрать
+        # снапшот с отстающей реплики и запомнить уже новый маркер
+        with db_helper.reading_primary():
+            return await self._load_primary(force)
+
+    async def _load_primary(self, force: bool) -> CatalogSnapshot:
+        now = time.monotonic()
+        marker = await DevicesRepository.select_catalog_marker()
+        sales = self._sales
+        sales_due = now - self._sales_checked_monotonic > self._ttl_seconds
+        if settings.catalog.rails_by_sales and (force or sales is None or sales_due):
+            sales = await OrderRepository.select_sales_by_product_name()
+            self._sales_checked_monotonic = now
+
+        snapshot = self._snapshot
+        if not force and not self._invalidated and snapshot is not None and marker == self._marker and sales == self._sales:
+            self._checked_monotonic = now
+            return snapshot
+
+        devices, iqos_list, terea_list = await DevicesRepository.select_catalog()
+        categories = await DevicesRepository.select_categories()
+        # Индексы снапшота строятся в отдельном потоке, чтобы сборка не останавливала event loop
+        built = await asyncio.to_thread(
+            CatalogSnapshot, self._version + 1, devices, iqos_list, terea_list, categories, sales, snapshot
+        )
+        self._marker = marker
+        self._sales = sales
+        self._checked_monotonic = now
+        self._invalidated = False
+
+        if snapshot is not None and snapshot.fingerprint == built.fingerprint:
+            logger.debug(f"Каталог не изменился, остаётся снапшот v{snapshot.version}")
+            return snapshot
+
+        self._version = built.version
+        self._snapshot = built
+        # Каталог изменился (или это первая загрузка после старта): витрина Products сверяется в фоне
+        self._products_stale = True
+        if self._reconcile_task is None or self._reconcile_task.done():
+            self._reconcile_task = asyncio.create_task(self._reconcile_products())
+
+        logger.info(
+            f"Снапшот каталога v{built.version} загружен: "
+            f"{len(built.devices)} девайсов, {len(built.iqos)} iqos, {len(built.terea)} terea"
+        )
+        return built
+
+
+catalog_cache = CatalogCache(ttl_seconds=settings.catalog.ttl_seconds, check_seconds=settings.catalog.check_seconds)
@@ -0,0 +1,154 @@
+import bisect
+import decimal
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+from backend.app.api.schemas.filters_schemas import ProductFilters
+
+
+# Фасет -> атрибут схемы; для каждого значения хранится битсет: бит i = i-й товар снапшота
+FACET_FIELDS: Mapping[str, Tuple[Tuple[str, str], ...]] = {
+    "terea": (
+        ("flavor", "flavor"),
+        ("strength", "strength"),
+        ("country", "country"),
+        ("brend", "brend"),
+        ("category", "terea_id"),
+        ("has_capsule", "has_capsule"),
+    ),
+    "iqos": (
+        ("color", "color"),
+        ("model", "model"),
+        ("category", "id_category"),
+    ),
+    "devices": (
+        ("color", "color"),
+        ("category", "device_id"),
+    ),
+}
+COMMON_FACETS = (("in_stock", "nalichie"), ("new", "new"), ("hit", "hit"))
+BOOLEAN_FACETS = frozenset(("in_stock", "new", "hit", "has_capsule"))
+
+PRICE_BUCKETS = 5
+PRICE_STEP = 100
+
+
+def _values(product, attribute: str, boolean: bool) -> Iterable[str]:
+    value = getattr(product, attribute)
+    if boolean:
+        return ("1" if value else "0",)
+    if value is None:
+        return ()
+    if isinstance(value, (set, frozenset)):
+        return value
+    return (str(value),)
+
+
+def _selected(filters: ProductFilters) -> Dict[str, Set[str]]:
+    # Активные фильтры в терминах фасетов: внутри фасета значения через ИЛИ, между фасетами - И
+    selected = {}
+    for facet in BOOLEAN_FACETS:
+        value = getattr(filters, facet)
+        if value is not None:
+            selected[facet] = {"1" if value else "0"}
+    if filters.category_id is not None:
+        selected["category"] = {str(filters.category_id)}
+    for facet in ("flavor", "strength", "country", "brend", "color", "model"):
+        values = getattr(filters, facet)
+        if values:
+            selected[facet] = set(values)
+    return selected
+
+
+class FacetIndex:
+    def __init__(self, product_type: str, products: Sequence):
+        self._product_type = product_type
+        self._products = products
+        self._all = (1 << len(products)) - 1
+
+        bitsets: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        facets = (*FACET_FIELDS[product_type], *COMMON_FACETS)
+        for position, product in enumerate(products):
+            bit = 1 << position
+            for facet, attribute in facets:
+                for value in _values(product, attribute, facet in BOOLEAN_FACETS):
+                    bitsets[facet][value] |= bit
+        self._bitsets: Dict[str, Dict[str, int]] = {
+            facet: dict(bitsets[facet]) for facet, _ in facets
+        }
+
+        # Накопленные битсеты по возрастанию цены: диапазон цен - разность двух префиксов
+        by_price = sorted(range(len(products)), key=lambda position: products[position].price)
+        self._prices: List[decimal.Decimal] = [products[position].price for position in by_price]
+        self._price_prefix: List[int] = [0]
+        for position in by_price:
+            self._price_prefix.append(self._price_prefix[-1] | (1 << position))
+        self.price_edges: Tuple[decimal.Decimal, ...] = self._build_price_edges()
+
+    def _build_price_edges(self) -> Tuple[decimal.Decimal, ...]:
+        # Границы корзин по квантилям, округлённые вниз до PRICE_STEP
+        if not self._prices:
+            return ()
+        edges = {
+            (self._prices[len(self._prices) * bucket // PRICE_BUCKETS] // PRICE_STEP) * PRICE_STEP
+            for bucket in range(PRICE_BUCKETS)
+        }
+        return tuple(sorted(edges))
+
+    def _price_mask(self, price_min, price_max) -> int:
+        low = 0 if price_min is None else bisect.bisect_left(self._prices, price_min)
+        high = len(self._prices) if price_max is None else bisect.bisect_right(self._prices, price_max)
+        if high <= low:
+            return 0
+        return self._price_prefix[high] & ~self._price_prefix[low]
+
+    def _search_mask(self, search: str | None) -> int:
+        if not search:
+            return self._all
+        search = search.casefold()
+        mask = 0
+        for position, product in enumerate(self._products):
+            texts = (product.name, getattr(product, "model", None) if self._product_type == "iqos" else None)
+            if any(text and search in text.casefold() for text in texts):
+                mask |= 1 << position
+        return mask
+
+    def _mask(self, facet: str, values: Set[str]) -> int:
+        if facet not in self._bitsets:
+            return self._all
+        mask = 0
+        for value in values:
+            mask |= self._bitsets[facet].get(value, 0)
+        return mask
+
+    def count(self, filters: ProductFilters) -> Tuple[int, Dict[str, Dict[str, int]], List[Tuple[decimal.Decimal, decimal.Decimal | None, int]]]:
+        selected = _selected(filters)
+        masks = {
+            facet: self._mask(facet, values)
+            for facet, values in selected.items()
+        }
+        masks["price"] = self._price_mask(filters.price_min, filters.price_max)
+        masks["search"] = self._search_mask(filters.search)
+
+        def base(excluded: str) -> int:
+            # Счётчики фасета считаются без его собственного фильтра, иначе остальные значения обнулятся
+            mask = self._all
+            for facet, facet_mask in masks.items():
+                if facet != excluded:
+                    mask &= facet_mask
+            return mask
+
+        facets = {}
+        for facet, values in self._bitsets.items():
+            facet_base = base(facet)
+            facets[facet] = {value: (facet_base & bits).bit_count() for value, bits in sorted(values.items())}
+
+        price_base = base("price")
+        edges = self.price_edges
+        price_buckets = []
+        for index, low in enumerate(edges):
+            high = edges[index + 1] if index + 1 < len(edges) else None
+            bucket_mask = self._price_mask(low, None) & ~(self._price_mask(high, None) if high is not None else 0)
+            price_buckets.append((low, high, (price_base & bucket_mask).bit_count()))
+
+        return base("").bit_count(), facets, price_buckets
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Tuple
+
+from backend.app.repositories.idempotency_repository import IdempotencyRepository
+from backend.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1
+COMPLETE_RETRY_MAX = 5.0
+PURGE_INTERVAL = 3600
+
+
+class IdempotencyKeyReusedError(Exception):
+    pass
+
+
+class IdempotencyKeyInProgressError(Exception):
+    pass
+
+
+# Ответы по Idempotency-Key: LRU в памяти процесса перед таблицей Idempotency_keys, общей для всех воркеров
+class IdempotencyStore:
+    def __init__(self, max_entries: int, ttl_seconds: int, wait_seconds: float, abandon_seconds: float):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._wait_seconds = wait_seconds
+        self._abandon_seconds = abandon_seconds
+        # key -> (время сохранения, отпечаток запроса, статус, тело ответа)
+        self._entries: OrderedDict[str, Tuple[float, str, int, str]] = OrderedDict()
+        self._in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+    def _get(self, key: str) -> Tuple[float, str, int, str] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self._ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: str, fingerprint: str, status_code: int, body: str) -> None:
+        self._entries[key] = (time.monotonic(), fingerprint, status_code, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _check_fingerprint(key: str, expected: str, fingerprint: str) -> None:
+        if expected != fingerprint:
+            raise IdempotencyKeyReusedError(f"Ключ {key} уже использован для другого запроса")
+
+    async def run(
+            self,
+            key: str,
+            fingerprint: str,
+            operation: Callable[[], Awaitable[Tuple[int, str]]]
+    ) -> Tuple[int, str, bool]:
+        entry = self._get(key)
+        if entry is not None:
+            self._check_fingerprint(key, entry[1], fingerprint)
+            return entry[2], entry[3], True
+
+        # Повтор, пришедший, пока исходный запрос ещё выполняется в этом процессе, ждёт его результата
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._check_fingerprint(key, in_flight[0], fingerprint)
+            try:
+                status_code, body, _ = await asyncio.shield(in_flight[1])
+            except asyncio.CancelledError:
+                # Отменён сам повтор (клиент отключился, сервер останавливается): отмена идёт дальше.
+                # В 409 превращается только отмена исходного запроса, ответа которого ждали
+                if asyncio.current_task().cancelling():
+                    raise
+                raise IdempotencyKeyInProgressError(f"Запрос с ключом {key} ещё выполняется")
+            return status_code, body, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = (fingerprint, future)
+        try:
+            result = await self._execute(key, fingerprint, operation)
+            future.set_result(result)
+            return result
+        except Exception as error:
+            future.set_exception(error)
+            # Ошибку получат ожидающие повторы; если их нет, asyncio не должен ругаться на непрочитанное исключение
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._in_flight[key]
+
+    async def _execute(
+            self,
+            key: str,
+            fingerprint: str,
+            operation: Callable[[], Awaitable[Tuple[int, str]]]
+    ) -> Tuple[int, str, bool]:
+        deadline = time.monotonic() + self._wait_seconds
+        claimed_at = await self._claim(key, fingerprint)
+        while claimed_at is None:
+            row = await IdempotencyRepository.select_key(key)
+            if row is None:
+                claimed_at = await self._claim(key, fingerprint)
+                continue
+
+            now = datetime.now()
+            expired = row.created_at < now - timedelta(seconds=self._ttl_seconds)
+            # Незавершённую запись забираем, только когда исходный запрос точно не может ещё выполняться:
+            # она осталась от упавшего процесса. Медленный, но живой запрос повтор просто ждёт
+            abandoned = row.status_code is None and row.created_at < now - timedelta(seconds=self._abandon_seconds)
+            if expired or abandoned:
+                # Захватываем заново, только если удалили именно прочитанную строку. Иначе её уже забрал
+                # другой повтор, и дальше ждём его результата
+                if await IdempotencyRepository.delete_key(key, row.created_at, pending=not expired):
+                    claimed_at = await self._claim(key, fingerprint)
+                continue
+
+            self._check_fingerprint(key, row.fingerprint, fingerprint)
+            if row.status_code is not None:
+                self._put(key, row.fingerprint, row.status_code, row.response)
+                return row.status_code, row.response, True
+
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgressError(f"Запрос с ключом {key} ещё выполняется")
+            await asyncio.sleep(POLL_INTERVAL)
+
+        try:
+            status_code, body = await operation()
+        except Exception:
+            # Неуспешный запрос не запоминаем, чтобы клиент мог повторить его с тем же ключом
+            await IdempotencyRepository.delete_key(key, claimed_at, pending=True)
+            raise
+
+        # Заказ уже создан: незавершённая запись позже сочлась бы брошенной, и повтор создал бы второй заказ.
+        # Поэтому ответ сохраняем, пока не получится
+        retry_delay = POLL_INTERVAL
+        while True:
+            try:
+                await IdempotencyRepository.complete(key, status_code, body)
+                break
+            except Exception as error:
+                logger.error(
+                    f"Не удалось сохранить ответ для ключа идемпотентности {key}, "
+                    f"повтор через {retry_delay:.1f} с: {str(error)}"
+                )
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, COMPLETE_RETRY_MAX)
+        self._put(key, fingerprint, status_code, body)
+        return status_code, body, False
+
+    @staticmethod
+    async def _claim(key: str, fingerprint: str) -> datetime | None:
+        # created_at хранится без долей секунды: время захвата должно совпадать с записанным,
+        # чтобы своя строка находилась при удалении
+        claimed_at = datetime.now().replace(microsecond=0)
+        if await IdempotencyRepository.claim(key, fingerprint, claimed_at):
+            return claimed_at
+        return None
+
+    async def purge_expired(self) -> None:
+        while True:
+            await asyncio.sleep(PURGE_INTERVAL)
+            try:
+                deleted = await IdempotencyRepository.delete_expired(
+                    datetime.now() - timedelta(seconds=self._ttl_seconds)
+                )
+                logger.info(f"Удалено устаревших ключей идемпотентности: {deleted}")
+            except Exception as error:
+                logger.error(f"Ошибка при очистке ключей идемпотентности: {str(error)}", exc_info=True)
+
+
+idempotency_store = IdempotencyStore(
+    max_entries=settings.idempotency.cache_size,
+    ttl_seconds=settings.idempotency.ttl_seconds,
+    wait_seconds=settings.idempotency.wait_seconds,
+    abandon_seconds=settings.idempotency.abandon_seconds,
+)
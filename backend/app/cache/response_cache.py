@@ -0,0 +1,162 @@
+import gzip
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from backend.app.cache.catalog_cache import catalog_cache, CatalogSnapshot
+from backend.core.config import settings
+
+# Brotli указан в requirements.txt; без него отдаются только gzip и identity
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+# Мелкие ответы не сжимаем: выигрыш меньше накладных расходов на заголовки
+MIN_COMPRESS_SIZE = 1024
+
+# Сжатие идёт на первом запросе варианта внутри обработчика, поэтому уровни средние: brotli 5 быстрее gzip 9
+# и всё равно плотнее его, а 11 на каталоге занимает сотни миллисекунд event loop
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {"gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+
+# При равных q предпочитаем более плотное сжатие
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+def negotiate_encoding(accept_encoding: str | None, body_size: int) -> str:
+    if not accept_encoding or body_size < MIN_COMPRESS_SIZE:
+        return "identity"
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, parameters = part.strip().partition(";")
+        weight = 1.0
+        parameter = parameters.strip()
+        if parameter.startswith("q="):
+            try:
+                weight = float(parameter[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    candidates: List[Tuple[float, int, str]] = []
+    for preference, encoding in enumerate(ENCODING_PREFERENCE):
+        if encoding != "identity" and encoding not in COMPRESSORS:
+            continue
+        # identity допустим всегда, пока его явно не запретили, но уступает перечисленным кодировкам
+        weight = weights.get(encoding, weights.get("*", 0.001 if encoding == "identity" else 0.0))
+        if weight > 0:
+            candidates.append((-weight, preference, encoding))
+    return min(candidates)[2] if candidates else "identity"
+
+
+# Готовые JSON-тела ответов каталога и их сжатые варианты; при смене версии снапшота кэш сбрасывается целиком
+class ResponseCache:
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._version: int | None = None
+        self._entries: OrderedDict[Hashable, Dict[str, bytes]] = OrderedDict()
+
+    @staticmethod
+    def request_key(request: Request) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        return request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+    def get(self, version: int, key: Hashable) -> Dict[str, bytes] | None:
+        if version != self._version:
+            return None
+        variants = self._entries.get(key)
+        if variants is not None:
+            self._entries.move_to_end(key)
+        return variants
+
+    def put(self, version: int, key: Hashable, body: bytes) -> Dict[str, bytes]:
+        variants = {"identity": body}
+        if version != self._version:
+            if self._version is not None and version < self._version:
+                return variants
+            self._entries.clear()
+            self._version = version
+
+        self._entries[key] = variants
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return variants
+
+    @staticmethod
+    def _variant(variants: Dict[str, bytes], encoding: str) -> bytes:
+        # Сжатие выполняется один раз на версию снапшота и кладётся рядом с исходным JSON
+        body = variants.get(encoding)
+        if body is None:
+            body = COMPRESSORS[encoding](variants["identity"])
+            variants[encoding] = body
+        return body
+
+    @staticmethod
+    def _etag(snapshot: CatalogSnapshot, key: Tuple[str, Tuple[Tuple[str, str], ...]], encoding: str = "identity") -> str:
+        digest = hashlib.blake2b(f"{snapshot.fingerprint}{key}".encode(), digest_size=16).hexdigest()
+        return f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+
+    @staticmethod
+    def _if_none_match(request: Request) -> List[str]:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is None:
+            return []
+        return [candidate.strip() for candidate in if_none_match.split(",")]
+
+    @staticmethod
+    def _is_not_modified(candidates: List[str], etags: Set[str]) -> bool:
+        # Только по ETag: он считается от содержимого каталога и совпадает во всех воркерах. Last-Modified не отдаём,
+        # надёжной даты изменения нет (удаление строки не сдвигает max(updated_at))
+        return any(candidate.removeprefix("W/") in etags for candidate in candidates)
+
+    async def get_or_build(self, request: Request, build: Callable[[], Awaitable[BaseModel]]) -> Response:
+        snapshot = await catalog_cache.get_snapshot()
+        key = self.request_key(request)
+        etag = self._etag(snapshot, key)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+
+        # Клиент мог закэшировать любой вариант сжатия того же содержимого
+        candidates = self._if_none_match(request)
+        etags = {self._etag(snapshot, key, encoding) for encoding in ("identity", *COMPRESSORS)}
+        if self._is_not_modified(candidates, etags):
+            return Response(status_code=304, headers=headers)
+
+        variants = self.get(snapshot.version, key)
+        if variants is None:
+            logger.debug(f"Промах кэша ответов: {key}")
+            # Ошибка сборки (например, продукт не найден) уходит в обработчик до ответа 304
+            result = await build()
+            variants = self.put(snapshot.version, key, result.model_dump_json().encode())
+
+        # "*" совпадает с любым представлением, но только существующим: проверяем после сборки
+        if "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), len(variants["identity"]))
+        body = self._variant(variants, encoding)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+            headers["ETag"] = self._etag(snapshot, key, encoding)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(max_entries=settings.catalog.response_cache_size)
@@ -0,0 +1,92 @@
+from functools import lru_cache
+from typing import Tuple
+
+
+# Алгоритм Snowball для русского языка (snowballstem.org/algorithms/russian/stemmer.html)
+VOWELS = frozenset("аеиоуыэюя")
+
+PERFECTIVE_GERUND = (("в", "вши", "вшись"), ("ив", "ивши", "ившись", "ыв", "ывши", "ывшись"))
+ADJECTIVE = ((), (
+    "ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им", "ым", "ом",
+    "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+))
+PARTICIPLE = (("ем", "нн", "вш", "ющ", "щ"), ("ивш", "ывш", "ующ"))
+REFLEXIVE = ((), ("ся", "сь"))
+VERB = (
+    ("ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют", "ны", "ть", "ешь", "нно"),
+    (
+        "ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил", "ыл", "им", "ым", "ен",
+        "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт", "ены", "ить", "ыть", "ишь", "ую", "ю",
+    ),
+)
+NOUN = ((), (
+    "а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и", "ией", "ей", "ой", "ий", "й",
+    "иям", "ям", "ием", "ем", "ам", "ом", "о", "у", "ах", "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия", "ья", "я",
+))
+SUPERLATIVE = ((), ("ейш", "ейше"))
+DERIVATIONAL = ((), ("ост", "ость"))
+
+
+def _regions(word: str) -> Tuple[int, int]:
+    # RV - после первой гласной, R2 - второй регион R1 по определению Snowball
+    rv = next((index + 1 for index, letter in enumerate(word) if letter in VOWELS), len(word))
+
+    def next_region(start: int) -> int:
+        for index in range(start + 1, len(word)):
+            if word[index] not in VOWELS and word[index - 1] in VOWELS:
+                return index + 1
+        return len(word)
+
+    return rv, next_region(next_region(0))
+
+
+def _remove(rv: str, endings: Tuple[Tuple[str, ...], Tuple[str, ...]]) -> Tuple[str, bool]:
+    # Ищется самое длинное окончание; окончаниям первой группы должна предшествовать "а" или "я"
+    after_a, plain = endings
+    matched = max((ending for ending in (*after_a, *plain) if rv.endswith(ending)), key=len, default=None)
+    if matched is None:
+        return rv, False
+
+    stem = rv[:-len(matched)]
+    if matched in after_a and matched not in plain and not stem.endswith(("а", "я")):
+        return rv, False
+    return stem, True
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    if not any("а" <= letter <= "я" for letter in word):
+        return word
+
+    rv_start, r2_start = _regions(word)
+    prefix, rv = word[:rv_start], word[rv_start:]
+
+    rv, removed = _remove(rv, PERFECTIVE_GERUND)
+    if not removed:
+        rv, _ = _remove(rv, REFLEXIVE)
+        rv, removed = _remove(rv, ADJECTIVE)
+        if removed:
+            rv, _ = _remove(rv, PARTICIPLE)
+        else:
+            rv, removed = _remove(rv, VERB)
+            if not removed:
+                rv, _ = _remove(rv, NOUN)
+
+    if rv.endswith("и"):
+        rv = rv[:-1]
+
+    derivational, removed = _remove(rv, DERIVATIONAL)
+    if removed and rv_start + len(derivational) >= r2_start:
+        rv = derivational
+
+    if rv.endswith("нн"):
+        rv = rv[:-1]
+    else:
+        rv, removed = _remove(rv, SUPERLATIVE)
+        if removed:
+            if rv.endswith("нн"):
+                rv = rv[:-1]
+        elif rv.endswith("ь"):
+            rv = rv[:-1]
+
+    return prefix + rv
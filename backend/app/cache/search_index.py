@@ -0,0 +1,143 @@
+import bisect
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from backend.app.cache.russian_stemmer import stem
+
+
+TOKEN_PATTERN = re.compile(r"[0-9a-zа-я]+")
+
+# Вес поля в ранжировании: совпадение в названии важнее совпадения в описании
+FIELD_WEIGHTS = (
+    ("name", 3.0),
+    ("model", 2.0),
+    ("brend", 2.0),
+    ("flavor", 2.0),
+    ("color", 1.0),
+    ("country", 1.0),
+    ("description", 1.0),
+)
+
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+FUZZY_MIN_SIMILARITY = 0.4
+FUZZY_MIN_LENGTH = 4
+FUZZY_CANDIDATES = 3
+
+
+def normalize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower().replace("ё", "е"))
+
+
+def terms(text: str) -> List[str]:
+    return [stem(token) for token in normalize(text)]
+
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def _field_text(product, field: str) -> str:
+    value = getattr(product, field, None)
+    if value is None:
+        return ""
+    if isinstance(value, (set, frozenset)):
+        return " ".join(sorted(value))
+    return str(value)
+
+
+def _term_weights(product) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS:
+        for term in terms(_field_text(product, field)):
+            weights[term] = weights.get(term, 0.0) + weight
+    return weights
+
+
+# Обратный индекс по товарам снапшота: термин -> {номер документа: вес}.
+# При пересборке разбор и стемминг повторяются только для изменённых товаров: веса терминов остальных
+# берутся из предыдущего индекса, заново собираются лишь списки документов и idf
+class SearchIndex:
+    def __init__(self, products: Iterable[Tuple[str, object]], previous: "SearchIndex | None" = None):
+        self.documents: List[Tuple[str, int]] = []
+        self._term_weights: Dict[Tuple[str, int], Tuple[object, Dict[str, float]]] = {}
+        previous_weights = previous._term_weights if previous is not None else {}
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+
+        for document, (product_type, product) in enumerate(products):
+            self.documents.append((product_type, product.id))
+            reused = previous_weights.get((product_type, product.id))
+            weights = reused[1] if reused is not None and reused[0] == product else _term_weights(product)
+            self._term_weights[(product_type, product.id)] = (product, weights)
+            for term, weight in weights.items():
+                postings[term][document] = weight
+
+        self._postings: Dict[str, Dict[int, float]] = dict(postings)
+        self._sorted_terms: Tuple[str, ...] = tuple(sorted(self._postings))
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + len(self.documents) / len(documents)) for term, documents in self._postings.items()
+        }
+
+        trigram_terms: Dict[str, List[str]] = defaultdict(list)
+        for term in self._sorted_terms:
+            for trigram in _trigrams(term):
+                trigram_terms[trigram].append(term)
+        self._trigram_terms: Dict[str, List[str]] = dict(trigram_terms)
+
+    def _expand(self, query_term: str) -> List[Tuple[str, float]]:
+        # Точное совпадение, затем продолжения по префиксу, затем похожие по триграммам (опечатки)
+        if query_term in self._postings:
+            return [(query_term, 1.0)]
+
+        matches = []
+        position = bisect.bisect_left(self._sorted_terms, query_term)
+        while position < len(self._sorted_terms) and self._sorted_terms[position].startswith(query_term):
+            matches.append((self._sorted_terms[position], PREFIX_WEIGHT))
+            position += 1
+        if matches or len(query_term) < FUZZY_MIN_LENGTH:
+            return matches
+
+        query_trigrams = _trigrams(query_term)
+        shared = Counter(
+            term for trigram in query_trigrams for term in self._trigram_terms.get(trigram, ())
+        )
+        similar = []
+        for term, count in shared.items():
+            similarity = count / (len(query_trigrams) + len(_trigrams(term)) - count)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                similar.append((similarity, term))
+        similar.sort(reverse=True)
+        return [(term, FUZZY_WEIGHT * similarity) for similarity, term in similar[:FUZZY_CANDIDATES]]
+
+    def search(self, query: str, product_types: Sequence[str] | None = None) -> List[Tuple[str, int]]:
+        query_terms = list(dict.fromkeys(terms(query)))
+        if not query_terms:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, int] = defaultdict(int)
+        for query_term in query_terms:
+            best: Dict[int, float] = {}
+            for term, term_weight in self._expand(query_term):
+                idf = self._idf[term]
+                for document, field_weight in self._postings[term].items():
+                    score = term_weight * field_weight * idf
+                    if score > best.get(document, 0.0):
+                        best[document] = score
+            for document, score in best.items():
+                scores[document] += score
+                matched[document] += 1
+
+        # Сначала документы, где нашлось больше слов запроса, затем по релевантности, при равенстве новее выше
+        ranked = sorted(
+            scores,
+            key=lambda document: (-matched[document], -scores[document], -self.documents[document][1])
+        )
+        return [
+            self.documents[document]
+            for document in ranked
+            if not product_types or self.documents[document][0] in product_types
+        ]
@@ -0,0 +1,78 @@
+import heapq
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping, Sequence, Tuple
+
+from backend.app.api.schemas import DevicesSchema, IqosSchema, TereaSchema
+
+
+def _price_closeness(first, second) -> float:
+    # 1 при равной цене, 0 при разнице в половину и больше от большей цены
+    highest = max(first.price, second.price)
+    if not highest:
+        return 1.0
+    return max(0.0, 1.0 - float(abs(first.price - second.price) / highest) * 2)
+
+
+def _same(first, second, attribute: str) -> float:
+    value = getattr(first, attribute)
+    return 1.0 if value is not None and value == getattr(second, attribute) else 0.0
+
+
+def _terea_score(first: TereaSchema, second: TereaSchema) -> float:
+    flavors = len(first.flavor | second.flavor)
+    flavor_score = len(first.flavor & second.flavor) / flavors if flavors else 0.0
+    return (
+        3.0 * flavor_score
+        + 2.0 * _same(first, second, "strength")
+        + 1.0 * _same(first, second, "brend")
+        + 1.0 * _same(first, second, "terea_id")
+        + 0.5 * _same(first, second, "country")
+        + 1.0 * _price_closeness(first, second)
+    )
+
+
+def _iqos_score(first: IqosSchema, second: IqosSchema) -> float:
+    return (
+        3.0 * _same(first, second, "model")
+        + 1.5 * _same(first, second, "id_category")
+        + 1.0 * _same(first, second, "color")
+        + 1.0 * _price_closeness(first, second)
+    )
+
+
+def _devices_score(first: DevicesSchema, second: DevicesSchema) -> float:
+    return (
+        2.0 * _same(first, second, "device_id")
+        + 1.0 * _same(first, second, "color")
+        + 1.0 * _price_closeness(first, second)
+    )
+
+
+SCORES: Mapping[str, Callable[[object, object], float]] = {
+    "terea": _terea_score,
+    "iqos": _iqos_score,
+    "devices": _devices_score,
+}
+
+
+# Топ-K похожих внутри одного типа; товары в наличии выше, при равенстве - новее (id desc).
+# Списки считаются целиком при сборке снапшота (она идёт в asyncio.to_thread), запрос - поиск в словаре
+class SimilarityIndex:
+    def __init__(self, product_type: str, products: Sequence, top_k: int):
+        self._score = SCORES[product_type]
+        self._products = tuple(products)
+        self._top_k = top_k
+        self._similar: Mapping[int, Tuple[int, ...]] = MappingProxyType({
+            product.id: self._build(product) for product in self._products
+        })
+
+    def get(self, product_id: int) -> Tuple[int, ...] | None:
+        return self._similar.get(product_id)
+
+    def _build(self, product) -> Tuple[int, ...]:
+        neighbours: Iterable = (
+            (self._score(product, other) + (0.5 if other.nalichie else 0.0), other.id)
+            for other in self._products
+            if other.id != product.id
+        )
+        return tuple(other_id for _, other_id in heapq.nlargest(self._top_k, neighbours))
@@ -0,0 +1,53 @@
+import bisect
+from array import array
+from typing import Iterable, Tuple
+
+from backend.app.api.schemas import DevicesSchema, IqosSchema, TereaSchema
+
+
+# Цены хранятся целыми рублями (DECIMAL(10, 0)), отсутствующая цена - NO_PRICE
+NO_PRICE = -1
+
+StockEntry = Tuple[int, int, int | None, int | None]
+
+
+def _price(value) -> int:
+    return NO_PRICE if value is None else int(value)
+
+
+# Остатки и цены по ref в плоских массивах: отсортированные ref + параллельные array по индексу
+class StockIndex:
+    def __init__(self, products: Iterable[DevicesSchema | IqosSchema | TereaSchema]):
+        rows = sorted(
+            (
+                product.ref,
+                product.nalichie,
+                _price(product.price),
+                _price(getattr(product, "pricePack", None)),
+                _price(getattr(product, "sale_price", None)),
+            )
+            for product in products
+        )
+
+        self._refs: Tuple[str, ...] = tuple(row[0] for row in rows)
+        self._nalichie = array("b", (row[1] for row in rows))
+        self._price = array("q", (row[2] for row in rows))
+        self._price_pack = array("q", (row[3] for row in rows))
+        self._sale_price = array("q", (row[4] for row in rows))
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def get(self, ref: str) -> StockEntry | None:
+        position = bisect.bisect_left(self._refs, ref)
+        if position == len(self._refs) or self._refs[position] != ref:
+            return None
+
+        price_pack = self._price_pack[position]
+        sale_price = self._sale_price[position]
+        return (
+            self._nalichie[position],
+            self._price[position],
+            None if price_pack == NO_PRICE else price_pack,
+            None if sale_price == NO_PRICE else sale_price,
+        )
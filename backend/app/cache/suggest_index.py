@@ -0,0 +1,67 @@
+import bisect
+import heapq
+from collections import Counter
+from typing import Iterable, List, Mapping, Tuple
+
+from backend.app.cache.search_index import normalize
+
+
+# (ключ, текст, вид подсказки, тип продукта, ref или None, вес)
+Suggestion = Tuple[str, str, str, str, str | None, int]
+
+ATTRIBUTE_KINDS = (("flavor", "flavor"), ("brend", "brand"), ("country", "country"), ("model", "model"))
+
+
+def _key(text: str) -> str:
+    return " ".join(normalize(text))
+
+
+def _attribute_values(product, field: str) -> Iterable[str]:
+    value = getattr(product, field, None)
+    if not value:
+        return ()
+    if isinstance(value, (set, frozenset)):
+        return value
+    return (value,)
+
+
+# Отсортированный массив ключей для поиска по префиксу через bisect
+class SuggestIndex:
+    def __init__(self, products: Iterable[Tuple[str, object]], sales: Mapping[str, int]):
+        entries: List[Suggestion] = []
+        attributes: Counter = Counter()
+
+        for product_type, product in products:
+            # Популярность товара: продажи, затем хит и наличие
+            weight = sales.get(product.name, 0) * 10 + (product.hit or 0) * 5 + product.nalichie
+            words = normalize(product.name)
+            # Каждое слово названия - отдельная точка входа, чтобы "sienna" находила "Terea Sienna"
+            for start in range(len(words)):
+                entries.append((" ".join(words[start:]), product.name, "product", product_type, product.ref, weight))
+
+            for field, kind in ATTRIBUTE_KINDS:
+                for value in _attribute_values(product, field):
+                    attributes[(value, kind, product_type)] += product.nalichie + 1
+
+        for (value, kind, product_type), weight in attributes.items():
+            entries.append((_key(value), value, kind, product_type, None, weight))
+
+        entries.sort()
+        self._keys: Tuple[str, ...] = tuple(entry[0] for entry in entries)
+        self._entries: Tuple[Suggestion, ...] = tuple(entries)
+
+    def suggest(self, prefix: str, limit: int) -> List[Suggestion]:
+        prefix = _key(prefix)
+        if not prefix:
+            return []
+
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + "\uffff", lo=start)
+
+        # Одинаковый товар или значение атрибута мог совпасть по нескольким словам
+        unique = {}
+        for entry in self._entries[start:end]:
+            identity = entry[1:5]
+            if identity not in unique or unique[identity][5] < entry[5]:
+                unique[identity] = entry
+        return heapq.nsmallest(limit, unique.values(), key=lambda entry: (-entry[5], len(entry[1]), entry[1]))
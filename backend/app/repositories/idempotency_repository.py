@@ -0,0 +1,93 @@
+import logging
+from datetime import datetime
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+
+from backend.core.models import IdempotencyKeyModel
+from backend.core.db_helper import db_helper
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyRepository:
+
+    @staticmethod
+    async def select_key(key: str) -> IdempotencyKeyModel | None:
+        logger.debug(f"Получение ключа идемпотентности {key}")
+        try:
+            async with db_helper.session_factory() as session:
+                result = await session.execute(select(IdempotencyKeyModel).where(IdempotencyKeyModel.key == key))
+                return result.scalar_one_or_none()
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении ключа идемпотентности {key}: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def claim(key: str, fingerprint: str, created_at: datetime) -> bool:
+        # Первичный ключ по key: из параллельных запросов с одним ключом строку вставит только один
+        logger.debug(f"Захват ключа идемпотентности {key}")
+        try:
+            async with db_helper.session_factory() as session:
+                session.add(IdempotencyKeyModel(key=key, fingerprint=fingerprint, created_at=created_at))
+                await session.commit()
+                return True
+
+        except IntegrityError:
+            return False
+        except Exception as error:
+            logger.error(f"Ошибка при захвате ключа идемпотентности {key}: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def complete(key: str, status_code: int, response: str) -> None:
+        logger.debug(f"Сохранение ответа для ключа идемпотентности {key}")
+        try:
+            async with db_helper.session_factory() as session:
+                await session.execute(
+                    update(IdempotencyKeyModel)
+                    .where(IdempotencyKeyModel.key == key)
+                    .values(status_code=status_code, response=response)
+                )
+                await session.commit()
+
+        except Exception as error:
+            logger.error(f"Ошибка при сохранении ответа для ключа идемпотентности {key}: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def delete_key(key: str, created_at: datetime, pending: bool = False) -> bool:
+        # Удаляется только та строка, которую видел вызывающий: если ключ тем временем захватил
+        # или завершил другой запрос, строка не совпадёт и останется на месте
+        logger.debug(f"Удаление ключа идемпотентности {key}")
+        try:
+            async with db_helper.session_factory() as session:
+                statement = delete(IdempotencyKeyModel).where(
+                    IdempotencyKeyModel.key == key,
+                    IdempotencyKeyModel.created_at == created_at
+                )
+                if pending:
+                    statement = statement.where(IdempotencyKeyModel.status_code.is_(None))
+                result = await session.execute(statement)
+                await session.commit()
+                return result.rowcount == 1
+
+        except Exception as error:
+            logger.error(f"Ошибка при удалении ключа идемпотентности {key}: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def delete_expired(created_before: datetime) -> int:
+        logger.debug(f"Удаление ключей идемпотентности старше {created_before}")
+        try:
+            async with db_helper.session_factory() as session:
+                result = await session.execute(
+                    delete(IdempotencyKeyModel).where(IdempotencyKeyModel.created_at < created_before)
+                )
+                await session.commit()
+                return result.rowcount
+
+        except Exception as error:
+            logger.error(f"Ошибка при удалении устаревших ключей идемпотентности: {str(error)}", exc_info=True)
+            raise
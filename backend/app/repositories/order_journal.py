@@ -0,0 +1,103 @@
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Tuple
+
+
+# Запись, которую не удалось выгрузить столько раз при доступной БД, остаётся в журнале для разбора вручную
+MAX_ATTEMPTS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS intake (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    intake_id TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    customer_phone TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS idempotency (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    intake_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+# Локальный журнал приёма заказов в SQLite (WAL). Методы синхронные: вызываются из одного потока-исполнителя
+class OrderJournal:
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # FULL: каждый COMMIT доходит до диска, иначе подтверждённый клиенту заказ может пропасть при сбое питания
+        self._connection.execute("PRAGMA synchronous=FULL")
+        self._connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        cursor = self._connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    def append(
+            self,
+            rows: Iterable[Tuple[str, str, str, str, str | None, str | None]]
+    ) -> List[Tuple[str, int, str | None]]:
+        # Пачка (intake_id, payload, телефон, created_at, ключ идемпотентности, отпечаток) в одной транзакции:
+        # один fsync на всю пачку. Для каждой строки возвращается (intake_id, seq, отпечаток):
+        # отпечаток не None, если ключ уже был и заказ не записан повторно - тогда intake_id и seq прежние
+        results = []
+        with self._transaction() as cursor:
+            for intake_id, payload, customer_phone, created_at, key, fingerprint in rows:
+                if key is not None:
+                    existing = cursor.execute(
+                        "SELECT intake_id, seq, fingerprint FROM idempotency WHERE key = ?", (key,)
+                    ).fetchone()
+                    if existing is not None:
+                        results.append(existing)
+                        continue
+
+                cursor.execute(
+                    "INSERT INTO intake (intake_id, payload, customer_phone, created_at) VALUES (?, ?, ?, ?)",
+                    (intake_id, payload, customer_phone, created_at)
+                )
+                seq = cursor.lastrowid
+                if key is not None:
+                    cursor.execute(
+                        "INSERT INTO idempotency (key, fingerprint, intake_id, seq, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (key, fingerprint, intake_id, seq, created_at)
+                    )
+                results.append((intake_id, seq, None))
+        return results
+
+    def pending(self, limit: int) -> List[Tuple[int, str, str, str, str]]:
+        return self._connection.execute(
+            "SELECT seq, intake_id, payload, customer_phone, created_at FROM intake "
+            "WHERE attempts < ? ORDER BY seq LIMIT ?",
+            (MAX_ATTEMPTS, limit)
+        ).fetchall()
+
+    def remove(self, seqs: List[int]) -> None:
+        with self._transaction() as cursor:
+            cursor.executemany("DELETE FROM intake WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def record_failure(self, seq: int, error: str, permanent: bool = False) -> None:
+        # permanent - запись не станет корректной от повторов (не разбирается payload), сразу откладываем её для разбора
+        self._connection.execute(
+            "UPDATE intake SET attempts = CASE WHEN ? THEN ? ELSE attempts + 1 END, error = ? WHERE seq = ?",
+            (permanent, MAX_ATTEMPTS, error, seq)
+        )
+
+    def purge_idempotency(self, created_before: str) -> int:
+        with self._transaction() as cursor:
+            return cursor.execute("DELETE FROM idempotency WHERE created_at < ?", (created_before,)).rowcount
+
+    def close(self) -> None:
+        self._connection.close()
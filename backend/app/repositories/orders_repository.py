@@ -1,65 +1,227 @@
 import logging
+from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Dict, List, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, insert, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.models import OrderModel, OrderedProductModel
+from backend.core.models import CustomerModel, OrderModel, OrderedProductModel
 from backend.core.db_helper import db_helper
 
 logger = logging.getLogger(__name__)
 
+_consecutive_ids: bool | None = None
+_auto_increment_step: int | None = None
+
 
 class OrderRepository:
 
     @staticmethod
-    async def create(order_data: dict) -> OrderModel:
-        logger.info(f"Создание нового заказа с данными: {order_data}")
-        try:
-            ordered_items_data = order_data.pop('ordered_items', [])
-            phone_number = order_data.get('phone_number')
+    async def _ids_are_consecutive(session: AsyncSession) -> bool:
+        # Многострочный INSERT получает id подряд только в режимах блокировки auto_increment 0 и 1.
+        # В режиме 2 (по умолчанию в MySQL 8) параллельные вставки перемежают id, считать их нельзя
+        global _consecutive_ids, _auto_increment_step
+        if _consecutive_ids is None:
+            lock_mode, _auto_increment_step = (await session.execute(
+                text("SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment")
+            )).one()
+            _consecutive_ids = int(lock_mode) < 2
+        return _consecutive_ids
 
-            async with db_helper.session_factory() as session:
-                existing_order_result = await session.execute(
-                    select(OrderModel.id)
-                    .where(OrderModel.phone_number == phone_number)
-                    .limit(1)
-                )
-                existing_order = existing_order_result.scalar_one_or_none()
+    @staticmethod
+    async def _insert_rows(session: AsyncSession, model, rows: List[dict]) -> List[int] | None:
+        # Все строки одним INSERT с несколькими VALUES. None - id нужно перечитать из БД
+        connection = await session.connection()
+        if connection.dialect.insert_returning:
+            # id раздаются по порядку строк VALUES, а порядок строк RETURNING не гарантирован
+            result = await session.execute(insert(model).values(rows).returning(model.id))
+            return sorted(result.scalars())
+
+        # MySQL не умеет RETURNING: LAST_INSERT_ID() многострочного INSERT - id первой строки
+        result = await session.execute(insert(model).values(rows))
+        if len(rows) == 1:
+            return [result.lastrowid]
+        if await OrderRepository._ids_are_consecutive(session):
+            return [result.lastrowid + index * _auto_increment_step for index in range(len(rows))]
+        return None
 
-                order_data['is_first_order'] = existing_order is None
+    @staticmethod
+    def _prepare(order_data: dict) -> List[dict]:
+        ordered_items_data = order_data.pop('ordered_items', [])
+
+        total_amount = Decimal('0.00')
+        for item_data in ordered_items_data:
+            item_data['price_at_time_of_order'] = Decimal(item_data['price_at_time_of_order'])
+            total_amount += Decimal(item_data.get('quantity', 0)) * item_data['price_at_time_of_order']
+
+        order_data['total_amount'] = total_amount
+        # Время заказа ставит приложение, в UTC: его не нужно перечитывать после вставки.
+        # Заказ из журнала приходит со временем приёма. Колонка хранит секунды, доли отбрасываются заранее,
+        # чтобы ответ совпадал с записанным значением
+        created_at = order_data.get('created_at') or datetime.now(timezone.utc).replace(tzinfo=None)
+        order_data['created_at'] = created_at.replace(microsecond=0)
+        return ordered_items_data
 
-                total_amount = Decimal('0.00')
-                for item_data in ordered_items_data:
-                    quantity = item_data.get('quantity', 0)
-                    price = Decimal(item_data.get('price_at_time_of_order', 0))
-                    total_amount += Decimal(quantity) * price
+    @staticmethod
+    async def _upsert_customer(session: AsyncSession, customer_phone: str, order_data: dict) -> bool:
+        customer_insert = mysql_insert(CustomerModel).values(
+            phone=customer_phone,
+            orders_count=1,
+            total_amount=order_data['total_amount'],
+            first_order_at=order_data['created_at'],
+            last_order_at=order_data['created_at']
+        )
+        customer_result = await session.execute(
+            customer_insert.on_duplicate_key_update(
+                orders_count=CustomerModel.orders_count + 1,
+                total_amount=CustomerModel.total_amount + customer_insert.inserted.total_amount,
+                last_order_at=func.greatest(CustomerModel.last_order_at, customer_insert.inserted.last_order_at)
+            )
+        )
+        # ON DUPLICATE KEY UPDATE возвращает 1, если строка вставлена, и 2, если обновлена.
+        # Уникальный ключ по телефону гарантирует, что первым окажется ровно один из параллельных заказов
+        return customer_result.rowcount == 1
 
-                order_data['total_amount'] = total_amount
+    @staticmethod
+    async def _has_orders_by_phone_number(session: AsyncSession, phone_number: str) -> bool:
+        # Для номера, который не привести к E.164, покупателя нет: ищем прежние заказы по номеру как введён
+        result = await session.execute(
+            select(OrderModel.id)
+            .where(OrderModel.phone_number == phone_number)
+            .limit(1)
+        )
+        return result.scalar_one_or_none() is not None
 
-                new_order = OrderModel(**order_data)
-                session.add(new_order)
-                await session.flush()
+    @staticmethod
+    async def _select_ids(
+        session: AsyncSession, orders: List[dict], order_ids: List[int] | None
+    ) -> Tuple[List[int], List[int]]:
+        # id заказов и их позиций одним запросом. Без id заказов это пачка из журнала: ищем по intake_id.
+        # Внутри одного INSERT id растут по порядку строк, поэтому id позиций заказа по возрастанию
+        # совпадают с порядком, в котором позиции вставлялись
+        if order_ids is None:
+            condition = OrderModel.intake_id.in_([order_data['intake_id'] for order_data in orders])
+        else:
+            condition = OrderModel.id.in_(order_ids)
+        result = await session.execute(
+            select(OrderModel.intake_id, OrderModel.id, OrderedProductModel.id)
+            .outerjoin(OrderedProductModel, OrderedProductModel.order_id == OrderModel.id)
+            .where(condition)
+            .order_by(OrderModel.id, OrderedProductModel.id)
+        )
+        ids_by_intake: Dict[str, int] = {}
+        ids_by_order: Dict[int, List[int]] = {}
+        for intake_id, order_id, item_id in result.all():
+            ids_by_intake[intake_id] = order_id
+            ids_by_order.setdefault(order_id, [])
+            if item_id is not None:
+                ids_by_order[order_id].append(item_id)
+        if order_ids is None:
+            order_ids = [ids_by_intake[order_data['intake_id']] for order_data in orders]
+        return order_ids, [item_id for order_id in order_ids for item_id in ids_by_order[order_id]]
 
-                for item_data in ordered_items_data:
-                    item_data['price_at_time_of_order'] = Decimal(item_data['price_at_time_of_order'])
-                    item = OrderedProductModel(order_id=new_order.id, **item_data)
-                    session.add(item)
+    @staticmethod
+    async def _write_orders(session: AsyncSession, orders: List[Tuple[dict, str | None]]) -> List[OrderModel]:
+        orders_items = [OrderRepository._prepare(order_data) for order_data, _ in orders]
+        raw_phone_numbers = set()
+        for order_data, customer_phone in orders:
+            if customer_phone is not None:
+                order_data['is_first_order'] = await OrderRepository._upsert_customer(session, customer_phone, order_data)
+                continue
+            # Заказы пачки ещё не вставлены, поэтому повтор того же номера внутри пачки учитывается отдельно
+            phone_number = order_data['phone_number']
+            order_data['is_first_order'] = (
+                phone_number not in raw_phone_numbers
+                and not await OrderRepository._has_orders_by_phone_number(session, phone_number)
+            )
+            raw_phone_numbers.add(phone_number)
+
+        orders_data = [order_data for order_data, _ in orders]
+        order_ids = await OrderRepository._insert_rows(session, OrderModel, orders_data)
+        if order_ids is None:
+            # Позиции ссылаются на заказ подзапросом по intake_id, id всех строк потом читаются одним запросом
+            order_refs = [
+                select(OrderModel.id).where(OrderModel.intake_id == order_data['intake_id']).scalar_subquery()
+                for order_data in orders_data
+            ]
+        else:
+            order_refs = order_ids
+
+        items = [
+            {**item_data, 'order_id': order_ref}
+            for order_ref, ordered_items_data in zip(order_refs, orders_items)
+            for item_data in ordered_items_data
+        ]
+        item_ids = await OrderRepository._insert_rows(session, OrderedProductModel, items) if items else []
+        if order_ids is None or item_ids is None:
+            order_ids, item_ids = await OrderRepository._select_ids(session, orders_data, order_ids)
+
+        item_ids_iter = iter(item_ids)
+        new_orders = []
+        for order_id, order_data, ordered_items_data in zip(order_ids, orders_data, orders_items):
+            ordered_items = [
+                OrderedProductModel(id=next(item_ids_iter), **item_data, order_id=order_id)
+                for item_data in ordered_items_data
+            ]
+            new_orders.append(OrderModel(id=order_id, **order_data, ordered_items=ordered_items))
+        return new_orders
 
+    @staticmethod
+    async def create(order_data: dict, customer_phone: str | None) -> OrderModel:
+        logger.info(f"Создание нового заказа с данными: {order_data}")
+        try:
+            async with db_helper.session_factory() as session:
+                new_order = (await OrderRepository._write_orders(session, [(order_data, customer_phone)]))[0]
                 await session.commit()
 
-                await session.refresh(new_order)
+            logger.info(f"Заказ успешно создан с ID: {new_order.id}, is_first_order: {new_order.is_first_order}")
+            return new_order
+        except Exception as error:
+            logger.error(f"Ошибка при создании заказа: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def create_batch(orders: List[Tuple[str, dict, str | None]]) -> Dict[str, int]:
+        # Заказы из журнала приёма: (intake_id, данные заказа, телефон). Уже записанные intake_id пропускаются,
+        # поэтому повторная выгрузка той же пачки после сбоя не создаёт дублей
+        logger.info(f"Пакетная запись заказов: {len(orders)}")
+        try:
+            async with db_helper.session_factory() as session:
+                existing_result = await session.execute(
+                    select(OrderModel.intake_id, OrderModel.id)
+                    .where(OrderModel.intake_id.in_([intake_id for intake_id, _, _ in orders]))
+                )
+                order_ids: Dict[str, int] = dict(existing_result.all())
+
+                pending = [
+                    ({**order_data, 'intake_id': intake_id}, customer_phone)
+                    for intake_id, order_data, customer_phone in orders
+                    if intake_id not in order_ids
+                ]
+                if pending:
+                    for new_order in await OrderRepository._write_orders(session, pending):
+                        order_ids[new_order.intake_id] = new_order.id
+                await session.commit()
 
+            logger.info(f"Пакет заказов записан: новых {len(pending)}, уже записанных {len(orders) - len(pending)}")
+            return order_ids
+        except Exception as error:
+            logger.error(f"Ошибка при пакетной записи заказов: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def select_sales_by_product_name() -> Dict[str, int]:
+        logger.debug("Подсчёт продаж по названиям товаров")
+        try:
+            async with db_helper.session_factory() as session:
                 result = await session.execute(
-                    select(OrderModel)
-                    .options(selectinload(OrderModel.ordered_items))
-                    .where(OrderModel.id == new_order.id)
+                    select(OrderedProductModel.product_name, func.sum(OrderedProductModel.quantity))
+                    .group_by(OrderedProductModel.product_name)
                 )
-                fully_loaded_order = result.unique().scalar_one()
+                return {product_name: int(quantity or 0) for product_name, quantity in result.all()}
 
-                logger.info(
-                    f"Заказ успешно создан с ID: {fully_loaded_order.id}, is_first_order: {fully_loaded_order.is_first_order}")
-                return fully_loaded_order
         except Exception as error:
-            logger.error(f"Ошибка при создании заказа: {str(error)}", exc_info=True)
+            logger.error(f"Ошибка при подсчёте продаж: {str(error)}", exc_info=True)
             raise
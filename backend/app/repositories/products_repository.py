@@ -1,32 +1,173 @@
 import logging
-from typing import Tuple, List
+from typing import Any, AsyncIterator, Sequence, Tuple, List
 
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, or_, and_, delete, insert, literal
+from sqlalchemy.orm import selectinload, load_only
 
-from backend.core.models import DevicesModel, IqosModel, TereaModel
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.core.models import (
+    DevicesModel, DevicesCategoryModel,
+    IqosModel, IqosCategoryModel,
+    TereaModel, TereaCategoryModel,
+    ProductModel
+)
 from backend.core.db_helper import db_helper
 
 
 logger = logging.getLogger(__name__)
 
 
+def _common_conditions(model, category_column, filters: ProductFilters, search_columns: tuple = ()) -> list:
+    conditions = []
+    if filters.price_min is not None:
+        conditions.append(model.price >= filters.price_min)
+    if filters.price_max is not None:
+        conditions.append(model.price <= filters.price_max)
+    if filters.in_stock is not None:
+        conditions.append(model.nalichie == int(filters.in_stock))
+    if filters.new is not None:
+        conditions.append(model.new == int(filters.new))
+    if filters.hit is not None:
+        conditions.append(model.hit == 1 if filters.hit else or_(model.hit == 0, model.hit.is_(None)))
+    if filters.category_id is not None:
+        conditions.append(category_column == filters.category_id)
+    if filters.search:
+        conditions.append(or_(*(
+            column.contains(filters.search, autoescape=True) for column in (model.name, *search_columns)
+        )))
+    return conditions
+
+
+def _terea_conditions(filters: ProductFilters) -> list:
+    conditions = _common_conditions(TereaModel, TereaModel.terea_id, filters)
+    if filters.flavor:
+        conditions.append(or_(*(func.find_in_set(flavor, TereaModel.flavor) > 0 for flavor in filters.flavor)))
+    if filters.strength:
+        conditions.append(TereaModel.strength.in_(filters.strength))
+    if filters.country:
+        conditions.append(TereaModel.country.in_(filters.country))
+    if filters.brend:
+        conditions.append(TereaModel.brend.in_(filters.brend))
+    if filters.has_capsule is not None:
+        conditions.append(TereaModel.has_capsule == int(filters.has_capsule))
+    return conditions
+
+
+def _iqos_conditions(filters: ProductFilters) -> list:
+    conditions = _common_conditions(IqosModel, IqosModel.id_category, filters, search_columns=(IqosModel.model,))
+    if filters.color:
+        conditions.append(IqosModel.color.in_(filters.color))
+    if filters.model:
+        conditions.append(IqosModel.model.in_(filters.model))
+    return conditions
+
+
+def _devices_conditions(filters: ProductFilters) -> list:
+    conditions = _common_conditions(DevicesModel, DevicesModel.device_id, filters)
+    if filters.color:
+        conditions.append(DevicesModel.color.in_(filters.color))
+    return conditions
+
+
+def _order_by(model, sort: str) -> tuple:
+    # id всегда последний ключ, чтобы порядок страниц был стабильным при равных ценах и названиях
+    return {
+        'id_desc': (model.id.desc(),),
+        'id_asc': (model.id.asc(),),
+        'price_asc': (model.price.asc(), model.id.asc()),
+        'price_desc': (model.price.desc(), model.id.desc()),
+        'name_asc': (model.name.asc(), model.id.asc()),
+        'name_desc': (model.name.desc(), model.id.desc()),
+    }[sort]
+
+
+def _keyset_condition(model, sort: str, cursor_key: Tuple[Any, ...]):
+    # Условие "строго после последней строки страницы" в порядке _order_by
+    sort_field, direction = sort.rsplit('_', 1)
+    after = (lambda column, value: column > value) if direction == 'asc' else (lambda column, value: column < value)
+
+    if sort_field == 'id':
+        return after(model.id, cursor_key[0])
+
+    column = getattr(model, sort_field)
+    value, last_id = cursor_key
+    return or_(after(column, value), and_(column == value, after(model.id, last_id)))
+
+
+def _projection_options(model, columns: Sequence[str] | None, sort: str) -> list:
+    # Категории берутся из снапшота по внешнему ключу, отдельный запрос за ними не нужен
+    if columns is None:
+        return []
+
+    # id и поле сортировки нужны для курсора, внешний ключ - для категории
+    loaded = {"id", sort.rsplit('_', 1)[0], *columns} - {"category"}
+    if "category" in columns:
+        loaded.update(column.key for column in model.category.property.local_columns)
+    return [load_only(*(getattr(model, column) for column in sorted(loaded)))]
+
+
+def _products_conditions(filters: ProductFilters, product_types: Sequence[str] | None) -> list:
+    conditions = _common_conditions(ProductModel, ProductModel.category_id, filters)
+    if product_types:
+        conditions.append(ProductModel.type.in_(product_types))
+    return conditions
+
+
+# Источник строк витрины Products: тип -> (модель, модель категории, внешний ключ категории)
+PRODUCT_SOURCES = {
+    "terea": (TereaModel, TereaCategoryModel, TereaModel.terea_id),
+    "iqos": (IqosModel, IqosCategoryModel, IqosModel.id_category),
+    "devices": (DevicesModel, DevicesCategoryModel, DevicesModel.device_id),
+}
+PRODUCT_COLUMNS = (
+    "type", "product_id", "ref", "name", "price", "image", "nalichie", "new", "hit", "category_id", "category_name"
+)
+
+
+def _products_source(product_type: str, *conditions):
+    model, category_model, category_column = PRODUCT_SOURCES[product_type]
+    return (
+        select(
+            literal(product_type), model.id, model.ref, model.name, model.price, model.image,
+            model.nalichie, model.new, model.hit, category_model.id, category_model.category_name
+        )
+        .join(category_model, category_model.id == category_column)
+        .where(*conditions)
+    )
+
+
 class DevicesRepository:
     @staticmethod
-    async def select_devices(skip: int = 0, limit: int = 100) -> Tuple[List[DevicesModel], int]:
-        logger.debug(f"Получение всех девайсов с пагинацией: skip={skip}, limit={limit}")
+    async def select_devices(
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            cursor_key: Tuple[Any, ...] | None = None,
+            with_total: bool = True,
+            columns: Sequence[str] | None = None
+    ) -> Tuple[List[DevicesModel], int | None]:
+        logger.debug(f"Получение всех девайсов с пагинацией: skip={skip}, limit={limit}, filters={filters}")
+        filters = filters or ProductFilters()
+        conditions = _devices_conditions(filters)
+        page_conditions = list(conditions)
+        if cursor_key is not None:
+            page_conditions.append(_keyset_condition(DevicesModel, filters.sort, cursor_key))
+            skip = 0
         try:
-            async with db_helper.session_factory() as session:
-                total_query = select(func.count(DevicesModel.id))
-                total_result = await session.execute(total_query)
-                total = total_result.scalar()
+            async with db_helper.read_session_factory() as session:
+                total = None
+                if with_total:
+                    total_query = select(func.count(DevicesModel.id)).where(*conditions)
+                    total_result = await session.execute(total_query)
+                    total = total_result.scalar()
 
                 devices_query = (
                     select(DevicesModel)
-                    .options(selectinload(DevicesModel.category))
+                    .options(*_projection_options(DevicesModel, columns, filters.sort))
+                    .where(*page_conditions)
+                    .order_by(*_order_by(DevicesModel, filters.sort))
                     .offset(skip)
                     .limit(limit)
-                    .order_by(DevicesModel.id.desc())
                 )
                 devices_result = await session.execute(devices_query)
                 devices = devices_result.scalars().all()
@@ -42,7 +183,7 @@ class DevicesRepository:
     async def select_device_by_id(devices_id: int) -> DevicesModel | None:
         logger.debug(f"Поиск девайса по id: {devices_id}")
         try:
-            async with db_helper.session_factory() as session:
+            async with db_helper.read_session_factory() as session:
                 result = await session.execute(
                     select(DevicesModel)
                     .options(selectinload(DevicesModel.category))
@@ -62,20 +203,36 @@ class DevicesRepository:
             raise
 
     @staticmethod
-    async def select_iqos(skip: int = 0, limit: int = 100) -> Tuple[List[IqosModel], int]:
-        logger.debug(f"Получение всех продуктов iqos с пагинацией: skip={skip}, limit={limit}")
+    async def select_iqos(
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            cursor_key: Tuple[Any, ...] | None = None,
+            with_total: bool = True,
+            columns: Sequence[str] | None = None
+    ) -> Tuple[List[IqosModel], int | None]:
+        logger.debug(f"Получение всех продуктов iqos с пагинацией: skip={skip}, limit={limit}, filters={filters}")
+        filters = filters or ProductFilters()
+        conditions = _iqos_conditions(filters)
+        page_conditions = list(conditions)
+        if cursor_key is not None:
+            page_conditions.append(_keyset_condition(IqosModel, filters.sort, cursor_key))
+            skip = 0
         try:
-            async with db_helper.session_factory() as session:
-                total_query = select(func.count(IqosModel.id))
-                total_result = await session.execute(total_query)
-                total = total_result.scalar()
+            async with db_helper.read_session_factory() as session:
+                total = None
+                if with_total:
+                    total_query = select(func.count(IqosModel.id)).where(*conditions)
+                    total_result = await session.execute(total_query)
+                    total = total_result.scalar()
 
                 iqos_list_query = (
                     select(IqosModel)
-                    .options(selectinload(IqosModel.category))
+                    .options(*_projection_options(IqosModel, columns, filters.sort))
+                    .where(*page_conditions)
+                    .order_by(*_order_by(IqosModel, filters.sort))
                     .offset(skip)
                     .limit(limit)
-                    .order_by(IqosModel.id.desc())
                 )
                 iqos_result = await session.execute(iqos_list_query)
                 iqos_list = iqos_result.scalars().all()
@@ -91,7 +248,7 @@ class DevicesRepository:
     async def select_iqos_by_id(iqos_id: int) -> IqosModel | None:
         logger.debug(f"Поиск продукта iqos по id: {iqos_id}")
         try:
-            async with db_helper.session_factory() as session:
+            async with db_helper.read_session_factory() as session:
                 result = await session.execute(
                     select(IqosModel)
                     .options(selectinload(IqosModel.category))
@@ -111,20 +268,36 @@ class DevicesRepository:
             raise
 
     @staticmethod
-    async def select_terea(skip: int = 0, limit: int = 100) -> Tuple[List[TereaModel], int]:
-        logger.debug(f"Получение всех продуктов terea с пагинацией: skip={skip}, limit={limit}")
+    async def select_terea(
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            cursor_key: Tuple[Any, ...] | None = None,
+            with_total: bool = True,
+            columns: Sequence[str] | None = None
+    ) -> Tuple[List[TereaModel], int | None]:
+        logger.debug(f"Получение всех продуктов terea с пагинацией: skip={skip}, limit={limit}, filters={filters}")
+        filters = filters or ProductFilters()
+        conditions = _terea_conditions(filters)
+        page_conditions = list(conditions)
+        if cursor_key is not None:
+            page_conditions.append(_keyset_condition(TereaModel, filters.sort, cursor_key))
+            skip = 0
         try:
-            async with db_helper.session_factory() as session:
-                total_query = select(func.count(TereaModel.id))
-                total_result = await session.execute(total_query)
-                total = total_result.scalar()
+            async with db_helper.read_session_factory() as session:
+                total = None
+                if with_total:
+                    total_query = select(func.count(TereaModel.id)).where(*conditions)
+                    total_result = await session.execute(total_query)
+                    total = total_result.scalar()
 
                 terea_list_query = (
                     select(TereaModel)
-                    .options(selectinload(TereaModel.category))
+                    .options(*_projection_options(TereaModel, columns, filters.sort))
+                    .where(*page_conditions)
+                    .order_by(*_order_by(TereaModel, filters.sort))
                     .offset(skip)
                     .limit(limit)
-                    .order_by(TereaModel.id.desc())
                 )
                 terea_result = await session.execute(terea_list_query)
                 terea_list = terea_result.scalars().all()
@@ -140,7 +313,7 @@ class DevicesRepository:
     async def select_terea_by_id(terea_id: int) -> TereaModel | None:
         logger.debug(f"Поиск продукта terea по id: {terea_id}")
         try:
-            async with db_helper.session_factory() as session:
+            async with db_helper.read_session_factory() as session:
                 result = await session.execute(
                     select(TereaModel)
                     .options(selectinload(TereaModel.category))
@@ -158,3 +331,219 @@ class DevicesRepository:
         except Exception as error:
             logger.error(f"Ошибка при получении продукта terea по id {terea_id}: {str(error)}", exc_info=True)
             raise
+
+    @staticmethod
+    async def select_catalog() -> Tuple[List[DevicesModel], List[IqosModel], List[TereaModel]]:
+        # Без категорий: снапшот подставляет их из select_categories
+        logger.debug("Получение полного каталога для снапшота")
+        try:
+            async with db_helper.read_session_factory() as session:
+                devices_result = await session.execute(
+                    select(DevicesModel)
+                    .order_by(DevicesModel.id.desc())
+                )
+                iqos_result = await session.execute(
+                    select(IqosModel)
+                    .order_by(IqosModel.id.desc())
+                )
+                terea_result = await session.execute(
+                    select(TereaModel)
+                    .order_by(TereaModel.id.desc())
+                )
+
+                devices = devices_result.scalars().all()
+                iqos_list = iqos_result.scalars().all()
+                terea_list = terea_result.scalars().all()
+
+                logger.info(
+                    f"Каталог получен: {len(devices)} девайсов, {len(iqos_list)} iqos, {len(terea_list)} terea"
+                )
+                return devices, iqos_list, terea_list
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении каталога: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def select_categories() -> Tuple[List[DevicesCategoryModel], List[IqosCategoryModel], List[TereaCategoryModel]]:
+        logger.debug("Получение всех категорий")
+        try:
+            async with db_helper.read_session_factory() as session:
+                devices_categories = (await session.execute(
+                    select(DevicesCategoryModel).order_by(DevicesCategoryModel.id)
+                )).scalars().all()
+                iqos_categories = (await session.execute(
+                    select(IqosCategoryModel).order_by(IqosCategoryModel.id)
+                )).scalars().all()
+                terea_categories = (await session.execute(
+                    select(TereaCategoryModel).order_by(TereaCategoryModel.id)
+                )).scalars().all()
+
+                return devices_categories, iqos_categories, terea_categories
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении категорий: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def select_catalog_marker() -> Tuple[Any, ...]:
+        # Число строк ловит удаления, max(updated_at) — вставки и правки; всё одним запросом
+        logger.debug("Получение маркера изменений каталога")
+        try:
+            async with db_helper.read_session_factory() as session:
+                columns = []
+                for model in (
+                        DevicesModel, IqosModel, TereaModel,
+                        DevicesCategoryModel, IqosCategoryModel, TereaCategoryModel
+                ):
+                    columns.append(select(func.count()).select_from(model).scalar_subquery())
+                    columns.append(select(func.max(model.updated_at)).scalar_subquery())
+
+                return tuple((await session.execute(select(*columns))).one())
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении маркера изменений каталога: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def count_products(product_type: str, filters: ProductFilters) -> int:
+        logger.debug(f"Подсчёт продуктов {product_type}: filters={filters}")
+        model, conditions = {
+            "devices": (DevicesModel, _devices_conditions),
+            "iqos": (IqosModel, _iqos_conditions),
+            "terea": (TereaModel, _terea_conditions),
+        }[product_type]
+        try:
+            async with db_helper.read_session_factory() as session:
+                total_result = await session.execute(select(func.count(model.id)).where(*conditions(filters)))
+                return total_result.scalar()
+
+        except Exception as error:
+            logger.error(f"Ошибка при подсчёте продуктов {product_type}: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def stream_products(product_type: str, batch_size: int = 500) -> AsyncIterator[DevicesModel | IqosModel | TereaModel]:
+        logger.debug(f"Потоковое чтение продуктов {product_type}: batch_size={batch_size}")
+        model = {
+            "devices": DevicesModel,
+            "iqos": IqosModel,
+            "terea": TereaModel,
+        }[product_type]
+        try:
+            # Серверный курсор: в памяти одновременно не больше batch_size строк
+            async with db_helper.read_session_factory() as session:
+                result = await session.stream(
+                    select(model).order_by(model.id).execution_options(yield_per=batch_size)
+                )
+                async for product in result.scalars():
+                    yield product
+
+        except Exception as error:
+            logger.error(f"Ошибка при потоковом чтении продуктов {product_type}: {str(error)}", exc_info=True)
+            raise
+
+
+class ProductsRepository:
+    @staticmethod
+    async def select_products(
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            product_types: Sequence[str] | None = None,
+            cursor_key: Tuple[Any, ...] | None = None,
+            with_total: bool = True
+    ) -> Tuple[List[ProductModel], int | None]:
+        logger.debug(f"Получение продуктов всех типов: skip={skip}, limit={limit}, types={product_types}, filters={filters}")
+        filters = filters or ProductFilters()
+        conditions = _products_conditions(filters, product_types)
+        page_conditions = list(conditions)
+        if cursor_key is not None:
+            page_conditions.append(_keyset_condition(ProductModel, filters.sort, cursor_key))
+            skip = 0
+        try:
+            async with db_helper.read_session_factory() as session:
+                total = None
+                if with_total:
+                    total_result = await session.execute(select(func.count(ProductModel.id)).where(*conditions))
+                    total = total_result.scalar()
+
+                products_result = await session.execute(
+                    select(ProductModel)
+                    .where(*page_conditions)
+                    .order_by(*_order_by(ProductModel, filters.sort))
+                    .offset(skip)
+                    .limit(limit)
+                )
+                products = products_result.scalars().all()
+
+                logger.info(f"Получено {len(products)} продуктов всех типов из {total}")
+                return products, total
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении продуктов всех типов: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def count_products(filters: ProductFilters, product_types: Sequence[str] | None = None) -> int:
+        logger.debug(f"Подсчёт продуктов всех типов: types={product_types}, filters={filters}")
+        try:
+            async with db_helper.read_session_factory() as session:
+                total_result = await session.execute(
+                    select(func.count(ProductModel.id)).where(*_products_conditions(filters, product_types))
+                )
+                return total_result.scalar()
+
+        except Exception as error:
+            logger.error(f"Ошибка при подсчёте продуктов всех типов: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def rebuild() -> None:
+        # Полная сверка витрины с исходными таблицами в одной транзакции: чинит пропущенные синхронизации
+        # (ошибка в хуке админки, правка мимо админки)
+        logger.debug("Пересборка витрины Products")
+        try:
+            async with db_helper.session_factory() as session:
+                await session.execute(delete(ProductModel))
+                for product_type in PRODUCT_SOURCES:
+                    await session.execute(
+                        insert(ProductModel).from_select(PRODUCT_COLUMNS, _products_source(product_type))
+                    )
+                await session.commit()
+
+        except Exception as error:
+            logger.error(f"Ошибка при пересборке витрины Products: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def _refresh(product_type: str, row_condition, source_condition) -> None:
+        # Удаляем устаревшие строки витрины и заново вставляем их из исходной таблицы одним INSERT ... SELECT
+        async with db_helper.session_factory() as session:
+            await session.execute(delete(ProductModel).where(ProductModel.type == product_type, row_condition))
+            await session.execute(
+                insert(ProductModel).from_select(PRODUCT_COLUMNS, _products_source(product_type, source_condition))
+            )
+            await session.commit()
+
+    @staticmethod
+    async def sync_product(product_type: str, product_id: int) -> None:
+        logger.debug(f"Обновление витрины Products: {product_type} {product_id}")
+        try:
+            model, _, _ = PRODUCT_SOURCES[product_type]
+            await ProductsRepository._refresh(product_type, ProductModel.product_id == product_id, model.id == product_id)
+
+        except Exception as error:
+            logger.error(f"Ошибка при обновлении витрины для {product_type} {product_id}: {str(error)}", exc_info=True)
+            raise
+
+    @staticmethod
+    async def sync_category(product_type: str, category_id: int) -> None:
+        logger.debug(f"Обновление витрины Products по категории: {product_type} {category_id}")
+        try:
+            _, _, category_column = PRODUCT_SOURCES[product_type]
+            await ProductsRepository._refresh(product_type, ProductModel.category_id == category_id, category_column == category_id)
+
+        except Exception as error:
+            logger.error(f"Ошибка при обновлении витрины для категории {product_type} {category_id}: {str(error)}", exc_info=True)
+            raise
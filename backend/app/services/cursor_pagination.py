@@ -0,0 +1,31 @@
+import base64
+import decimal
+import json
+from typing import Any, Tuple
+
+
+def encode_cursor(sort: str, product) -> str:
+    sort_field = sort.rsplit('_', 1)[0]
+    key = [product.id] if sort_field == 'id' else [str(getattr(product, sort_field)), product.id]
+    payload = json.dumps({"s": sort, "k": key}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, ...]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        cursor_sort, key = payload["s"], payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Некорректный курсор")
+
+    if cursor_sort != sort:
+        raise ValueError("Курсор получен для другой сортировки")
+
+    sort_field = sort.rsplit('_', 1)[0]
+    try:
+        if sort_field == 'id':
+            return (int(key[0]),)
+        value = decimal.Decimal(key[0]) if sort_field == 'price' else str(key[0])
+        return value, int(key[1])
+    except (ValueError, IndexError, TypeError, decimal.InvalidOperation):
+        raise ValueError("Некорректный курсор")
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DataError, IntegrityError
+
+from backend.app.api.schemas.orders_schemas import OrderCreate
+from backend.app.cache.idempotency_store import IdempotencyKeyReusedError
+from backend.app.repositories.order_journal import OrderJournal
+from backend.app.repositories.orders_repository import OrderRepository
+from backend.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY_MAX = 30.0
+IDEMPOTENCY_PURGE_INTERVAL = 3600
+
+# Ошибки, которые MySQL возвращает из-за данных самой записи. Остальные (обрыв соединения, OperationalError)
+# говорят о недоступности БД: выгрузка останавливается без подсчёта попытки и повторяется после паузы
+RECORD_ERRORS = (IntegrityError, DataError)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Приём заказов через локальный журнал: клиент получает ответ после fsync журнала,
+# а в MySQL заказы переносятся фоновой задачей пачками
+class OrderIntake:
+    def __init__(self, path: str, batch_size: int, flush_delay: float, idempotency_ttl: int):
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_delay = flush_delay
+        self._idempotency_ttl = idempotency_ttl
+        self._journal: OrderJournal | None = None
+        # Один поток: соединение SQLite и порядок записей в журнал не делятся между потоками
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="order-journal")
+        self._queue: List[Tuple[Tuple[str, str, str, str, str | None, str | None], asyncio.Future]] = []
+        self._queued = asyncio.Event()
+        self._appended = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._flushing: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._journal is not None
+
+    async def _call(self, function: Callable[..., Any], *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def start(self) -> None:
+        self._journal = await self._call(OrderJournal, self._path)
+        # Выгрузка сначала переносит всё, что осталось в журнале с прошлого запуска
+        self._tasks = [
+            asyncio.create_task(self._write_loop()),
+            asyncio.create_task(self._drain_loop()),
+            asyncio.create_task(self._purge_loop()),
+        ]
+        logger.info(f"Журнал приёма заказов открыт: {self._path}")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Запись в журнал, начатую циклом, дожидаемся, а заказы, ещё ждущие fsync, дописываем:
+        # иначе submit() остались бы без ответа. Невыгруженные записи подхватит следующий запуск
+        if self._flushing is not None:
+            await self._flushing
+        if self._queue:
+            await self._flush()
+        await self._call(self._journal.close)
+        self._journal = None
+
+    async def submit(
+            self,
+            order: OrderCreate,
+            customer_phone: str | None,
+            idempotency_key: str | None = None,
+            fingerprint: str | None = None
+    ) -> Tuple[str, int, bool]:
+        # Ключ идемпотентности записывается в журнал той же транзакцией, что и заказ: в режиме журнала
+        # приём не обращается к MySQL. Возвращает (intake_id, предварительный номер, повтор ли это)
+        intake_id = str(uuid.uuid4())
+        # Время приёма в UTC, как created_at в Orders: выгрузка переносит его в заказ
+        created_at = _utcnow().isoformat()
+        future = asyncio.get_running_loop().create_future()
+        # Неразобранный номер хранится в журнале пустой строкой: колонка NOT NULL в уже созданных журналах
+        self._queue.append((
+            (intake_id, order.model_dump_json(), customer_phone or "", created_at, idempotency_key, fingerprint),
+            future
+        ))
+        self._queued.set()
+
+        intake_id, seq, stored_fingerprint = await future
+        if stored_fingerprint is None:
+            return intake_id, seq, False
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError(f"Ключ {idempotency_key} уже использован для другого запроса")
+        return intake_id, seq, True
+
+    async def _write_loop(self) -> None:
+        while True:
+            await self._queued.wait()
+            # Короткая пауза собирает параллельные заказы в одну транзакцию журнала с одним fsync
+            await asyncio.sleep(self._flush_delay)
+            # Отмена цикла не прерывает запись пачки: иначе её future никогда не получили бы результат
+            self._flushing = asyncio.create_task(self._flush())
+            await asyncio.shield(self._flushing)
+
+    async def _flush(self) -> None:
+        batch, self._queue = self._queue, []
+        self._queued.clear()
+        try:
+            results = await self._call(self._journal.append, [row for row, _ in batch])
+        except Exception as error:
+            logger.error(f"Не удалось записать {len(batch)} заказов в журнал: {str(error)}", exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        # Заказ записан, даже если клиент уже отключился и его future отменена
+        for result, (_, future) in zip(results, batch):
+            if not future.done():
+                future.set_result(result)
+        self._appended.set()
+
+    async def _drain_loop(self) -> None:
+        retry_delay = 1.0
+        while True:
+            self._appended.clear()
+            try:
+                drained = await self._drain()
+                retry_delay = 1.0
+            except Exception as error:
+                logger.warning(f"Выгрузка журнала заказов отложена на {retry_delay:.0f} с: {str(error)}")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, RETRY_DELAY_MAX)
+                continue
+
+            if drained < self._batch_size:
+                await self._appended.wait()
+
+    async def _drain(self) -> int:
+        rows = await self._call(self._journal.pending, self._batch_size)
+        if not rows:
+            return 0
+
+        orders = []
+        for seq, intake_id, payload, customer_phone, created_at in rows:
+            try:
+                order = OrderCreate.model_validate_json(payload)
+            except ValidationError as error:
+                logger.error(f"Заказ {intake_id} из журнала не разбирается: {str(error)}")
+                await self._call(self._journal.record_failure, seq, str(error), True)
+                continue
+            # Заказ получает время приёма, а не время выгрузки
+            order_data = {**order.model_dump(), 'created_at': datetime.fromisoformat(created_at)}
+            orders.append((seq, (intake_id, order_data, customer_phone or None)))
+
+        if orders:
+            try:
+                await OrderRepository.create_batch([order for _, order in orders])
+            except RECORD_ERRORS:
+                # Пачку отвергли данные какой-то записи: пишем по одной, чтобы она не блокировала остальные
+                await self._drain_one_by_one(orders)
+                return len(rows)
+            await self._call(self._journal.remove, [seq for seq, _ in orders])
+
+        logger.info(f"Из журнала в БД перенесено заказов: {len(orders)}")
+        return len(rows)
+
+    async def _drain_one_by_one(self, orders) -> None:
+        for seq, order in orders:
+            try:
+                await OrderRepository.create_batch([order])
+            except RECORD_ERRORS as error:
+                logger.error(f"Заказ {order[0]} из журнала не записан: {str(error)}")
+                await self._call(self._journal.record_failure, seq, str(error))
+                continue
+            await self._call(self._journal.remove, [seq])
+
+    async def _purge_loop(self) -> None:
+        while True:
+            await asyncio.sleep(IDEMPOTENCY_PURGE_INTERVAL)
+            created_before = (_utcnow() - timedelta(seconds=self._idempotency_ttl)).isoformat()
+            try:
+                deleted = await self._call(self._journal.purge_idempotency, created_before)
+                logger.info(f"Удалено устаревших ключей идемпотентности из журнала: {deleted}")
+            except Exception as error:
+                logger.error(f"Ошибка при очистке ключей идемпотентности в журнале: {str(error)}", exc_info=True)
+
+
+order_intake = OrderIntake(
+    path=settings.order_intake.journal_path,
+    batch_size=settings.order_intake.batch_size,
+    flush_delay=settings.order_intake.flush_delay,
+    idempotency_ttl=settings.idempotency.ttl_seconds,
+)
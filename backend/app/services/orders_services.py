@@ -1,7 +1,14 @@
+import hashlib
 import logging
+from typing import Tuple
 
-from backend.app.api.schemas.orders_schemas import OrderCreate, OrderResponse, GetOrder, OrderedItemResponse
+from backend.app.api.schemas.orders_schemas import (
+    OrderCreate, OrderResponse, GetOrder, OrderedItemResponse, OrderIntakeResponse
+)
+from backend.app.cache.idempotency_store import IdempotencyKeyReusedError, idempotency_store
 from backend.app.repositories.orders_repository import OrderRepository
+from backend.app.services.order_intake import order_intake
+from backend.app.services.phone_normalizer import normalize_phone
 
 
 logger = logging.getLogger(__name__)
@@ -14,7 +21,10 @@ class OrdersService:
         logger.info(f"Создание заказа: {order.model_dump()}")
         try:
             order_data = order.model_dump()
-            order_model = await OrderRepository.create(order_data)
+            customer_phone = normalize_phone(order.phone_number)
+            if customer_phone is None:
+                logger.warning(f"Номер {order.phone_number} не приводится к E.164, заказ сохраняется без учёта покупателя")
+            order_model = await OrderRepository.create(order_data, customer_phone)
 
             get_order = GetOrder(
                 id=order_model.id,
@@ -42,4 +52,59 @@ class OrdersService:
 
         except Exception as error:
             logger.error(f"Ошибка при создании заказа: {str(error)}", exc_info=True)
-            raise ValueError(f"Ошибка при создании заказа: {str(error)}")
\ No newline at end of file
+            raise ValueError(f"Ошибка при создании заказа: {str(error)}")
+
+    @staticmethod
+    async def accept_order(
+            order: OrderCreate,
+            idempotency_key: str | None = None,
+            fingerprint: str | None = None
+    ) -> Tuple[OrderIntakeResponse, bool]:
+        logger.info(f"Приём заказа в журнал: {order.model_dump()}")
+        try:
+            customer_phone = normalize_phone(order.phone_number)
+            if customer_phone is None:
+                logger.warning(f"Номер {order.phone_number} не приводится к E.164, заказ сохраняется без учёта покупателя")
+            intake_id, provisional_number, replayed = await order_intake.submit(
+                order, customer_phone, idempotency_key, fingerprint
+            )
+
+            logger.info(f"Заказ принят в журнал: {intake_id}, предварительный номер {provisional_number}")
+            return OrderIntakeResponse(intake_id=intake_id, provisional_number=provisional_number), replayed
+
+        except IdempotencyKeyReusedError:
+            raise
+        except Exception as error:
+            logger.error(f"Ошибка при приёме заказа: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при приёме заказа: {str(error)}")
+
+    @staticmethod
+    async def submit_order(order: OrderCreate) -> Tuple[int, OrderResponse | OrderIntakeResponse]:
+        if order_intake.is_running:
+            return 202, (await OrdersService.accept_order(order))[0]
+        return 201, await OrdersService.create_order(order)
+
+    @staticmethod
+    async def submit_order_once(
+            order: OrderCreate,
+            idempotency_key: str
+    ) -> Tuple[int, OrderResponse | OrderIntakeResponse, bool]:
+        logger.info(f"Создание заказа с ключом идемпотентности {idempotency_key}")
+        fingerprint = hashlib.sha256(order.model_dump_json().encode()).hexdigest()
+
+        if order_intake.is_running:
+            # В режиме журнала ключ хранится в самом журнале, чтобы приём заказа не ждал MySQL
+            result, replayed = await OrdersService.accept_order(order, idempotency_key, fingerprint)
+            status_code = 202
+        else:
+            async def submit() -> Tuple[int, str]:
+                status_code, result = await OrdersService.submit_order(order)
+                return status_code, result.model_dump_json()
+
+            status_code, body, replayed = await idempotency_store.run(idempotency_key, fingerprint, submit)
+            response_model = OrderIntakeResponse if status_code == 202 else OrderResponse
+            result = response_model.model_validate_json(body)
+
+        if replayed:
+            logger.info(f"Повтор заказа с ключом {idempotency_key}, возвращаем сохранённый ответ")
+        return status_code, result, replayed
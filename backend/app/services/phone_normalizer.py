@@ -0,0 +1,19 @@
+import re
+
+
+NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(phone_number: str) -> str | None:
+    # Приводит номер к E.164: "8 (999) 123-45-67", "+7 999 1234567" и "9991234567" дают "+79991234567".
+    # Номер, который не разобрать, - None: заказ принимается как раньше, но без учёта покупателя
+    digits = NON_DIGITS.sub("", phone_number)
+    if not phone_number.strip().startswith("+"):
+        if len(digits) == 11 and digits[0] == "8":
+            digits = "7" + digits[1:]
+        elif len(digits) == 10:
+            digits = "7" + digits
+
+    if not 10 <= len(digits) <= 15 or digits[0] == "0":
+        return None
+    return "+" + digits
@@ -1,56 +1,205 @@
+import bisect
+import json
 import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple, Type
 
 from backend.app.api.schemas import(
     GetDevicesResponse,
+    GetDevicesProjectionResponse,
     DevicesSchema,
     GetDeviceByIdResponse,
 
     GetIqosResponse,
+    GetIqosProjectionResponse,
     IqosSchema,
     GetIqosByIdResponse,
 
     GetTereaResponse,
+    GetTereaProjectionResponse,
     TereaSchema,
-    GetTereaByIdResponse
+    GetTereaByIdResponse,
+
+    GetAllProductsResponse,
+    GetCategoriesResponse,
+    CategoryListItemSchema,
+    GetFacetsResponse,
+    FacetValueSchema,
+    PriceBucketSchema,
+    GetProductByRefResponse,
+    GetProductsBatchRequest,
+    GetProductsBatchResponse,
+    GetProductsListResponse,
+    ProductRowSchema,
+    GetProductsRailResponse,
+    GetProductsSearchResponse,
+    GetStockResponse,
+    GetSuggestResponse,
+    SuggestionSchema
 )
-from backend.app.repositories.products_repository import DevicesRepository
+from backend.app.api.schemas.all_products_schemas import PRODUCTS_BATCH_LIMIT
+from backend.app.api.schemas.devices_schemas import DEVICES_CARD_FIELDS
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.app.api.schemas.iqos_schemas import IQOS_CARD_FIELDS
+from backend.app.api.schemas.terea_schemas import TEREA_CARD_FIELDS
+from backend.app.cache.catalog_cache import catalog_cache, build_product, category_key
+from backend.app.repositories.products_repository import DevicesRepository, ProductsRepository
+from backend.app.services.cursor_pagination import encode_cursor, decode_cursor
 
 
 logger = logging.getLogger(__name__)
 
+FILTERED_TOTALS_LIMIT = 1024
+
+# COUNT(*) по фильтрам, LRU на процесс; версия снапшота в ключе, поэтому после изменений каталога старые
+# значения не используются и вытесняются сами
+_filtered_totals: OrderedDict[Tuple[int, str, str], int] = OrderedDict()
+
+PRODUCT_SCHEMAS = {
+    "devices": (DevicesSchema, DEVICES_CARD_FIELDS),
+    "iqos": (IqosSchema, IQOS_CARD_FIELDS),
+    "terea": (TereaSchema, TEREA_CARD_FIELDS),
+}
+
+
+def _resolve_fields(product_type: str, view: str, fields: List[str] | None) -> List[str] | None:
+    schema, card_fields = PRODUCT_SCHEMAS[product_type]
+    if fields:
+        unknown = [field for field in fields if field not in schema.model_fields]
+        if unknown:
+            raise ValueError(f"Неизвестные поля: {', '.join(unknown)}")
+        return ["id", *dict.fromkeys(field for field in fields if field != "id")]
+    if view == "card":
+        return list(card_fields)
+    return None
+
+
+def _project_model(schema: Type[DevicesSchema | IqosSchema | TereaSchema], model, fields: List[str], categories) -> Dict[str, Any]:
+    # model_construct без валидации: незагруженные load_only колонки не трогаем
+    values = {field: getattr(model, field) for field in fields if field != "category"}
+    if "category" in fields:
+        values["category"] = categories[getattr(model, category_key(model))]
+    return schema.model_construct(**values).model_dump(mode="json", include=set(fields))
+
+
+async def _filtered_total(snapshot, count_key: Tuple[str, str], count: Callable[[], Awaitable[int]]) -> int:
+    key = (snapshot.version, *count_key)
+    total = _filtered_totals.get(key)
+    if total is not None:
+        _filtered_totals.move_to_end(key)
+        return total
+
+    total = await count()
+    _filtered_totals[key] = total
+    while len(_filtered_totals) > FILTERED_TOTALS_LIMIT:
+        _filtered_totals.popitem(last=False)
+    return total
+
+
+def _with_known_category(product_type: str, models: list, categories) -> list:
+    # Категории нет даже в свежем снапшоте (строка с реплики новее primary): товар пропускаем, а не роняем выдачу
+    known = []
+    for model in models:
+        category_id = getattr(model, category_key(model))
+        if category_id in categories:
+            known.append(model)
+        else:
+            logger.warning(f"Категория {category_id} продукта {product_type} {model.id} не найдена")
+    return known
+
 
 class DevicesService:
     @staticmethod
-    async def get_devices(skip: int = 0, limit: int = 100) -> GetDevicesResponse:
-        logger.info(f"Получение списка девайсов: skip={skip}, limit={limit}")
-        try:
-            devices_models, total = await DevicesRepository.select_devices(skip=skip, limit=limit)
-
-            devices_response = [
-                DevicesSchema(
-                    id=device.id,
-                    name=device.name,
-                    description=device.description,
-                    image=device.image,
-                    price=device.price,
-                    nalichie=device.nalichie,
-                    new=device.new,
-                    hit=device.hit,
-                    color=device.color,
-                    ref=device.ref,
-                    type=device.type,
-                    device_id=device.device_id,
-                    category=device.category
-                ) for device in devices_models
+    async def _get_page(
+            product_type: str,
+            skip: int,
+            limit: int,
+            filters: ProductFilters | None,
+            cursor: str | None,
+            with_total: bool,
+            fields: List[str] | None = None
+    ) -> Tuple[list, int | None, str | None]:
+        filters = filters or ProductFilters()
+        cursor_key = decode_cursor(cursor, filters.sort) if cursor else None
+        snapshot = await catalog_cache.get_snapshot()
+
+        products = None
+        if not filters.is_active():
+            products = snapshot.get_products(product_type)
+        elif filters.category_id is not None and not filters.model_copy(update={"category_id": None}).is_active():
+            # Фильтр только по категории отдаётся из готового среза снапшота
+            products = snapshot.by_category[product_type].get(filters.category_id, ())
+
+        if products is not None:
+            start = skip
+            if cursor_key is not None:
+                # Снапшот отсортирован по id desc, ищем первую позицию с id меньше курсора
+                start = bisect.bisect_right(products, -cursor_key[0], key=lambda product: -product.id)
+            page = list(products[start:start + limit])
+            has_more = start + limit < len(products)
+            total = len(products) if with_total else None
+            next_cursor = encode_cursor(filters.sort, page[-1]) if has_more and page else None
+            if fields is not None:
+                page = [product.model_dump(mode="json", include=set(fields)) for product in page]
+        else:
+            select_products = {
+                "devices": DevicesRepository.select_devices,
+                "iqos": DevicesRepository.select_iqos,
+                "terea": DevicesRepository.select_terea,
+            }[product_type]
+            schema, _ = PRODUCT_SCHEMAS[product_type]
+            models, _ = await select_products(
+                skip=skip, limit=limit + 1, filters=filters, cursor_key=cursor_key, with_total=False, columns=fields
+            )
+            has_more = len(models) > limit
+            models = models[:limit]
+            next_cursor = encode_cursor(filters.sort, models[-1]) if has_more and models else None
+            categories = {}
+            if fields is None or "category" in fields:
+                categories = await catalog_cache.get_categories(
+                    product_type, (getattr(model, category_key(model)) for model in models)
+                )
+                models = _with_known_category(product_type, models, categories)
+            if fields is not None:
+                page = [_project_model(schema, model, fields, categories) for model in models]
+            else:
+                page = [build_product(schema, model, categories) for model in models]
+
+            total = None
+            if with_total:
+                total = await _filtered_total(
+                    snapshot,
+                    (product_type, filters.model_dump_json(exclude={'sort'})),
+                    lambda: DevicesRepository.count_products(product_type, filters)
+                )
+
+        return page, total, next_cursor
 
-            ]
+    @staticmethod
+    async def get_devices(
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            cursor: str | None = None,
+            with_total: bool = True,
+            view: str = "full",
+            fields: List[str] | None = None
+    ) -> GetDevicesResponse | GetDevicesProjectionResponse:
+        logger.info(f"Получение списка девайсов: skip={skip}, limit={limit}, filters={filters}")
+        try:
+            fields = _resolve_fields("devices", view, fields)
+            devices_response, total, next_cursor = await DevicesService._get_page(
+                "devices", skip, limit, filters, cursor, with_total, fields
+            )
 
             logger.info(f"Успешно возвращено {len(devices_response)} девайсов")
-            return GetDevicesResponse(
+            response_class = GetDevicesResponse if fields is None else GetDevicesProjectionResponse
+            return response_class(
                 devices=devices_response,
                 skip=skip,
                 limit=limit,
-                total=total
+                total=total,
+                next_cursor=next_cursor
             )
 
         except Exception as error:
@@ -58,31 +207,16 @@ class DevicesService:
             raise ValueError(f"Ошибка при получении девайсов: {str(error)}")
 
     @staticmethod
-    async def get_device(devices_id: int) -> GetDevicesResponse:
+    async def get_device(devices_id: int) -> GetDeviceByIdResponse:
         logger.info(f"Получение девайса по id: {devices_id}")
         try:
-            device_model = await DevicesRepository.select_device_by_id(devices_id)
+            snapshot = await catalog_cache.get_snapshot()
+            device_response = snapshot.devices_by_id.get(devices_id)
 
-            if not device_model:
+            if not device_response:
                 logger.warning(f"Девайс с id {devices_id} не найден")
                 raise ValueError("Девайс не найден")
 
-            device_response = DevicesSchema(
-                id=device_model.id,
-                name=device_model.name,
-                description=device_model.description,
-                image=device_model.image,
-                price=device_model.price,
-                nalichie=device_model.nalichie,
-                new=device_model.new,
-                hit=device_model.hit,
-                color=device_model.color,
-                ref=device_model.ref,
-                type=device_model.type,
-                device_id=device_model.device_id,
-                category=device_model.category
-            )
-
             logger.info(f"Девайса с id {devices_id} успешно получен")
             return GetDeviceByIdResponse(device=device_response)
 
@@ -94,38 +228,30 @@ class DevicesService:
             raise ValueError(f"Ошибка при получении девайса: {str(error)}")
 
     @staticmethod
-    async def get_iqos_list(skip: int = 0, limit: int = 100) -> GetIqosResponse:
-        logger.info(f"Получение списка iqos: skip={skip}, limit={limit}")
+    async def get_iqos_list(
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            cursor: str | None = None,
+            with_total: bool = True,
+            view: str = "full",
+            fields: List[str] | None = None
+    ) -> GetIqosResponse | GetIqosProjectionResponse:
+        logger.info(f"Получение списка iqos: skip={skip}, limit={limit}, filters={filters}")
         try:
-            iqos_models, total = await DevicesRepository.select_iqos(skip=skip, limit=limit)
-
-            iqos_response = [
-                IqosSchema(
-                    id=iqos.id,
-                    name=iqos.name,
-                    model=iqos.model,
-                    description=iqos.description,
-                    image=iqos.image,
-                    price=iqos.price,
-                    color=iqos.color,
-                    new=iqos.new,
-                    hit=iqos.hit,
-                    exclusive=iqos.exclusive,
-                    nalichie=iqos.nalichie,
-                    ref=iqos.ref,
-                    type=iqos.type,
-                    sale_price=iqos.sale_price,
-                    id_category=iqos.id_category,
-                    category=iqos.category
-                ) for iqos in iqos_models
+            fields = _resolve_fields("iqos", view, fields)
+            iqos_response, total, next_cursor = await DevicesService._get_page(
+                "iqos", skip, limit, filters, cursor, with_total, fields
+            )
 
-            ]
             logger.info(f"Успешно возвращено {len(iqos_response)} продуктов iqos")
-            return GetIqosResponse(
+            response_class = GetIqosResponse if fields is None else GetIqosProjectionResponse
+            return response_class(
                 iqos=iqos_response,
                 skip=skip,
                 limit=limit,
-                total=total
+                total=total,
+                next_cursor=next_cursor
             )
 
         except Exception as error:
@@ -136,31 +262,13 @@ class DevicesService:
     async def get_iqos(iqos_id: int) -> GetIqosByIdResponse:
         logger.info(f"Получение продукта iqos по id: {iqos_id}")
         try:
-            iqos_model = await DevicesRepository.select_iqos_by_id(iqos_id)
+            snapshot = await catalog_cache.get_snapshot()
+            iqos_response = snapshot.iqos_by_id.get(iqos_id)
 
-            if not iqos_model:
+            if not iqos_response:
                 logger.warning(f"Продукт iqos с id {iqos_id} не найден")
                 raise ValueError("Продукт iqos не найден")
 
-            iqos_response = IqosSchema(
-                id=iqos_model.id,
-                name=iqos_model.name,
-                model=iqos_model.model,
-                description=iqos_model.description,
-                image=iqos_model.image,
-                price=iqos_model.price,
-                color=iqos_model.color,
-                new=iqos_model.new,
-                hit=iqos_model.hit,
-                exclusive=iqos_model.exclusive,
-                nalichie=iqos_model.nalichie,
-                ref=iqos_model.ref,
-                type=iqos_model.type,
-                sale_price=iqos_model.sale_price,
-                id_category=iqos_model.id_category,
-                category=iqos_model.category
-            )
-
             logger.info(f"Продукт iqos с id {iqos_id} успешно получен")
             return GetIqosByIdResponse(iqos=iqos_response)
 
@@ -172,41 +280,30 @@ class DevicesService:
             raise ValueError(f"Ошибка при получении продукта iqos: {str(error)}")
 
     @staticmethod
-    async def get_terea_list(skip: int = 0, limit: int = 100) -> GetTereaResponse:
-        logger.info(f"Получение списка terea: skip={skip}, limit={limit}")
+    async def get_terea_list(
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            cursor: str | None = None,
+            with_total: bool = True,
+            view: str = "full",
+            fields: List[str] | None = None
+    ) -> GetTereaResponse | GetTereaProjectionResponse:
+        logger.info(f"Получение списка terea: skip={skip}, limit={limit}, filters={filters}")
         try:
-            terea_models, total = await DevicesRepository.select_terea(skip=skip, limit=limit)
-
-            terea_response = [
-                TereaSchema(
-                    id=terea.id,
-                    name=terea.name,
-                    description=terea.description,
-                    image=terea.image,
-                    imagePack=terea.imagePack,
-                    price=terea.price,
-                    pricePack=terea.pricePack,
-                    has_capsule=terea.has_capsule,
-                    flavor=terea.flavor,
-                    country=terea.country,
-                    brend=terea.brend,
-                    strength=terea.strength,
-                    nalichie=terea.nalichie,
-                    new=terea.new,
-                    hit=terea.hit,
-                    ref=terea.ref,
-                    type=terea.type,
-                    terea_id=terea.terea_id,
-                    category=terea.category
-                ) for terea in terea_models
+            fields = _resolve_fields("terea", view, fields)
+            terea_response, total, next_cursor = await DevicesService._get_page(
+                "terea", skip, limit, filters, cursor, with_total, fields
+            )
 
-            ]
             logger.info(f"Успешно возвращено {len(terea_response)} продуктов terea")
-            return GetTereaResponse(
+            response_class = GetTereaResponse if fields is None else GetTereaProjectionResponse
+            return response_class(
                 terea=terea_response,
                 skip=skip,
                 limit=limit,
-                total=total
+                total=total,
+                next_cursor=next_cursor
             )
 
         except Exception as error:
@@ -217,34 +314,13 @@ class DevicesService:
     async def get_terea(terea_id: int) -> GetTereaByIdResponse:
         logger.info(f"Получение продукта terea по id: {terea_id}")
         try:
-            terea_model = await DevicesRepository.select_terea_by_id(terea_id)
+            snapshot = await catalog_cache.get_snapshot()
+            terea_response = snapshot.terea_by_id.get(terea_id)
 
-            if not terea_model:
+            if not terea_response:
                 logger.warning(f"Продукт terea с id {terea_id} не найден")
                 raise ValueError("Продукт terea не найден")
 
-            terea_response = TereaSchema(
-                id=terea_model.id,
-                name=terea_model.name,
-                description=terea_model.description,
-                image=terea_model.image,
-                imagePack=terea_model.imagePack,
-                price=terea_model.price,
-                pricePack=terea_model.pricePack,
-                has_capsule=terea_model.has_capsule,
-                flavor=terea_model.flavor,
-                country=terea_model.country,
-                brend=terea_model.brend,
-                strength=terea_model.strength,
-                nalichie=terea_model.nalichie,
-                new=terea_model.new,
-                hit=terea_model.hit,
-                ref=terea_model.ref,
-                type=terea_model.type,
-                terea_id=terea_model.terea_id,
-                category=terea_model.category
-            )
-
             logger.info(f"Продукт terea с id {terea_id} успешно получен")
             return GetTereaByIdResponse(terea=terea_response)
 
@@ -253,4 +329,400 @@ class DevicesService:
             raise ValueError(str(error))
         except Exception as error:
             logger.error(f"Ошибка при получении продукта terea {terea_id}: {str(error)}", exc_info=True)
-            raise ValueError(f"Ошибка при получении продукта terea: {str(error)}")
\ No newline at end of file
+            raise ValueError(f"Ошибка при получении продукта terea: {str(error)}")
+
+    @staticmethod
+    async def get_device_by_ref(ref: str) -> GetDeviceByIdResponse:
+        logger.info(f"Получение девайса по ref: {ref}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            device_response = snapshot.devices_by_ref.get(ref)
+
+            if not device_response:
+                logger.warning(f"Девайс с ref {ref} не найден")
+                raise ValueError("Девайс не найден")
+
+            return GetDeviceByIdResponse(device=device_response)
+
+        except ValueError as error:
+            raise ValueError(str(error))
+        except Exception as error:
+            logger.error(f"Ошибка при получении девайса по ref {ref}: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении девайса: {str(error)}")
+
+    @staticmethod
+    async def get_iqos_by_ref(ref: str) -> GetIqosByIdResponse:
+        logger.info(f"Получение продукта iqos по ref: {ref}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            iqos_response = snapshot.iqos_by_ref.get(ref)
+
+            if not iqos_response:
+                logger.warning(f"Продукт iqos с ref {ref} не найден")
+                raise ValueError("Продукт iqos не найден")
+
+            return GetIqosByIdResponse(iqos=iqos_response)
+
+        except ValueError as error:
+            raise ValueError(str(error))
+        except Exception as error:
+            logger.error(f"Ошибка при получении продукта iqos по ref {ref}: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении продукта iqos: {str(error)}")
+
+    @staticmethod
+    async def get_terea_by_ref(ref: str) -> GetTereaByIdResponse:
+        logger.info(f"Получение продукта terea по ref: {ref}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            terea_response = snapshot.terea_by_ref.get(ref)
+
+            if not terea_response:
+                logger.warning(f"Продукт terea с ref {ref} не найден")
+                raise ValueError("Продукт terea не найден")
+
+            return GetTereaByIdResponse(terea=terea_response)
+
+        except ValueError as error:
+            raise ValueError(str(error))
+        except Exception as error:
+            logger.error(f"Ошибка при получении продукта terea по ref {ref}: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении продукта terea: {str(error)}")
+
+    @staticmethod
+    async def get_product_by_ref(ref: str, product_types: List[str] | None = None) -> GetProductByRefResponse:
+        logger.info(f"Получение продукта по ref: {ref}, типы: {product_types}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            located = snapshot.find_by_ref(ref, product_types)
+
+            if not located:
+                logger.warning(f"Продукт с ref {ref} не найден")
+                raise ValueError("Продукт не найден")
+
+            product_type, product = located
+            return GetProductByRefResponse(type=product_type, product=product)
+
+        except ValueError as error:
+            raise ValueError(str(error))
+        except Exception as error:
+            logger.error(f"Ошибка при получении продукта по ref {ref}: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении продукта: {str(error)}")
+
+    @staticmethod
+    async def get_products_batch(batch: GetProductsBatchRequest) -> GetProductsBatchResponse:
+        logger.info(f"Пакетное получение продуктов: {len(batch.refs)} ref, {len(batch.items)} пар (тип, id)")
+        try:
+            if not batch.refs and not batch.items:
+                raise ValueError("Передайте хотя бы один ref или пару (тип, id)")
+            if len(batch.refs) + len(batch.items) > PRODUCTS_BATCH_LIMIT:
+                raise ValueError(f"Не больше {PRODUCTS_BATCH_LIMIT} продуктов за запрос")
+
+            snapshot = await catalog_cache.get_snapshot()
+            products = {}
+            missing_refs = []
+            missing_items = []
+
+            for ref in dict.fromkeys(batch.refs):
+                located = snapshot.find_by_ref(ref)
+                if located is None:
+                    missing_refs.append(ref)
+                    continue
+                product_type, product = located
+                products[ref] = GetProductByRefResponse(type=product_type, product=product)
+
+            for item in batch.items:
+                product = snapshot.get_product(item.type, item.id)
+                if product is None:
+                    missing_items.append(item)
+                    continue
+                products[f"{item.type}:{item.id}"] = GetProductByRefResponse(type=item.type, product=product)
+
+            logger.info(f"Пакетно найдено {len(products)} продуктов, не найдено {len(missing_refs) + len(missing_items)}")
+            return GetProductsBatchResponse(products=products, missing_refs=missing_refs, missing_items=missing_items)
+
+        except ValueError as error:
+            raise ValueError(str(error))
+        except Exception as error:
+            logger.error(f"Ошибка при пакетном получении продуктов: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при пакетном получении продуктов: {str(error)}")
+
+    @staticmethod
+    async def get_stock(refs: List[str]) -> GetStockResponse:
+        logger.info(f"Получение остатков и цен: {len(refs)} ref")
+        try:
+            if not refs:
+                raise ValueError("Передайте хотя бы один ref")
+            if len(refs) > PRODUCTS_BATCH_LIMIT:
+                raise ValueError(f"Не больше {PRODUCTS_BATCH_LIMIT} продуктов за запрос")
+
+            snapshot = await catalog_cache.get_snapshot()
+            stock = {}
+            missing = []
+            for ref in dict.fromkeys(refs):
+                entry = snapshot.stock.get(ref)
+                if entry is None:
+                    missing.append(ref)
+                else:
+                    stock[ref] = entry
+
+            return GetStockResponse(stock=stock, missing=missing)
+
+        except ValueError as error:
+            raise ValueError(str(error))
+        except Exception as error:
+            logger.error(f"Ошибка при получении остатков: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении остатков: {str(error)}")
+
+    @staticmethod
+    async def get_all_products() -> GetAllProductsResponse:
+        logger.info("Получение всего каталога")
+        try:
+            # Все три списка из одного снапшота: согласованы между собой и без лимита на количество
+            snapshot = await catalog_cache.get_snapshot()
+            response = GetAllProductsResponse(
+                devices=list(snapshot.devices),
+                iqos=list(snapshot.iqos),
+                terea=list(snapshot.terea)
+            )
+
+            logger.info(f"Каталог собран: {len(response.devices)} devices, {len(response.iqos)} iqos, {len(response.terea)} terea")
+            return response
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении всего каталога: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении всего каталога: {str(error)}")
+
+    @staticmethod
+    async def get_best_sellers(limit: int) -> GetProductsRailResponse:
+        logger.info(f"Получение хитов продаж: limit={limit}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            products = [
+                GetProductByRefResponse(type=product_type, product=product)
+                for product_type, product in snapshot.best_sellers[:limit]
+            ]
+
+            logger.info(f"Успешно возвращено {len(products)} хитов продаж")
+            return GetProductsRailResponse(products=products)
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении хитов продаж: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении хитов продаж: {str(error)}")
+
+    @staticmethod
+    async def get_new_products(limit: int) -> GetProductsRailResponse:
+        logger.info(f"Получение новинок: limit={limit}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            products = [
+                GetProductByRefResponse(type=product_type, product=product)
+                for product_type, product in snapshot.new_products[:limit]
+            ]
+
+            logger.info(f"Успешно возвращено {len(products)} новинок")
+            return GetProductsRailResponse(products=products)
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении новинок: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении новинок: {str(error)}")
+
+    @staticmethod
+    async def get_similar(product_type: str, product_id: int, limit: int) -> GetProductsRailResponse:
+        logger.info(f"Получение похожих продуктов {product_type} {product_id}: limit={limit}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            similar_ids = snapshot.similar[product_type].get(product_id)
+
+            if similar_ids is None:
+                logger.warning(f"Продукт {product_type} с id {product_id} не найден")
+                raise ValueError("Продукт не найден")
+
+            products = [
+                GetProductByRefResponse(type=product_type, product=snapshot.get_product(product_type, similar_id))
+                for similar_id in similar_ids[:limit]
+            ]
+            return GetProductsRailResponse(products=products)
+
+        except ValueError as error:
+            raise ValueError(str(error))
+        except Exception as error:
+            logger.error(f"Ошибка при получении похожих продуктов: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении похожих продуктов: {str(error)}")
+
+    @staticmethod
+    async def search_products(query: str, product_types: List[str] | None = None, limit: int = 20) -> GetProductsSearchResponse:
+        logger.info(f"Поиск продуктов: q={query}, типы: {product_types}, limit={limit}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            found = snapshot.search_index.search(query, product_types)
+            products = [
+                GetProductByRefResponse(type=product_type, product=snapshot.get_product(product_type, product_id))
+                for product_type, product_id in found[:limit]
+            ]
+
+            logger.info(f"По запросу {query} найдено {len(found)} продуктов")
+            return GetProductsSearchResponse(query=query, total=len(found), products=products)
+
+        except Exception as error:
+            logger.error(f"Ошибка при поиске продуктов: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при поиске продуктов: {str(error)}")
+
+    @staticmethod
+    async def suggest_products(prefix: str, limit: int = 10) -> GetSuggestResponse:
+        logger.debug(f"Подсказки по префиксу: {prefix}, limit={limit}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            suggestions = [
+                SuggestionSchema(text=text, kind=kind, type=product_type, ref=ref, weight=weight)
+                for _, text, kind, product_type, ref, weight in snapshot.suggest_index.suggest(prefix, limit)
+            ]
+            return GetSuggestResponse(prefix=prefix, suggestions=suggestions)
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении подсказок: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении подсказок: {str(error)}")
+
+    @staticmethod
+    async def get_facets(product_type: str, filters: ProductFilters | None = None) -> GetFacetsResponse:
+        logger.info(f"Получение фасетов {product_type}: filters={filters}")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            total, facet_counts, price_buckets = snapshot.facets[product_type].count(filters or ProductFilters())
+            categories = snapshot.get_categories(product_type)
+
+            facets = {
+                facet: [
+                    FacetValueSchema(
+                        value=value,
+                        label=categories[int(value)].category_name if facet == "category" and int(value) in categories else None,
+                        count=count
+                    )
+                    for value, count in counts.items()
+                ]
+                for facet, counts in facet_counts.items()
+            }
+            price = [PriceBucketSchema(min=low, max=high, count=count) for low, high, count in price_buckets]
+
+            return GetFacetsResponse(type=product_type, total=total, facets=facets, price=price)
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении фасетов {product_type}: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении фасетов: {str(error)}")
+
+    @staticmethod
+    async def get_categories() -> GetCategoriesResponse:
+        logger.info("Получение списка категорий")
+        try:
+            snapshot = await catalog_cache.get_snapshot()
+            categories = {
+                product_type: [
+                    CategoryListItemSchema(
+                        id=category.id,
+                        category_name=category.category_name,
+                        count=len(snapshot.by_category[product_type].get(category.id, ()))
+                    )
+                    for category in snapshot.get_categories(product_type).values()
+                ]
+                for product_type in ("devices", "iqos", "terea")
+            }
+            return GetCategoriesResponse(**categories)
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении категорий: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении категорий: {str(error)}")
+
+    @staticmethod
+    async def get_category_products(
+            product_type: str,
+            category_id: int,
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            cursor: str | None = None,
+            with_total: bool = True,
+            view: str = "full",
+            fields: List[str] | None = None
+    ) -> GetDevicesResponse | GetIqosResponse | GetTereaResponse | GetDevicesProjectionResponse | GetIqosProjectionResponse | GetTereaProjectionResponse:
+        logger.info(f"Получение продуктов {product_type} категории {category_id}")
+        snapshot = await catalog_cache.get_snapshot()
+        if category_id not in snapshot.get_categories(product_type):
+            logger.warning(f"Категория {product_type} с id {category_id} не найдена")
+            raise ValueError("Категория не найдена")
+
+        get_list = {
+            "devices": DevicesService.get_devices,
+            "iqos": DevicesService.get_iqos_list,
+            "terea": DevicesService.get_terea_list,
+        }[product_type]
+        filters = (filters or ProductFilters()).model_copy(update={"category_id": category_id})
+        return await get_list(
+            skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total, view=view, fields=fields
+        )
+
+    @staticmethod
+    async def export_products() -> AsyncIterator[bytes]:
+        logger.info("Выгрузка каталога в NDJSON")
+        snapshot = await catalog_cache.get_snapshot()
+        exported = 0
+        for product_type, schema in (("terea", TereaSchema), ("iqos", IqosSchema), ("devices", DevicesSchema)):
+            categories = snapshot.get_categories(product_type)
+            async for model in DevicesRepository.stream_products(product_type):
+                category_id = getattr(model, category_key(model))
+                if category_id not in categories:
+                    categories = await catalog_cache.get_categories(product_type, [category_id])
+                    if not _with_known_category(product_type, [model], categories):
+                        continue
+                product = build_product(schema, model, categories)
+                yield f'{{"type":{json.dumps(product_type)},"product":{product.model_dump_json()}}}\n'.encode()
+                exported += 1
+        logger.info(f"Выгрузка каталога завершена: {exported} продуктов")
+
+    @staticmethod
+    async def get_products_list(
+            skip: int = 0,
+            limit: int = 100,
+            filters: ProductFilters | None = None,
+            product_types: List[str] | None = None,
+            cursor: str | None = None,
+            with_total: bool = True
+    ) -> GetProductsListResponse:
+        logger.info(f"Получение продуктов всех типов: skip={skip}, limit={limit}, types={product_types}, filters={filters}")
+        try:
+            filters = filters or ProductFilters()
+            cursor_key = decode_cursor(cursor, filters.sort) if cursor else None
+            models, _ = await ProductsRepository.select_products(
+                skip=skip, limit=limit + 1, filters=filters, product_types=product_types, cursor_key=cursor_key, with_total=False
+            )
+            has_more = len(models) > limit
+            models = models[:limit]
+            next_cursor = encode_cursor(filters.sort, models[-1]) if has_more and models else None
+
+            total = None
+            if with_total:
+                total = await _filtered_total(
+                    await catalog_cache.get_snapshot(),
+                    ("products", f"{sorted(product_types or [])}{filters.model_dump_json(exclude={'sort'})}"),
+                    lambda: ProductsRepository.count_products(filters, product_types)
+                )
+
+            products = [
+                ProductRowSchema(
+                    type=model.type, id=model.product_id, ref=model.ref, name=model.name, price=model.price,
+                    image=model.image, nalichie=model.nalichie, new=model.new, hit=model.hit,
+                    category_id=model.category_id, category_name=model.category_name
+                )
+                for model in models
+            ]
+
+            logger.info(f"Успешно возвращено {len(products)} продуктов всех типов")
+            return GetProductsListResponse(
+                products=products,
+                skip=skip,
+                limit=limit,
+                total=total,
+                next_cursor=next_cursor
+            )
+
+        except Exception as error:
+            logger.error(f"Ошибка при получении продуктов всех типов: {str(error)}", exc_info=True)
+            raise ValueError(f"Ошибка при получении продуктов всех типов: {str(error)}")
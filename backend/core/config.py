@@ -1,4 +1,5 @@
 from os import getenv
+from typing import List
 from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
@@ -42,6 +43,43 @@ class DataBaseConfig(BaseModel):
     echo: bool = False
     pool_size: int = 10
     max_overflow: int = 15
+    pool_pre_ping: bool = bool(int(getenv("DB_POOL_PRE_PING", "1")))
+    # Меньше wait_timeout MySQL, чтобы соединение пересоздавалось до того, как его закроет сервер
+    pool_recycle: int = int(getenv("DB_POOL_RECYCLE", "1800"))
+    pool_warmup: int = int(getenv("DB_POOL_WARMUP", "5"))
+    pool_maintenance_interval: float = float(getenv("DB_POOL_MAINTENANCE_INTERVAL", "300"))
+    # Реплики только для чтения каталога, через запятую в том же формате, что и url
+    replica_urls: List[str] = [url.strip() for url in getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+    replica_max_lag: float = float(getenv("DB_REPLICA_MAX_LAG", "5"))
+    replica_check_interval: float = float(getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+
+class CatalogCacheConfig(BaseModel):
+    # Как часто перечитываются продажи для витрин; каталог пересобирается, только если они изменились
+    ttl_seconds: int = int(getenv("CATALOG_CACHE_TTL", "300"))
+    # Как часто сверяется дешёвый маркер изменений каталога (число строк и max(updated_at) по таблицам)
+    check_seconds: float = float(getenv("CATALOG_CHECK_INTERVAL", "5"))
+    response_cache_size: int = int(getenv("CATALOG_RESPONSE_CACHE_SIZE", "2048"))
+    rail_size: int = int(getenv("CATALOG_RAIL_SIZE", "48"))
+    similar_size: int = int(getenv("CATALOG_SIMILAR_SIZE", "24"))
+    rails_by_sales: bool = bool(int(getenv("CATALOG_RAILS_BY_SALES", "1")))
+
+
+class IdempotencyConfig(BaseModel):
+    ttl_seconds: int = int(getenv("IDEMPOTENCY_TTL", "86400"))
+    cache_size: int = int(getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    # Сколько повтор ждёт завершения исходного запроса, выполняющегося в другом процессе
+    wait_seconds: float = float(getenv("IDEMPOTENCY_WAIT", "30"))
+    # Через сколько незавершённый ключ считается брошенным упавшим процессом; намного дольше любого запроса
+    abandon_seconds: float = float(getenv("IDEMPOTENCY_ABANDON_AFTER", "600"))
+
+
+class OrderIntakeConfig(BaseModel):
+    # Приём заказов через локальный журнал с отложенной записью в MySQL, по умолчанию выключен
+    enabled: bool = bool(int(getenv("ORDER_INTAKE_JOURNAL", "0")))
+    journal_path: str = getenv("ORDER_INTAKE_PATH", "order_intake.sqlite3")
+    batch_size: int = int(getenv("ORDER_INTAKE_BATCH_SIZE", "100"))
+    flush_delay: float = float(getenv("ORDER_INTAKE_FLUSH_DELAY", "0.005"))
+
 
 class AuthConfig(BaseModel):
     SECRET_KEY: str = getenv("SECRET_KEY")
@@ -52,6 +90,9 @@ class Settings(BaseSettings):
     db: DataBaseConfig = DataBaseConfig()
     log: LogerConfig = LogerConfig()
     auth: AuthConfig = AuthConfig()
+    catalog: CatalogCacheConfig = CatalogCacheConfig()
+    idempotency: IdempotencyConfig = IdempotencyConfig()
+    order_intake: OrderIntakeConfig = OrderIntakeConfig()
 
 
 settings = Settings()
\ No newline at end of file
@@ -1,6 +1,22 @@
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 
 from backend.core.config import settings
+from backend.core.pool_monitor import MonitoredQueuePool, PoolMonitor
+
+
+logger = logging.getLogger(__name__)
+
+# Чтения, которые должны видеть последнюю запись, в пределах контекста (задачи asyncio) идут на primary
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
 
 
 class DatabaseHelper:
@@ -10,14 +26,24 @@ class DatabaseHelper:
             echo: bool = False,
             pool_size: int = 5,
             max_overflow: int = 10,
+            replica_urls: Sequence[str] = (),
+            replica_max_lag: float = 5.0,
+            replica_check_interval: float = 5.0,
+            pool_pre_ping: bool = True,
+            pool_recycle: int = 1800,
+            pool_warmup: int = 0,
+            pool_maintenance_interval: float = 300.0,
 
     ):
-        self.engine: AsyncEngine = create_async_engine(
-            url=url,
-            echo=echo,
-            pool_size=pool_size,
-            max_overflow=max_overflow
-        )
+        self.echo = echo
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_pre_ping = pool_pre_ping
+        self.pool_recycle = pool_recycle
+        self.pool_warmup = pool_warmup
+        self.pool_maintenance_interval = pool_maintenance_interval
+
+        self.engine: AsyncEngine = self._create_engine(url)
 
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,
@@ -25,10 +51,147 @@ class DatabaseHelper:
             expire_on_commit=False
         )
 
+        # У каждой реплики свой пул, чтобы чтения каталога не занимали соединения записи
+        self.replica_engines: List[AsyncEngine] = [self._create_engine(replica_url) for replica_url in replica_urls]
+        self.replica_session_factories: List[async_sessionmaker[AsyncSession]] = [
+            async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+            for engine in self.replica_engines
+        ]
+
+        self.pool_monitors: Dict[str, PoolMonitor] = {"primary": PoolMonitor(self.engine)}
+        for replica, engine in enumerate(self.replica_engines):
+            self.pool_monitors[f"replica-{replica}"] = PoolMonitor(engine)
+
+        self.replica_max_lag = replica_max_lag
+        self.replica_check_interval = replica_check_interval
+        self._healthy_replicas: List[int] = list(range(len(self.replica_engines)))
+        self._round_robin = itertools.count()
+        self._primary_until = 0.0
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        # pool_pre_ping и pool_recycle не дают получить соединение, закрытое MySQL по wait_timeout
+        return create_async_engine(
+            url=url,
+            echo=self.echo,
+            poolclass=MonitoredQueuePool,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=self.pool_pre_ping,
+            pool_recycle=self.pool_recycle
+        )
+
+    def read_session_factory(self) -> AsyncSession:
+        # Сразу после записи реплика может ещё не догнать primary, поэтому читаем с primary
+        if not self._healthy_replicas or _primary_reads.get() or time.monotonic() < self._primary_until:
+            return self.session_factory()
+
+        healthy = self._healthy_replicas
+        replica = healthy[next(self._round_robin) % len(healthy)]
+        return self.replica_session_factories[replica]()
+
+    def mark_written(self) -> None:
+        # Окно действует только в этом процессе: другие воркеры о записи не знают и читают с реплик.
+        # Снапшот каталога поэтому собирается с primary (reading_primary), а не полагается на это окно
+        self._primary_until = time.monotonic() + self.replica_max_lag + self.replica_check_interval
+
+    @contextmanager
+    def reading_primary(self) -> Iterator[None]:
+        token = _primary_reads.set(True)
+        try:
+            yield
+        finally:
+            _primary_reads.reset(token)
+
+    @staticmethod
+    async def _replica_lag(connection: AsyncConnection) -> float | None:
+        if connection.dialect.name != "mysql":
+            await connection.execute(text("SELECT 1"))
+            return 0.0
+
+        for query, column in (
+                ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+        ):
+            try:
+                row = (await connection.execute(text(query))).mappings().first()
+            except Exception:
+                continue
+            # Сервер без настроенной репликации (стенд или копия) считаем актуальным
+            if row is None:
+                return 0.0
+            return None if row[column] is None else float(row[column])
+        return None
+
+    async def check_replicas(self) -> List[int]:
+        healthy = []
+        for replica, engine in enumerate(self.replica_engines):
+            name = engine.url.host or engine.url.database
+            try:
+                async with engine.connect() as connection:
+                    lag = await self._replica_lag(connection)
+            except Exception as error:
+                logger.warning(f"Реплика {name} недоступна: {str(error)}")
+                continue
+
+            if lag is None:
+                logger.warning(f"Репликация на {name} остановлена")
+            elif lag > self.replica_max_lag:
+                logger.warning(f"Реплика {name} отстаёт на {lag:.0f} с, чтения идут на primary")
+            else:
+                healthy.append(replica)
+
+        self._healthy_replicas = healthy
+        return healthy
+
+    async def monitor_replicas(self) -> None:
+        while True:
+            try:
+                await self.check_replicas()
+            except Exception as error:
+                logger.error(f"Ошибка при проверке реплик: {str(error)}", exc_info=True)
+            await asyncio.sleep(self.replica_check_interval)
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {name: monitor.stats() for name, monitor in self.pool_monitors.items()}
+        for replica in range(len(self.replica_engines)):
+            stats[f"replica-{replica}"]["healthy"] = replica in self._healthy_replicas
+        return stats
+
+    async def warm_pools(self) -> None:
+        count = min(self.pool_warmup, self.pool_size)
+        if count <= 0:
+            return
+        for name, monitor in self.pool_monitors.items():
+            try:
+                await monitor.warm(count)
+                logger.info(f"Пул {name} прогрет: {count} соединений")
+            except Exception as error:
+                logger.warning(f"Не удалось прогреть пул {name}: {str(error)}")
+
+    async def maintain_pools(self) -> None:
+        while True:
+            await asyncio.sleep(self.pool_maintenance_interval)
+            for name, monitor in self.pool_monitors.items():
+                try:
+                    await monitor.refresh_idle()
+                except Exception as error:
+                    logger.warning(f"Ошибка при обновлении соединений пула {name}: {str(error)}")
+
+    async def dispose(self) -> None:
+        for engine in (self.engine, *self.replica_engines):
+            await engine.dispose()
+
 
 db_helper = DatabaseHelper(
     settings.db.url,
     settings.db.echo,
     settings.db.pool_size,
     settings.db.max_overflow,
-)
\ No newline at end of file
+    settings.db.replica_urls,
+    settings.db.replica_max_lag,
+    settings.db.replica_check_interval,
+    settings.db.pool_pre_ping,
+    settings.db.pool_recycle,
+    settings.db.pool_warmup,
+    settings.db.pool_maintenance_interval,
+)
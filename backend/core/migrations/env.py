@@ -27,7 +27,10 @@ from backend.core.models import (
     IqosModel, IqosCategoryModel,
     TereaModel, TereaCategoryModel,
     OrderModel, OrderedProductModel,
-    AdminUserModel
+    AdminUserModel,
+    ProductModel,
+    CustomerModel,
+    IdempotencyKeyModel
 )
 
 
@@ -0,0 +1,32 @@
+"""add unique indexes on products ref
+
+Revision ID: 3f9a0c6e1b27
+Revises: 6e43d39dd3cf
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a0c6e1b27'
+down_revision: Union[str, Sequence[str], None] = '6e43d39dd3cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_Devices_ref'), 'Devices', ['ref'], unique=True)
+    op.create_index(op.f('ix_Iqos_ref'), 'Iqos', ['ref'], unique=True)
+    op.create_index(op.f('ix_Terea_ref'), 'Terea', ['ref'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_Terea_ref'), table_name='Terea')
+    op.drop_index(op.f('ix_Iqos_ref'), table_name='Iqos')
+    op.drop_index(op.f('ix_Devices_ref'), table_name='Devices')
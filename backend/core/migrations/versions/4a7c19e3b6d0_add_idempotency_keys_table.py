@@ -0,0 +1,38 @@
+"""add idempotency keys table
+
+Revision ID: 4a7c19e3b6d0
+Revises: e52a8c0d4f17
+Create Date: 2026-10-18 16:40:27.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7c19e3b6d0'
+down_revision: Union[str, Sequence[str], None] = 'e52a8c0d4f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('Idempotency_keys',
+    sa.Column('key', sa.VARCHAR(length=255), nullable=False),
+    sa.Column('fingerprint', sa.CHAR(length=64), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('response', mysql.LONGTEXT(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_Idempotency_keys_created_at'), 'Idempotency_keys', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_Idempotency_keys_created_at'), table_name='Idempotency_keys')
+    op.drop_table('Idempotency_keys')
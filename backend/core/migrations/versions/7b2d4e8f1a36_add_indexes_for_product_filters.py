@@ -0,0 +1,48 @@
+"""add indexes for product filters
+
+Revision ID: 7b2d4e8f1a36
+Revises: 3f9a0c6e1b27
+Create Date: 2026-10-18 11:47:05.902317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d4e8f1a36'
+down_revision: Union[str, Sequence[str], None] = '3f9a0c6e1b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_Devices_nalichie_price', 'Devices', ['nalichie', 'price'], unique=False)
+    op.create_index(op.f('ix_Devices_price'), 'Devices', ['price'], unique=False)
+    op.create_index(op.f('ix_Devices_color'), 'Devices', ['color'], unique=False)
+
+    op.create_index('ix_Iqos_nalichie_price', 'Iqos', ['nalichie', 'price'], unique=False)
+    op.create_index(op.f('ix_Iqos_price'), 'Iqos', ['price'], unique=False)
+    op.create_index(op.f('ix_Iqos_color'), 'Iqos', ['color'], unique=False)
+
+    op.create_index('ix_Terea_nalichie_price', 'Terea', ['nalichie', 'price'], unique=False)
+    op.create_index(op.f('ix_Terea_price'), 'Terea', ['price'], unique=False)
+    op.create_index(op.f('ix_Terea_strength'), 'Terea', ['strength'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_Terea_strength'), table_name='Terea')
+    op.drop_index(op.f('ix_Terea_price'), table_name='Terea')
+    op.drop_index('ix_Terea_nalichie_price', table_name='Terea')
+
+    op.drop_index(op.f('ix_Iqos_color'), table_name='Iqos')
+    op.drop_index(op.f('ix_Iqos_price'), table_name='Iqos')
+    op.drop_index('ix_Iqos_nalichie_price', table_name='Iqos')
+
+    op.drop_index(op.f('ix_Devices_color'), table_name='Devices')
+    op.drop_index(op.f('ix_Devices_price'), table_name='Devices')
+    op.drop_index('ix_Devices_nalichie_price', table_name='Devices')
@@ -0,0 +1,68 @@
+"""add products read table
+
+Revision ID: 9d3b5f71c2e4
+Revises: 7b2d4e8f1a36
+Create Date: 2026-10-18 13:05:42.570118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3b5f71c2e4'
+down_revision: Union[str, Sequence[str], None] = '7b2d4e8f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_SOURCES = (
+    ('terea', 'Terea', 'Terea_category', 'terea_id'),
+    ('iqos', 'Iqos', 'Iqos_category', 'id_category'),
+    ('devices', 'Devices', 'Devices_category', 'device_id'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('Products',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('type', sa.VARCHAR(length=16), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('ref', sa.VARCHAR(length=256), nullable=False),
+    sa.Column('name', sa.VARCHAR(length=256), nullable=False),
+    sa.Column('price', sa.DECIMAL(precision=10, scale=0), nullable=False),
+    sa.Column('image', mysql.LONGTEXT(), nullable=False),
+    sa.Column('nalichie', mysql.TINYINT(display_width=1), nullable=False),
+    sa.Column('new', mysql.TINYINT(), nullable=False),
+    sa.Column('hit', mysql.TINYINT(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('category_name', sa.VARCHAR(length=256), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('type', 'product_id', name='uq_Products_type_product_id')
+    )
+    op.create_index('ix_Products_nalichie_price', 'Products', ['nalichie', 'price'], unique=False)
+    op.create_index('ix_Products_type_price', 'Products', ['type', 'price'], unique=False)
+    op.create_index(op.f('ix_Products_name'), 'Products', ['name'], unique=False)
+    op.create_index(op.f('ix_Products_price'), 'Products', ['price'], unique=False)
+    op.create_index(op.f('ix_Products_ref'), 'Products', ['ref'], unique=False)
+
+    for product_type, table, category_table, category_column in BACKFILL_SOURCES:
+        op.execute(
+            f"INSERT INTO Products (type, product_id, ref, name, price, image, nalichie, new, hit, category_id, category_name) "
+            f"SELECT '{product_type}', p.id, p.ref, p.name, p.price, p.image, p.nalichie, p.new, p.hit, c.id, c.category_name "
+            f"FROM {table} p JOIN {category_table} c ON c.id = p.{category_column}"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_Products_ref'), table_name='Products')
+    op.drop_index(op.f('ix_Products_price'), table_name='Products')
+    op.drop_index(op.f('ix_Products_name'), table_name='Products')
+    op.drop_index('ix_Products_type_price', table_name='Products')
+    op.drop_index('ix_Products_nalichie_price', table_name='Products')
+    op.drop_table('Products')
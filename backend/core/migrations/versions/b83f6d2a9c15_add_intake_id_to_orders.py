@@ -0,0 +1,30 @@
+"""add intake_id to orders
+
+Revision ID: b83f6d2a9c15
+Revises: 4a7c19e3b6d0
+Create Date: 2026-10-18 18:21:53.664270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83f6d2a9c15'
+down_revision: Union[str, Sequence[str], None] = '4a7c19e3b6d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('Orders', sa.Column('intake_id', sa.VARCHAR(length=36), nullable=True))
+    op.create_unique_constraint('uq_Orders_intake_id', 'Orders', ['intake_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_Orders_intake_id', 'Orders', type_='unique')
+    op.drop_column('Orders', 'intake_id')
@@ -0,0 +1,45 @@
+"""add updated_at to catalog tables
+
+Revision ID: d27e4b90a5c3
+Revises: b83f6d2a9c15
+Create Date: 2026-10-18 19:05:41.237180
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd27e4b90a5c3'
+down_revision: Union[str, Sequence[str], None] = 'b83f6d2a9c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CATALOG_TABLES = ('Devices', 'Iqos', 'Terea', 'Devices_category', 'Iqos_category', 'Terea_category')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Микросекунды, чтобы две правки в одну секунду давали разный маркер; ON UPDATE ловит и правки мимо ORM
+    for table in CATALOG_TABLES:
+        op.add_column(table, sa.Column(
+            'updated_at',
+            mysql.DATETIME(fsp=6),
+            server_default=sa.text('CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)'),
+            nullable=False
+        ))
+    # max(updated_at) по таблицам товаров читается из индекса при каждой проверке снапшота
+    for table in CATALOG_TABLES[:3]:
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(CATALOG_TABLES[:3]):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+    for table in reversed(CATALOG_TABLES):
+        op.drop_column(table, 'updated_at')
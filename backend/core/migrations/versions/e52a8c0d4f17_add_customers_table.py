@@ -0,0 +1,76 @@
+"""add customers table
+
+Revision ID: e52a8c0d4f17
+Revises: 9d3b5f71c2e4
+Create Date: 2026-10-18 15:12:08.413906
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e52a8c0d4f17'
+down_revision: Union[str, Sequence[str], None] = '9d3b5f71c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(phone_number: str) -> str | None:
+    # Копия нормализации из приложения на момент этой ревизии: миграция не должна зависеть от кода приложения
+    digits = NON_DIGITS.sub("", phone_number)
+    if not phone_number.strip().startswith("+"):
+        if len(digits) == 11 and digits[0] == "8":
+            digits = "7" + digits[1:]
+        elif len(digits) == 10:
+            digits = "7" + digits
+
+    if not 10 <= len(digits) <= 15 or digits[0] == "0":
+        return None
+    return "+" + digits
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    customers = op.create_table('Customers',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('phone', sa.VARCHAR(length=16), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.Column('first_order_at', sa.DateTime(), nullable=False),
+    sa.Column('last_order_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('phone')
+    )
+
+    # Номера в Orders записаны как ввёл покупатель, поэтому группировка по E.164 делается здесь, а не в SQL
+    orders = op.get_bind().execute(
+        sa.text("SELECT phone_number, total_amount, created_at FROM Orders ORDER BY id")
+    )
+    rows = {}
+    for phone_number, total_amount, created_at in orders:
+        phone = normalize_phone(phone_number)
+        if phone is None:
+            continue
+        row = rows.setdefault(phone, {
+            'phone': phone, 'orders_count': 0, 'total_amount': 0,
+            'first_order_at': created_at, 'last_order_at': created_at,
+        })
+        row['orders_count'] += 1
+        row['total_amount'] += total_amount
+        row['first_order_at'] = min(row['first_order_at'], created_at)
+        row['last_order_at'] = max(row['last_order_at'], created_at)
+
+    if rows:
+        op.bulk_insert(customers, list(rows.values()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('Customers')
@@ -0,0 +1,22 @@
+import decimal
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import VARCHAR, DECIMAL, Integer, DateTime
+
+from backend.core.models.base_model import BaseModel
+
+
+# Покупатель по номеру телефона в формате E.164; счётчики обновляются upsert'ом при создании заказа
+class CustomerModel(BaseModel):
+    __tablename__ = "Customers"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    phone: Mapped[str] = mapped_column(VARCHAR(16), unique=True)
+    orders_count: Mapped[int] = mapped_column(Integer)
+    total_amount: Mapped[decimal.Decimal] = mapped_column(DECIMAL(precision=14, scale=2))
+    first_order_at: Mapped[datetime] = mapped_column(DateTime)
+    last_order_at: Mapped[datetime] = mapped_column(DateTime)
+
+    def __str__(self):
+        return f"Покупатель {self.phone}, заказов: {self.orders_count}"
@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import VARCHAR
+from sqlalchemy.dialects.mysql import DATETIME
+from sqlalchemy import VARCHAR, func
 
 from backend.core.models.base_model import BaseModel
 
@@ -9,6 +12,7 @@ class DevicesCategoryModel(BaseModel):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     category_name: Mapped[str] = mapped_column(VARCHAR(256))
+    updated_at: Mapped[datetime] = mapped_column(DATETIME(fsp=6), server_default=func.now(6), onupdate=func.now(6))
 
     devices: Mapped[list["DevicesModel"]] = relationship(back_populates="category")
 
@@ -1,8 +1,9 @@
 import decimal
+from datetime import datetime
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.mysql import LONGTEXT, TINYINT, ENUM
-from sqlalchemy import VARCHAR, DECIMAL, Integer, ForeignKey
+from sqlalchemy.dialects.mysql import LONGTEXT, TINYINT, ENUM, DATETIME
+from sqlalchemy import VARCHAR, DECIMAL, Integer, ForeignKey, Index, func
 
 from backend.core.models.base_model import BaseModel
 from backend.core.models.emun_for_models import ENUM_COLORS
@@ -11,19 +12,21 @@ from backend.core.models.emun_for_models import ENUM_COLORS
 
 class DevicesModel(BaseModel):
     __tablename__ = "Devices"
+    __table_args__ = (Index("ix_Devices_nalichie_price", "nalichie", "price"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(VARCHAR(256))
     description: Mapped[str] = mapped_column(LONGTEXT)
     image: Mapped[str] = mapped_column(LONGTEXT)
-    price: Mapped[decimal.Decimal] = mapped_column(DECIMAL(precision=10, scale=0))
+    price: Mapped[decimal.Decimal] = mapped_column(DECIMAL(precision=10, scale=0), index=True)
     nalichie: Mapped[int] = mapped_column(TINYINT(display_width=1))
     new: Mapped[int] = mapped_column(TINYINT)
     hit: Mapped[int | None] = mapped_column(TINYINT, nullable=True)
-    color: Mapped[str] = mapped_column(ENUM(*ENUM_COLORS))
-    ref: Mapped[str] = mapped_column(VARCHAR(256))
+    color: Mapped[str] = mapped_column(ENUM(*ENUM_COLORS), index=True)
+    ref: Mapped[str] = mapped_column(VARCHAR(256), unique=True, index=True)
     type: Mapped[str] = mapped_column(VARCHAR(256))
     device_id: Mapped[int] = mapped_column(Integer, ForeignKey("Devices_category.id"))
+    updated_at: Mapped[datetime] = mapped_column(DATETIME(fsp=6), server_default=func.now(6), onupdate=func.now(6), index=True)
 
     category: Mapped["DevicesCategoryModel"] = relationship(back_populates="devices")
 
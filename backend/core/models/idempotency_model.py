@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy import VARCHAR, CHAR, Integer, DateTime
+
+from backend.core.models.base_model import BaseModel
+
+
+# Ключи Idempotency-Key для POST /orders; status_code и response пустые, пока запрос выполняется
+class IdempotencyKeyModel(BaseModel):
+    __tablename__ = "Idempotency_keys"
+
+    key: Mapped[str] = mapped_column(VARCHAR(255), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(CHAR(64))
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response: Mapped[str | None] = mapped_column(LONGTEXT, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
@@ -1,8 +1,9 @@
 import decimal
+from datetime import datetime
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.mysql import TEXT, LONGTEXT, ENUM, TINYINT
-from sqlalchemy import VARCHAR, DECIMAL, Integer, ForeignKey
+from sqlalchemy.dialects.mysql import TEXT, LONGTEXT, ENUM, TINYINT, DATETIME
+from sqlalchemy import VARCHAR, DECIMAL, Integer, ForeignKey, Index, func
 
 from backend.core.models.base_model import BaseModel
 from backend.core.models.emun_for_models import ENUM_COLORS
@@ -10,22 +11,24 @@ from backend.core.models.emun_for_models import ENUM_COLORS
 
 class IqosModel(BaseModel):
     __tablename__ = "Iqos"
+    __table_args__ = (Index("ix_Iqos_nalichie_price", "nalichie", "price"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(VARCHAR(256))
     model: Mapped[str | None] = mapped_column(TEXT, nullable=True)
     description: Mapped[str] = mapped_column(LONGTEXT)
     image: Mapped[str] = mapped_column(LONGTEXT)
-    price: Mapped[decimal.Decimal] = mapped_column(DECIMAL(precision=10, scale=0))
-    color: Mapped[str] = mapped_column(ENUM(*ENUM_COLORS))
+    price: Mapped[decimal.Decimal] = mapped_column(DECIMAL(precision=10, scale=0), index=True)
+    color: Mapped[str] = mapped_column(ENUM(*ENUM_COLORS), index=True)
     new: Mapped[int] = mapped_column(TINYINT(display_width=1))
     hit: Mapped[int | None] = mapped_column(TINYINT, nullable=True)
     exclusive: Mapped[int | None] = mapped_column(TINYINT, nullable=True)
     nalichie: Mapped[int] = mapped_column(TINYINT(display_width=1))
-    ref: Mapped[str] = mapped_column(VARCHAR(256))
+    ref: Mapped[str] = mapped_column(VARCHAR(256), unique=True, index=True)
     type: Mapped[str] = mapped_column(VARCHAR(256))
     sale_price: Mapped[decimal.Decimal | None] = mapped_column(DECIMAL(precision=10, scale=0), nullable=True)
     id_category: Mapped[int] = mapped_column(Integer, ForeignKey("Iqos_category.id"))
+    updated_at: Mapped[datetime] = mapped_column(DATETIME(fsp=6), server_default=func.now(6), onupdate=func.now(6), index=True)
 
     category: Mapped["IqosCategoryModel"] = relationship(back_populates="iqos")
 
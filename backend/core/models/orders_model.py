@@ -4,13 +4,14 @@ from typing import List
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.mysql import TEXT, TINYINT
-from sqlalchemy import VARCHAR, DECIMAL, Integer, DateTime, ForeignKey, func
+from sqlalchemy import VARCHAR, DECIMAL, Integer, DateTime, ForeignKey, UniqueConstraint, func
 
 from backend.core.models.base_model import BaseModel
 
 
 class OrderModel(BaseModel):
     __tablename__ = "Orders"
+    __table_args__ = (UniqueConstraint("intake_id", name="uq_Orders_intake_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     is_first_order: Mapped[bool] = mapped_column(TINYINT(display_width=1))
@@ -21,6 +22,8 @@ class OrderModel(BaseModel):
     address: Mapped[str | None] = mapped_column(TEXT, nullable=True)
     total_amount: Mapped[decimal.Decimal] = mapped_column(DECIMAL(precision=12, scale=2))
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    # Идентификатор записи журнала приёма заказов, уникальный, чтобы заказ из журнала записался ровно один раз
+    intake_id: Mapped[str | None] = mapped_column(VARCHAR(36), nullable=True)
 
 
     ordered_items: Mapped[List["OrderedProductModel"]] = relationship(back_populates="order", cascade="all, delete-orphan")
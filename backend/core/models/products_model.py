@@ -0,0 +1,33 @@
+import decimal
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.mysql import LONGTEXT, TINYINT
+from sqlalchemy import VARCHAR, DECIMAL, Integer, Index, UniqueConstraint
+
+from backend.core.models.base_model import BaseModel
+
+
+# Денормализованная витрина Terea/Iqos/Devices для запросов сразу по всем типам, заполняется из админки
+class ProductModel(BaseModel):
+    __tablename__ = "Products"
+    __table_args__ = (
+        UniqueConstraint("type", "product_id", name="uq_Products_type_product_id"),
+        Index("ix_Products_nalichie_price", "nalichie", "price"),
+        Index("ix_Products_type_price", "type", "price"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    type: Mapped[str] = mapped_column(VARCHAR(16))
+    product_id: Mapped[int] = mapped_column(Integer)
+    ref: Mapped[str] = mapped_column(VARCHAR(256), index=True)
+    name: Mapped[str] = mapped_column(VARCHAR(256), index=True)
+    price: Mapped[decimal.Decimal] = mapped_column(DECIMAL(precision=10, scale=0), index=True)
+    image: Mapped[str] = mapped_column(LONGTEXT)
+    nalichie: Mapped[int] = mapped_column(TINYINT(display_width=1))
+    new: Mapped[int] = mapped_column(TINYINT)
+    hit: Mapped[int | None] = mapped_column(TINYINT, nullable=True)
+    category_id: Mapped[int] = mapped_column(Integer)
+    category_name: Mapped[str] = mapped_column(VARCHAR(256))
+
+    def __str__(self):
+        return f"Products {self.type} id: {self.product_id}"
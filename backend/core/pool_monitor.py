@@ -0,0 +1,140 @@
+import bisect
+import time
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+# Верхние границы корзин гистограммы ожидания соединения, мс
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [str(bound) for bound in self._bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "max": round(self.max, 3),
+            "buckets": dict(zip(labels, self._counts)),
+        }
+
+
+# Пул замеряет полное время выдачи соединения: ожидание в очереди, pre-ping и переподключение
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    monitor: "PoolMonitor | None" = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if self.monitor is not None:
+                self.monitor.timeouts += 1
+            raise
+        if self.monitor is not None:
+            self.monitor.checkout_wait.observe((time.perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+
+class PoolMonitor:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.checkout_wait = Histogram(WAIT_BUCKETS_MS)
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.closes = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self._connected_at: Dict[int, float] = {}
+
+        pool = engine.sync_engine.pool
+        if isinstance(pool, MonitoredQueuePool):
+            pool.monitor = self
+
+        # События вешаются на движок, а не на пул, чтобы пережить engine.dispose()
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+        event.listen(sync_engine, "close", self._on_close)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+        self._connected_at[id(connection_record)] = time.monotonic()
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.engine.sync_engine.pool.checkedout())
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        # Разрыв, найденный pre-ping или при запросе: соединение будет открыто заново
+        self.invalidations += 1
+        self._connected_at.pop(id(connection_record), None)
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        self.closes += 1
+        self._connected_at.pop(id(connection_record), None)
+
+    async def warm(self, count: int) -> int:
+        # Соединения держатся одновременно, иначе пул отдаст одно и то же
+        async with AsyncExitStack() as stack:
+            for _ in range(count):
+                await stack.enter_async_context(self.engine.connect())
+        return count
+
+    async def refresh_idle(self) -> int:
+        # Очередь пула FIFO: по одному прогоняем все свободные соединения через pre-ping и pool_recycle,
+        # не занимая больше одного соединения одновременно
+        idle = self.engine.sync_engine.pool.checkedin()
+        for _ in range(idle):
+            async with self.engine.connect():
+                pass
+        return idle
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.engine.sync_engine.pool
+        now = time.monotonic()
+        ages = [now - connected_at for connected_at in self._connected_at.values()]
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": getattr(pool, "_max_overflow", 0),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "closes": self.closes,
+            "timeouts": self.timeouts,
+            "checkout_wait_ms": self.checkout_wait.to_dict(),
+            "connection_age_s": {
+                "count": len(ages),
+                "max": round(max(ages, default=0.0), 1),
+                "avg": round(sum(ages) / len(ages), 1) if ages else 0.0,
+            },
+        }
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, APIRouter
 from uvicorn import run
@@ -8,6 +10,9 @@ from backend.app.admin import admin_views
 from backend.app.api.routers.products_routers import router as products_router
 from backend.app.api.routers.orders_routers import router as orders_router
 from backend.app.auth.admin_auth import authentication_backend
+from backend.app.cache.catalog_cache import catalog_cache
+from backend.app.cache.idempotency_store import idempotency_store
+from backend.app.services.order_intake import order_intake
 from backend.core.config import settings
 from backend.core.db_helper import db_helper
 
@@ -15,8 +20,38 @@ from backend.core.db_helper import db_helper
 settings.log.setup_logging()
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await db_helper.warm_pools()
+
+    try:
+        await catalog_cache.reload()
+    except Exception as error:
+        logger.error(f"Не удалось загрузить каталог при старте, загрузка отложена до первого запроса: {str(error)}")
+
+    background_tasks = [
+        asyncio.create_task(db_helper.maintain_pools()),
+        asyncio.create_task(idempotency_store.purge_expired()),
+    ]
+    if db_helper.replica_engines:
+        await db_helper.check_replicas()
+        background_tasks.append(asyncio.create_task(db_helper.monitor_replicas()))
+
+    if settings.order_intake.enabled:
+        await order_intake.start()
+
+    yield
+
+    if order_intake.is_running:
+        await order_intake.stop()
+    for task in background_tasks:
+        task.cancel()
+    await db_helper.dispose()
+
+
 def create_application() -> FastAPI:
-    app = FastAPI(title="terea-store", version="1.0.0", docs_url="/docs", redoc_url="/redoc")
+    app = FastAPI(title="terea-store", version="1.0.0", docs_url="/docs", redoc_url="/redoc", lifespan=lifespan)
 
     router = APIRouter(tags=["root"])
     @router.get("/")
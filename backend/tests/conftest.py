@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+# Тесты импортируют пакет как backend.*, как и main.py при запуске из корня репозитория
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+# Конфиг читается при импорте: без .env подставляем значения, с которыми приложение собирается без MySQL
+for name, value in {
+    "IS_TEST_DB": "1",
+    "DB_USER_TEST": "test",
+    "DB_PASSWORD_TEST": "test",
+    "DB_HOST_TEST": "localhost",
+    "DB_PORT_TEST": "3306",
+    "DB_NAME_TEST": "test",
+    "SERVER_HOST": "127.0.0.1",
+    "SERVER_PORT": "8000",
+    "SECRET_KEY": "test",
+    "DB_POOL_WARMUP": "0",
+}.items():
+    os.environ.setdefault(name, value)
+
+from sqlalchemy import event
+from sqlalchemy.dialects.mysql import ENUM, LONGTEXT, SET, TEXT, TINYINT
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+
+from backend.core.db_helper import db_helper
+from backend.core.models import (
+    BaseModel,
+    DevicesModel, DevicesCategoryModel,
+    IqosModel, IqosCategoryModel,
+    TereaModel, TereaCategoryModel,
+)
+
+
+# Типы MySQL в SQLite сводятся к родственным, чтобы create_all собрал схему моделей как есть
+for mysql_type, sqlite_type in (
+        (TINYINT, "INTEGER"), (LONGTEXT, "TEXT"), (TEXT, "TEXT"), (SET, "TEXT"), (ENUM, "TEXT")
+):
+    compiles(mysql_type, "sqlite")(lambda element, compiler, _type=sqlite_type, **kw: _type)
+
+
+def _find_in_set(value, values):
+    items = values.split(",") if values else []
+    return items.index(value) + 1 if value in items else 0
+
+
+def create_sqlite_engine(path):
+    # NullPool: каждый тест крутит свой event loop через asyncio.run, соединения между ними не переиспользуются
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def register_functions(connection, _):
+        connection.create_function("find_in_set", 2, _find_in_set)
+
+    return engine
+
+
+async def seed_catalog(session_factory) -> None:
+    async with session_factory() as session:
+        devices_category = DevicesCategoryModel(category_name="Крышки Iluma")
+        iqos_category = IqosCategoryModel(category_name="Iluma One")
+        terea_categories = [TereaCategoryModel(category_name="Армения"), TereaCategoryModel(category_name="Казахстан")]
+        session.add_all([devices_category, iqos_category, *terea_categories])
+        await session.flush()
+
+        for i in range(5):
+            session.add(DevicesModel(
+                name=f"Крышка {i}", description="Крышка для Iluma", image=f"/img/d{i}.webp",
+                price=Decimal(1990 + i * 100), nalichie=i % 2, new=int(i % 3 == 0), hit=i % 2,
+                color="Серый", ref=f"device-{i}", type="devices", device_id=devices_category.id
+            ))
+            session.add(IqosModel(
+                name=f"IQOS Iluma One {i}", model="i One", description="Нагреватель табака", image=f"/img/i{i}.webp",
+                price=Decimal(9000 + i * 500), color="Зеленый", new=1, hit=i % 2, exclusive=0, nalichie=1,
+                ref=f"iqos-{i}", type="iqos", sale_price=None, id_category=iqos_category.id
+            ))
+
+        flavors = [{"Ментол"}, {"Табачный вкус"}, {"Фруктовый вкус", "Ментол"}, {"Экзотические"}]
+        for i in range(8):
+            session.add(TereaModel(
+                name=f"Terea Sienna {i}", description="Стики с насыщенным табачным вкусом", image=f"/img/t{i}.webp",
+                imagePack=None, price=Decimal(5000 + i * 10), pricePack=Decimal(510), has_capsule=i % 2,
+                flavor=flavors[i % 4], country="Армения" if i % 2 else "Казахстан", brend="Terea",
+                strength=["Легкие", "Средние", "Крепкие"][i % 3], nalichie=int(i != 3), new=i % 2,
+                hit=int(i < 3), ref=f"terea-{i}", type="terea",
+                terea_id=terea_categories[0].id if i < 4 else terea_categories[1].id
+            ))
+        await session.commit()
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    # Пустая схема всех моделей в файле SQLite вместо primary MySQL; реплик нет
+    engine = create_sqlite_engine(tmp_path / "primary.sqlite3")
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(db_helper, "engine", engine)
+    monkeypatch.setattr(db_helper, "session_factory", session_factory)
+    monkeypatch.setattr(db_helper, "replica_engines", [])
+    monkeypatch.setattr(db_helper, "replica_session_factories", [])
+    monkeypatch.setattr(db_helper, "_healthy_replicas", [])
+
+    async def create_schema():
+        async with engine.begin() as connection:
+            await connection.run_sync(BaseModel.metadata.create_all)
+
+    asyncio.run(create_schema())
+    yield session_factory
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def catalog_db(sqlite_db):
+    asyncio.run(seed_catalog(sqlite_db))
+    return sqlite_db
+
+
+@pytest.fixture
+def fresh_catalog_cache(catalog_db, monkeypatch):
+    # Глобальный кэш живёт между тестами, поэтому сервисы получают отдельный экземпляр на тест
+    from backend.app.cache.catalog_cache import CatalogCache
+    from backend.app.services import products_service
+
+    cache = CatalogCache(ttl_seconds=300, check_seconds=300)
+    monkeypatch.setattr(products_service, "catalog_cache", cache)
+    return cache
@@ -0,0 +1,28 @@
+import asyncio
+
+from backend.app.repositories.products_repository import DevicesRepository
+from backend.app.services.products_service import DevicesService
+
+
+def test_aggregate_is_served_from_one_snapshot(fresh_catalog_cache, monkeypatch):
+    calls = []
+    select_catalog = DevicesRepository.select_catalog
+
+    async def counting_select_catalog():
+        calls.append(1)
+        return await select_catalog()
+
+    monkeypatch.setattr(DevicesRepository, "select_catalog", staticmethod(counting_select_catalog))
+
+    async def scenario():
+        first = await DevicesService.get_all_products()
+        second = await DevicesService.get_all_products()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert (len(first.devices), len(first.iqos), len(first.terea)) == (5, 5, 8)
+    # Все списки без лимита, в порядке id desc, как и прежний GET /products
+    assert [terea.ref for terea in first.terea] == [f"terea-{i}" for i in reversed(range(8))]
+    assert second == first
+    # Один запрос каталога на загрузку снапшота, повторные вызовы в БД не ходят
+    assert len(calls) == 1
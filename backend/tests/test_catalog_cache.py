@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, update
+
+from backend.app.cache.catalog_cache import CatalogCache
+from backend.app.repositories.products_repository import DevicesRepository
+from backend.core.models import TereaModel
+
+
+def _count_catalog_loads(monkeypatch) -> list:
+    calls = []
+    select_catalog = DevicesRepository.select_catalog
+
+    async def counting_select_catalog():
+        calls.append(1)
+        return await select_catalog()
+
+    monkeypatch.setattr(DevicesRepository, "select_catalog", staticmethod(counting_select_catalog))
+    return calls
+
+
+async def _refreshed(cache: CatalogCache):
+    await asyncio.sleep(0.02)
+    await cache.get_snapshot()
+    if cache._refresh_task is not None:
+        await cache._refresh_task
+    return cache.snapshot
+
+
+def test_unchanged_marker_skips_rebuild(catalog_db, monkeypatch):
+    calls = _count_catalog_loads(monkeypatch)
+
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=300, check_seconds=0.01)
+        first = await cache.get_snapshot()
+        second = await _refreshed(cache)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second is first
+    assert len(calls) == 1
+
+
+def test_update_and_delete_rebuild_snapshot(catalog_db, monkeypatch):
+    calls = _count_catalog_loads(monkeypatch)
+
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=300, check_seconds=0.01)
+        first = await cache.get_snapshot()
+
+        async with catalog_db() as session:
+            await session.execute(
+                update(TereaModel)
+                .where(TereaModel.ref == "terea-0")
+                .values(name="Terea Amber", updated_at=datetime.now() + timedelta(minutes=1))
+            )
+            await session.commit()
+        updated = await _refreshed(cache)
+
+        async with catalog_db() as session:
+            await session.execute(delete(TereaModel).where(TereaModel.ref == "terea-1"))
+            await session.commit()
+        deleted = await _refreshed(cache)
+        return first, updated, deleted
+
+    first, updated, deleted = asyncio.run(scenario())
+    assert updated.version == first.version + 1
+    assert updated.find_by_ref("terea-0")[1].name == "Terea Amber"
+    assert deleted.version == updated.version + 1
+    assert deleted.find_by_ref("terea-1") is None
+    assert len(calls) == 3
+
+
+def test_expired_snapshot_is_served_while_refreshing(catalog_db):
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=300, check_seconds=0.01)
+        first = await cache.get_snapshot()
+        await asyncio.sleep(0.02)
+        # Запрос не ждёт проверки маркера: получает текущий снапшот, проверка уходит в фон
+        served = await cache.get_snapshot()
+        pending = cache._refresh_task is not None and not cache._refresh_task.done()
+        await cache._refresh_task
+        return first, served, pending
+
+    first, served, pending = asyncio.run(scenario())
+    assert served is first
+    assert pending
+
+
+def test_invalidate_forces_rebuild(catalog_db, monkeypatch):
+    calls = _count_catalog_loads(monkeypatch)
+
+    async def scenario():
+        cache = CatalogCache(ttl_seconds=300, check_seconds=300)
+        first = await cache.get_snapshot()
+        await cache.invalidate()
+        return first, cache.snapshot
+
+    first, current = asyncio.run(scenario())
+    # Содержимое не изменилось: пересборка была, но версия и объект снапшота прежние
+    assert current is first
+    assert len(calls) == 2
@@ -0,0 +1,64 @@
+import asyncio
+import json
+from decimal import Decimal
+
+from backend.app.services.products_service import DevicesService
+from backend.core.models import TereaCategoryModel, TereaModel
+
+
+def _terea(ref: str, category_id: int) -> TereaModel:
+    return TereaModel(
+        name=f"Terea {ref}", description="", image="", imagePack=None, price=Decimal(5000), pricePack=Decimal(510),
+        has_capsule=0, flavor={"Ментол"}, country="Армения", brend="Terea", strength="Легкие", nalichie=1,
+        new=0, hit=0, ref=ref, type="terea", terea_id=category_id
+    )
+
+
+async def _export() -> list:
+    return [json.loads(line) async for line in DevicesService.export_products()]
+
+
+def test_export_streams_every_product(fresh_catalog_cache):
+    lines = asyncio.run(_export())
+
+    assert len(lines) == 18
+    assert [line["type"] for line in lines] == ["terea"] * 8 + ["iqos"] * 5 + ["devices"] * 5
+    first = lines[0]["product"]
+    assert first["ref"] == "terea-0"
+    assert first["category"] == {"id": 1, "category_name": "Армения"}
+    assert first["description"] == "Стики с насыщенным табачным вкусом"
+
+
+def _add_category_with_product(session_factory, cache):
+    async def scenario():
+        await cache.get_snapshot()
+        # Категория и товар появились после сборки снапшота
+        async with session_factory() as session:
+            category = TereaCategoryModel(category_name="Япония")
+            session.add(category)
+            await session.flush()
+            session.add(_terea("terea-japan", category.id))
+            await session.commit()
+        return await _export()
+
+    return asyncio.run(scenario())
+
+
+def test_export_reloads_categories_newer_than_snapshot(fresh_catalog_cache, catalog_db):
+    lines = _add_category_with_product(catalog_db, fresh_catalog_cache)
+    exported = {line["product"]["ref"]: line["product"] for line in lines}
+
+    assert len(lines) == 19
+    assert exported["terea-japan"]["category"]["category_name"] == "Япония"
+
+
+def test_export_skips_product_with_unknown_category(fresh_catalog_cache, catalog_db, monkeypatch):
+    # Категория не нашлась и после перечитывания: товар пропускается, поток не обрывается
+    async def stale_categories(product_type, category_ids=()):
+        return fresh_catalog_cache.snapshot.get_categories(product_type)
+
+    monkeypatch.setattr(fresh_catalog_cache, "get_categories", stale_categories)
+    lines = _add_category_with_product(catalog_db, fresh_catalog_cache)
+
+    assert len(lines) == 18
+    assert "terea-japan" not in {line["product"]["ref"] for line in lines}
@@ -0,0 +1,34 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.app.services.products_service import DevicesService
+
+
+def test_categories_with_counts(fresh_catalog_cache):
+    response = asyncio.run(DevicesService.get_categories())
+
+    assert [(category.category_name, category.count) for category in response.terea] == [("Армения", 4), ("Казахстан", 4)]
+    assert [category.count for category in response.iqos] == [5]
+    assert [category.count for category in response.devices] == [5]
+
+
+def test_category_products_with_extra_filters(fresh_catalog_cache):
+    categories = asyncio.run(DevicesService.get_categories())
+    kazakhstan = categories.terea[1].id
+
+    listing = asyncio.run(DevicesService.get_category_products("terea", kazakhstan))
+    assert [terea.ref for terea in listing.terea] == ["terea-7", "terea-6", "terea-5", "terea-4"]
+
+    filtered = asyncio.run(DevicesService.get_category_products(
+        "terea", kazakhstan, filters=ProductFilters(price_max=Decimal(5050), sort="price_asc")
+    ))
+    assert [terea.ref for terea in filtered.terea] == ["terea-4", "terea-5"]
+    assert filtered.total == 2
+
+
+def test_unknown_category_is_not_found(fresh_catalog_cache):
+    with pytest.raises(ValueError, match="не найдена"):
+        asyncio.run(DevicesService.get_category_products("terea", 999))
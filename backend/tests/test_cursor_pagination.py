@@ -0,0 +1,58 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.app.services import products_service
+from backend.app.services.cursor_pagination import decode_cursor, encode_cursor
+from backend.app.services.products_service import DevicesService
+
+
+def test_cursor_round_trip():
+    product = SimpleNamespace(id=42, price=Decimal("5010"), name="Terea Sienna")
+
+    assert decode_cursor(encode_cursor("id_desc", product), "id_desc") == (42,)
+    assert decode_cursor(encode_cursor("price_asc", product), "price_asc") == (Decimal("5010"), 42)
+    assert decode_cursor(encode_cursor("name_desc", product), "name_desc") == ("Terea Sienna", 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30", encode_cursor("id_desc", SimpleNamespace(id=1))])
+def test_invalid_or_foreign_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "price_asc")
+
+
+@pytest.mark.parametrize("filters", [
+    ProductFilters(),
+    ProductFilters(sort="price_desc"),
+    ProductFilters(sort="name_asc", in_stock=True),
+])
+def test_cursor_crawl_visits_every_product_once(fresh_catalog_cache, filters):
+    async def crawl():
+        refs, cursor = [], None
+        while True:
+            response = await DevicesService.get_terea_list(limit=3, filters=filters, cursor=cursor, with_total=False)
+            refs.extend(terea.ref for terea in response.terea)
+            cursor = response.next_cursor
+            if cursor is None:
+                return refs
+
+    full = asyncio.run(DevicesService.get_terea_list(limit=100, filters=filters))
+    crawled = asyncio.run(crawl())
+    assert crawled == [terea.ref for terea in full.terea]
+    assert len(set(crawled)) == full.total
+
+
+def test_filtered_totals_are_bounded(fresh_catalog_cache, monkeypatch):
+    monkeypatch.setattr(products_service, "FILTERED_TOTALS_LIMIT", 2)
+    monkeypatch.setattr(products_service, "_filtered_totals", products_service.OrderedDict())
+
+    for price_min in (5000, 5010, 5020):
+        asyncio.run(DevicesService.get_terea_list(filters=ProductFilters(price_min=Decimal(price_min))))
+
+    assert len(products_service._filtered_totals) == 2
+    assert [key[2] for key in products_service._filtered_totals] == [
+        ProductFilters(price_min=Decimal(price_min)).model_dump_json(exclude={'sort'}) for price_min in (5010, 5020)
+    ]
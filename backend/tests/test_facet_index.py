@@ -0,0 +1,51 @@
+import asyncio
+from decimal import Decimal
+
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.app.services.products_service import DevicesService
+
+
+def _facets(filters: ProductFilters | None = None):
+    response = asyncio.run(DevicesService.get_facets("terea", filters))
+    counts = {
+        facet: {value.value: value.count for value in values}
+        for facet, values in response.facets.items()
+    }
+    return response, counts
+
+
+def test_unfiltered_counts(fresh_catalog_cache):
+    response, counts = _facets()
+
+    assert response.total == 8
+    assert counts["flavor"] == {"Ментол": 4, "Табачный вкус": 2, "Фруктовый вкус": 2, "Экзотические": 2}
+    assert counts["in_stock"] == {"0": 1, "1": 7}
+    assert counts["country"] == {"Армения": 4, "Казахстан": 4}
+    # Категории подписаны названиями из снапшота
+    assert {value.label for value in response.facets["category"]} == {"Армения", "Казахстан"}
+
+
+def test_facet_ignores_its_own_filter(fresh_catalog_cache):
+    response, counts = _facets(ProductFilters(flavor=["Ментол"]))
+
+    assert response.total == 4
+    # Остальные вкусы по-прежнему видны со своими количествами, чтобы их можно было добавить к выбору
+    assert counts["flavor"] == {"Ментол": 4, "Табачный вкус": 2, "Фруктовый вкус": 2, "Экзотические": 2}
+    assert counts["strength"] == {"Крепкие": 1, "Легкие": 2, "Средние": 1}
+    assert counts["in_stock"] == {"0": 0, "1": 4}
+
+
+def test_filters_combine_across_facets(fresh_catalog_cache):
+    response, counts = _facets(ProductFilters(flavor=["Ментол"], strength=["Легкие"]))
+
+    assert response.total == 2
+    assert counts["strength"] == {"Крепкие": 1, "Легкие": 2, "Средние": 1}
+    assert counts["flavor"] == {"Ментол": 2, "Табачный вкус": 0, "Фруктовый вкус": 1, "Экзотические": 1}
+
+
+def test_price_range_and_buckets(fresh_catalog_cache):
+    response, _ = _facets(ProductFilters(price_max=Decimal(5030)))
+
+    assert response.total == 4
+    # Цены 5000..5070 попадают в одну корзину от 5000; её счётчик не зависит от фильтра по цене
+    assert [(bucket.min, bucket.max, bucket.count) for bucket in response.price] == [(Decimal(5000), None, 8)]
@@ -0,0 +1,190 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.cache.idempotency_store import (
+    IdempotencyKeyInProgressError, IdempotencyKeyReusedError, IdempotencyStore
+)
+from backend.app.repositories.idempotency_repository import IdempotencyRepository
+
+
+def _store() -> IdempotencyStore:
+    # Отдельный экземпляр - отдельный воркер: память своя, таблица Idempotency_keys общая
+    return IdempotencyStore(max_entries=100, ttl_seconds=3600, wait_seconds=0.3, abandon_seconds=600)
+
+
+def _operation(calls: list, delay: float = 0, fail: bool = False):
+    async def operation():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("БД недоступна")
+        return 201, f'{{"order": {len(calls)}}}'
+
+    return operation
+
+
+def test_repeated_key_replays_stored_response(sqlite_db):
+    calls = []
+
+    async def scenario():
+        store = _store()
+        first = await store.run("key-1", "fp", _operation(calls))
+        repeat = await store.run("key-1", "fp", _operation(calls))
+        # Другой воркер находит ответ в общей таблице
+        other_worker = await _store().run("key-1", "fp", _operation(calls))
+        return first, repeat, other_worker
+
+    first, repeat, other_worker = asyncio.run(scenario())
+    assert first == (201, '{"order": 1}', False)
+    assert repeat == other_worker == (201, '{"order": 1}', True)
+    assert len(calls) == 1
+
+
+def test_key_reused_for_other_payload_is_rejected(sqlite_db):
+    async def scenario():
+        store = _store()
+        await store.run("key-1", "fp", _operation([]))
+        with pytest.raises(IdempotencyKeyReusedError):
+            await store.run("key-1", "other-fp", _operation([]))
+        with pytest.raises(IdempotencyKeyReusedError):
+            await _store().run("key-1", "other-fp", _operation([]))
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_retry_waits_for_original(sqlite_db):
+    calls = []
+
+    async def scenario():
+        store, other_store = _store(), _store()
+        return await asyncio.gather(
+            store.run("key-1", "fp", _operation(calls, delay=0.1)),
+            store.run("key-1", "fp", _operation(calls)),
+            other_store.run("key-1", "fp", _operation(calls)),
+        )
+
+    results = asyncio.run(scenario())
+    # Ключ захватывает тот воркер, что успел первым; остальные получают его ответ
+    assert sorted(replayed for _, _, replayed in results) == [False, True, True]
+    assert len({(status_code, body) for status_code, body, _ in results}) == 1
+    assert len(calls) == 1
+
+
+def test_slow_pending_key_is_not_taken_over(sqlite_db):
+    # Исходный запрос идёт дольше, чем повтор готов ждать, но ещё не брошен: второй заказ создавать нельзя
+    calls = []
+
+    async def scenario():
+        await IdempotencyRepository.claim("key-1", "fp", datetime.now() - timedelta(seconds=60))
+        with pytest.raises(IdempotencyKeyInProgressError):
+            await _store().run("key-1", "fp", _operation(calls))
+        return await IdempotencyRepository.select_key("key-1")
+
+    row = asyncio.run(scenario())
+    assert calls == []
+    assert row is not None and row.status_code is None
+
+
+def test_abandoned_pending_key_is_taken_over(sqlite_db):
+    calls = []
+
+    async def scenario():
+        await IdempotencyRepository.claim("key-1", "fp", datetime.now() - timedelta(seconds=601))
+        return await _store().run("key-1", "fp", _operation(calls))
+
+    assert asyncio.run(scenario())[2] is False
+    assert len(calls) == 1
+
+
+def test_failed_request_releases_key(sqlite_db):
+    calls = []
+
+    async def scenario():
+        store = _store()
+        with pytest.raises(RuntimeError):
+            await store.run("key-1", "fp", _operation(calls, fail=True))
+        return await store.run("key-1", "fp", _operation(calls))
+
+    assert asyncio.run(scenario()) == (201, '{"order": 2}', False)
+    assert len(calls) == 2
+
+
+def test_abandoned_key_is_taken_over_once(sqlite_db, monkeypatch):
+    # Оба повтора прочитали брошенную строку; второй не должен удалить строку, которую уже захватил первый
+    calls = []
+    select_key = IdempotencyRepository.select_key
+    readers = []
+
+    async def select_key_together(key):
+        row = await select_key(key)
+        readers.append(1)
+        while len(readers) < 2:
+            await asyncio.sleep(0.01)
+        return row
+
+    monkeypatch.setattr(IdempotencyRepository, "select_key", staticmethod(select_key_together))
+
+    async def scenario():
+        await IdempotencyRepository.claim("key-1", "fp", datetime.now().replace(microsecond=0) - timedelta(seconds=601))
+        return await asyncio.gather(
+            _store().run("key-1", "fp", _operation(calls, delay=0.1)),
+            _store().run("key-1", "fp", _operation(calls, delay=0.1)),
+        )
+
+    results = asyncio.run(scenario())
+    assert sorted(replayed for _, _, replayed in results) == [False, True]
+    assert len(calls) == 1
+
+
+def test_failed_complete_is_retried(sqlite_db, monkeypatch):
+    complete = IdempotencyRepository.complete
+    failures = []
+
+    async def flaky_complete(key, status_code, response):
+        if len(failures) < 2:
+            failures.append(1)
+            raise RuntimeError("БД недоступна")
+        await complete(key, status_code, response)
+
+    monkeypatch.setattr(IdempotencyRepository, "complete", staticmethod(flaky_complete))
+
+    async def scenario():
+        result = await _store().run("key-1", "fp", _operation([]))
+        return result, await IdempotencyRepository.select_key("key-1")
+
+    result, row = asyncio.run(scenario())
+    assert result == (201, '{"order": 1}', False)
+    # Ответ сохранён: строка не останется незавершённой и не сочтётся брошенной
+    assert (row.status_code, row.response) == (201, '{"order": 1}')
+
+
+def test_cancelled_retry_propagates_cancellation(sqlite_db):
+    async def scenario():
+        store = _store()
+        original = asyncio.create_task(store.run("key-1", "fp", _operation([], delay=0.2)))
+        await asyncio.sleep(0.05)
+        retry = asyncio.create_task(store.run("key-1", "fp", _operation([])))
+        await asyncio.sleep(0.01)
+        retry.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await retry
+        # Исходный запрос не задет отменой повтора
+        return await original
+
+    assert asyncio.run(scenario())[2] is False
+
+
+def test_cancelled_original_is_in_progress_for_retry(sqlite_db):
+    async def scenario():
+        store = _store()
+        original = asyncio.create_task(store.run("key-1", "fp", _operation([], delay=0.2)))
+        await asyncio.sleep(0.05)
+        retry = asyncio.create_task(store.run("key-1", "fp", _operation([])))
+        await asyncio.sleep(0.01)
+        original.cancel()
+        with pytest.raises(IdempotencyKeyInProgressError):
+            await retry
+
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from backend.app.services.products_service import DevicesService
+from backend.core.models import DevicesModel
+
+
+def test_typed_lookup_by_ref(fresh_catalog_cache):
+    assert asyncio.run(DevicesService.get_device_by_ref("device-2")).device.name == "Крышка 2"
+    assert asyncio.run(DevicesService.get_iqos_by_ref("iqos-1")).iqos.price == Decimal(9500)
+    assert asyncio.run(DevicesService.get_terea_by_ref("terea-4")).terea.name == "Terea Sienna 4"
+
+    # ref другого типа в типизированном эндпоинте не находится
+    with pytest.raises(ValueError, match="не найден"):
+        asyncio.run(DevicesService.get_device_by_ref("terea-4"))
+
+
+def test_lookup_by_ref_across_types(fresh_catalog_cache):
+    located = asyncio.run(DevicesService.get_product_by_ref("iqos-3"))
+    assert (located.type, located.product.ref) == ("iqos", "iqos-3")
+
+    limited = asyncio.run(DevicesService.get_product_by_ref("terea-0", ["terea", "devices"]))
+    assert limited.type == "terea"
+
+    with pytest.raises(ValueError, match="не найден"):
+        asyncio.run(DevicesService.get_product_by_ref("terea-0", ["iqos"]))
+    with pytest.raises(ValueError, match="не найден"):
+        asyncio.run(DevicesService.get_product_by_ref("missing"))
+
+
+def test_ref_is_unique(catalog_db):
+    async def insert_duplicate():
+        async with catalog_db() as session:
+            session.add(DevicesModel(
+                name="Копия", description="", image="", price=Decimal(1), nalichie=1, new=0, hit=0,
+                color="Серый", ref="device-0", type="devices", device_id=1
+            ))
+            await session.commit()
+
+    with pytest.raises(IntegrityError):
+        asyncio.run(insert_duplicate())
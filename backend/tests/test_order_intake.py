@@ -0,0 +1,184 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from backend.app.api.schemas.orders_schemas import OrderCreate
+from backend.app.cache.idempotency_store import IdempotencyKeyReusedError
+from backend.app.repositories.order_journal import MAX_ATTEMPTS, OrderJournal
+from backend.app.repositories.orders_repository import OrderRepository
+from backend.app.services.order_intake import OrderIntake
+from backend.core.models import OrderModel
+
+
+def _order(name: str = "Покупатель") -> OrderCreate:
+    return OrderCreate(
+        customer_name=name, phone_number="+79991234567", is_delivery=False,
+        ordered_items=[{"product_name": "Terea Amber", "quantity": 10, "price_at_time_of_order": "510"}]
+    )
+
+
+def _attempts(journal: OrderJournal) -> dict:
+    return dict(journal._connection.execute("SELECT intake_id, attempts FROM intake").fetchall())
+
+
+@pytest.fixture
+def intake(tmp_path):
+    # Журнал открыт, но фоновые циклы не запущены: выгрузку тесты вызывают сами
+    intake = OrderIntake(path=str(tmp_path / "journal.sqlite3"), batch_size=100, flush_delay=0, idempotency_ttl=3600)
+    intake._journal = OrderJournal(intake._path)
+    yield intake
+    intake._journal.close()
+
+
+@pytest.fixture
+def orders_db(sqlite_db, monkeypatch):
+    # ON DUPLICATE KEY UPDATE есть только в MySQL
+    async def upsert_customer(session, customer_phone, order_data):
+        return True
+
+    monkeypatch.setattr(OrderRepository, "_upsert_customer", staticmethod(upsert_customer))
+    return sqlite_db
+
+
+async def _submitted(intake: OrderIntake, *submits):
+    # Заказы попадают в журнал одной транзакцией, как при паузе цикла записи
+    tasks = [asyncio.create_task(submit) for submit in submits]
+    await asyncio.sleep(0)
+    await intake._flush()
+    return await asyncio.gather(*tasks)
+
+
+def test_journal_replays_idempotency_key(intake):
+    async def scenario():
+        first, same_batch = await _submitted(
+            intake,
+            intake.submit(_order(), "+79991234567", "key-1", "fp"),
+            intake.submit(_order(), "+79991234567", "key-1", "fp"),
+        )
+        later, = await _submitted(intake, intake.submit(_order(), "+79991234567", "key-1", "fp"))
+        return first, same_batch, later
+
+    first, same_batch, later = asyncio.run(scenario())
+    assert first[2] is False
+    assert same_batch == later == (first[0], first[1], True)
+    assert len(intake._journal.pending(10)) == 1
+
+
+def test_journal_rejects_key_reused_for_other_order(intake):
+    async def scenario():
+        await _submitted(intake, intake.submit(_order(), "+79991234567", "key-1", "fp"))
+        with pytest.raises(IdempotencyKeyReusedError):
+            await _submitted(intake, intake.submit(_order("Другой"), "+79991234567", "key-1", "other-fp"))
+
+    asyncio.run(scenario())
+    assert len(intake._journal.pending(10)) == 1
+
+
+def test_purge_removes_expired_keys(intake):
+    payload = _order().model_dump_json()
+    intake._journal.append([("intake-1", payload, "", "2026-01-01T00:00:00", "key-1", "fp")])
+    assert intake._journal.purge_idempotency("2026-01-02T00:00:00") == 1
+    # После очистки ключ можно использовать заново
+    [(_, _, stored_fingerprint)] = intake._journal.append([("intake-2", payload, "", "2026-01-03T00:00:00", "key-1", "fp")])
+    assert stored_fingerprint is None
+
+
+def _append(intake: OrderIntake, count: int) -> None:
+    intake._journal.append([
+        (f"intake-{index}", _order(f"Покупатель {index}").model_dump_json(), "+79991234567",
+         "2026-01-01T00:00:00", None, None)
+        for index in range(count)
+    ])
+
+
+def test_drain_moves_orders_into_database(intake, orders_db):
+    _append(intake, 3)
+
+    async def scenario():
+        drained = await intake._drain()
+        async with orders_db() as session:
+            stored = (await session.execute(
+                select(OrderModel.intake_id, OrderModel.created_at).order_by(OrderModel.id)
+            )).all()
+        return drained, stored
+
+    drained, stored = asyncio.run(scenario())
+    assert drained == 3
+    assert [intake_id for intake_id, _ in stored] == ["intake-0", "intake-1", "intake-2"]
+    # Заказ получает время приёма из журнала, а не время выгрузки
+    assert {created_at for _, created_at in stored} == {datetime(2026, 1, 1)}
+    assert intake._journal.pending(10) == []
+
+
+def test_outage_does_not_charge_attempts(intake, orders_db, monkeypatch):
+    _append(intake, 3)
+
+    async def lost_connection(orders):
+        raise OperationalError("INSERT INTO Orders", {}, Exception("Lost connection to MySQL server"))
+
+    monkeypatch.setattr(OrderRepository, "create_batch", staticmethod(lost_connection))
+    for _ in range(MAX_ATTEMPTS + 1):
+        with pytest.raises(OperationalError):
+            asyncio.run(intake._drain())
+
+    assert _attempts(intake._journal) == {f"intake-{index}": 0 for index in range(3)}
+    assert len(intake._journal.pending(10)) == 3
+
+
+def test_connection_drop_mid_retry_keeps_remaining_records(intake, orders_db, monkeypatch):
+    # Пачку отвергла запись intake-0, а пока писали по одной, соединение оборвалось
+    _append(intake, 3)
+    create_batch = OrderRepository.create_batch
+
+    async def failing_create_batch(orders):
+        if len(orders) > 1 or orders[0][0] == "intake-0":
+            raise IntegrityError("INSERT INTO Orders", {}, Exception("Duplicate entry"))
+        if orders[0][0] == "intake-2":
+            raise OperationalError("INSERT INTO Orders", {}, Exception("Lost connection to MySQL server"))
+        return await create_batch(orders)
+
+    monkeypatch.setattr(OrderRepository, "create_batch", staticmethod(failing_create_batch))
+    with pytest.raises(OperationalError):
+        asyncio.run(intake._drain())
+
+    # intake-0 получила попытку за свои данные, intake-1 записана, intake-2 ждёт без штрафа
+    assert _attempts(intake._journal) == {"intake-0": 1, "intake-2": 0}
+
+
+def test_invalid_payload_is_parked(intake, orders_db):
+    _append(intake, 1)
+    intake._journal.append([("intake-broken", '{"customer_name": ""}', "", "2026-01-01T00:00:00", None, None)])
+
+    drained = asyncio.run(intake._drain())
+    assert drained == 2
+    assert _attempts(intake._journal) == {"intake-broken": MAX_ATTEMPTS}
+    assert intake._journal.pending(10) == []
+
+
+def test_stop_answers_submit_interrupted_mid_flush(tmp_path, orders_db, monkeypatch):
+    append = OrderJournal.append
+    appending = []
+
+    def slow_append(journal, rows):
+        appending.append(len(rows))
+        time.sleep(0.2)
+        return append(journal, rows)
+
+    monkeypatch.setattr(OrderJournal, "append", slow_append)
+    intake = OrderIntake(path=str(tmp_path / "journal.sqlite3"), batch_size=100, flush_delay=0, idempotency_ttl=3600)
+
+    async def scenario():
+        await intake.start()
+        submit = asyncio.create_task(intake.submit(_order(), "+79991234567"))
+        while not appending:
+            await asyncio.sleep(0.01)
+        # Остановка приходит, пока пачка пишется в журнал
+        await intake.stop()
+        return await asyncio.wait_for(submit, 1)
+
+    intake_id, seq, replayed = asyncio.run(scenario())
+    assert seq >= 1 and replayed is False
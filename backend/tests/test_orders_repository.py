@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+
+from backend.app.api.schemas.orders_schemas import OrderCreate
+from backend.app.repositories.orders_repository import OrderRepository
+from backend.core.db_helper import db_helper
+from backend.core.models import OrderModel, OrderedProductModel
+
+
+@pytest.fixture
+def orders_db(sqlite_db, monkeypatch):
+    # ON DUPLICATE KEY UPDATE есть только в MySQL, счётчики покупателя здесь не проверяются
+    async def upsert_customer(session, customer_phone, order_data):
+        return True
+
+    monkeypatch.setattr(OrderRepository, "_upsert_customer", staticmethod(upsert_customer))
+    return sqlite_db
+
+
+def _order(index: int, items: int) -> dict:
+    return OrderCreate(
+        customer_name=f"Покупатель {index}", phone_number=f"+7999000000{index}", is_delivery=False,
+        ordered_items=[
+            {"product_name": f"Terea {index}-{item}", "quantity": item + 1, "price_at_time_of_order": "510"}
+            for item in range(items)
+        ]
+    ).model_dump()
+
+
+async def _stored(session_factory):
+    async with session_factory() as session:
+        orders = (await session.execute(select(OrderModel.intake_id, OrderModel.id, OrderModel.created_at))).all()
+        items = (await session.execute(
+            select(OrderedProductModel.id, OrderedProductModel.order_id, OrderedProductModel.product_name)
+        )).all()
+    return {intake_id: (order_id, created_at) for intake_id, order_id, created_at in orders}, items
+
+
+def _assert_batch_matches_db(order_ids, stored_orders, stored_items):
+    assert order_ids == {intake_id: order_id for intake_id, (order_id, _) in stored_orders.items()}
+    for order_id, item_order_id, product_name in stored_items:
+        assert item_order_id == order_ids[f"intake-{product_name.split()[1].split('-')[0]}"]
+
+
+def test_batch_ids_from_returning(orders_db):
+    async def scenario():
+        order_ids = await OrderRepository.create_batch([
+            (f"intake-{index}", _order(index, items=2), f"+7999000000{index}") for index in range(3)
+        ])
+        return order_ids, *await _stored(orders_db)
+
+    order_ids, stored_orders, stored_items = asyncio.run(scenario())
+    assert len(order_ids) == 3
+    assert len(stored_items) == 6
+    _assert_batch_matches_db(order_ids, stored_orders, stored_items)
+
+
+def test_ids_read_back_when_autoinc_is_interleaved(orders_db, monkeypatch):
+    # Как MySQL в режиме innodb_autoinc_lock_mode = 2: ни RETURNING, ни арифметики от LAST_INSERT_ID()
+    async def interleaved(session):
+        return False
+
+    monkeypatch.setattr(db_helper.engine.dialect, "insert_returning", False)
+    monkeypatch.setattr(OrderRepository, "_ids_are_consecutive", staticmethod(interleaved))
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    async def scenario():
+        single = await OrderRepository.create(_order(9, items=3), "+79990000009")
+        event.listen(db_helper.engine.sync_engine, "before_cursor_execute", record)
+        try:
+            order_ids = await OrderRepository.create_batch([
+                (f"intake-{index}", _order(index, items=index + 1), f"+7999000000{index}") for index in range(3)
+            ])
+        finally:
+            event.remove(db_helper.engine.sync_engine, "before_cursor_execute", record)
+        async with orders_db() as session:
+            single_items = (await session.execute(
+                select(OrderedProductModel.id, OrderedProductModel.product_name)
+                .where(OrderedProductModel.order_id == single.id)
+                .order_by(OrderedProductModel.id)
+            )).all()
+        return single, single_items, order_ids, *await _stored(orders_db)
+
+    single, single_items, order_ids, stored_orders, stored_items = asyncio.run(scenario())
+    assert [(item.id, item.product_name) for item in single.ordered_items] == [tuple(row) for row in single_items]
+    assert len(stored_items) == 3 + 1 + 2 + 3
+    # Проверка уже записанных intake_id, две вставки и одно чтение id заказов вместе с позициями
+    assert statements == ["SELECT", "INSERT", "INSERT", "SELECT"]
+    _assert_batch_matches_db(
+        order_ids, {key: value for key, value in stored_orders.items() if key is not None},
+        [item for item in stored_items if item[1] != single.id]
+    )
+
+
+def test_created_at_is_set_in_utc(orders_db):
+    async def scenario():
+        before = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        order = await OrderRepository.create(_order(1, items=1), "+79990000001")
+        journaled = await OrderRepository.create_batch([
+            ("intake-1", {**_order(2, items=1), "created_at": datetime(2026, 1, 1, 12, 30, 15, 250000)}, "+79990000002")
+        ])
+        stored_orders, _ = await _stored(orders_db)
+        return before, order, journaled, stored_orders
+
+    before, order, journaled, stored_orders = asyncio.run(scenario())
+    stored_id, stored_created_at = stored_orders[None]
+    assert order.id == stored_id
+    assert order.created_at == stored_created_at
+    assert before <= order.created_at <= datetime.now(timezone.utc).replace(tzinfo=None)
+    assert order.total_amount == Decimal("510")
+    # Заказ из журнала сохраняет время приёма, а не время выгрузки
+    assert stored_orders["intake-1"] == (journaled["intake-1"], datetime(2026, 1, 1, 12, 30, 15))
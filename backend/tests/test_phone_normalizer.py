@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from backend.app.api.schemas.orders_schemas import OrderCreate
+from backend.app.repositories.orders_repository import OrderRepository
+from backend.app.services.phone_normalizer import normalize_phone
+from backend.core.models import OrderModel
+
+
+@pytest.mark.parametrize("phone_number", [
+    "+79991234567", "+7 999 123-45-67", "8 (999) 123-45-67", "89991234567", "9991234567", "7 999 123 45 67",
+])
+def test_local_formats_map_to_e164(phone_number):
+    assert normalize_phone(phone_number) == "+79991234567"
+
+
+def test_foreign_number_keeps_country_code():
+    assert normalize_phone("+375 29 123-45-67") == "+375291234567"
+
+
+@pytest.mark.parametrize("phone_number", ["123-45-67", "+0 999 123 45 67", "+7999123456789012", "телефон"])
+def test_unparseable_number_is_none(phone_number):
+    assert normalize_phone(phone_number) is None
+
+
+def test_unparseable_phone_skips_customer(sqlite_db, monkeypatch):
+    customers = []
+
+    async def upsert_customer(session, customer_phone, order_data):
+        customers.append(customer_phone)
+        return True
+
+    monkeypatch.setattr(OrderRepository, "_upsert_customer", staticmethod(upsert_customer))
+
+    def order(phone_number: str) -> dict:
+        return OrderCreate(customer_name="Покупатель", phone_number=phone_number, is_delivery=False).model_dump()
+
+    async def scenario():
+        first = await OrderRepository.create(order("доб. 123-45-67"), None)
+        repeat = await OrderRepository.create(order("доб. 123-45-67"), None)
+        batch = await OrderRepository.create_batch([
+            ("intake-1", order("доб. 765-43-21"), None),
+            ("intake-2", order("доб. 765-43-21"), None),
+        ])
+        async with sqlite_db() as session:
+            batch_first = (await session.execute(
+                select(OrderModel.intake_id, OrderModel.is_first_order).where(OrderModel.intake_id.is_not(None))
+            )).all()
+        return first, repeat, dict(batch_first)
+
+    first, repeat, batch = asyncio.run(scenario())
+    assert customers == []
+    assert first.phone_number == "доб. 123-45-67"
+    assert first.is_first_order and not repeat.is_first_order
+    # Повтор номера внутри одной пачки тоже не первый заказ
+    assert batch == {"intake-1": True, "intake-2": False}
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.core.pool_monitor import Histogram, MonitoredQueuePool, PoolMonitor
+
+
+def _monitored_engine(path, **pool_options):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=MonitoredQueuePool, **pool_options)
+    return engine, PoolMonitor(engine)
+
+
+def test_histogram_buckets():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 3, 50):
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {"count": 4, "sum": 54.5, "max": 50, "buckets": {"1": 2, "10": 1, "+Inf": 1}}
+
+
+def test_warm_and_refresh_idle(tmp_path):
+    engine, monitor = _monitored_engine(tmp_path / "pool.sqlite3", pool_size=3, max_overflow=0)
+
+    async def scenario():
+        try:
+            await monitor.warm(3)
+            warmed = monitor.stats()
+            refreshed = await monitor.refresh_idle()
+            return warmed, refreshed, monitor.stats()
+        finally:
+            await engine.dispose()
+
+    warmed, refreshed, stats = asyncio.run(scenario())
+    assert (warmed["connects"], warmed["checked_in"], warmed["peak_checked_out"]) == (3, 3, 3)
+    assert warmed["checkout_wait_ms"]["count"] == 3
+    # Обновление прогоняет свободные соединения по одному, новых не открывает
+    assert refreshed == 3
+    assert (stats["checkouts"], stats["connects"], stats["peak_checked_out"]) == (6, 3, 3)
+    assert stats["connection_age_s"]["count"] == 3
+
+
+def test_timeouts_and_invalidations_are_counted(tmp_path):
+    engine, monitor = _monitored_engine(tmp_path / "pool.sqlite3", pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+    async def scenario():
+        try:
+            async with engine.connect() as connection:
+                with pytest.raises(PoolTimeoutError):
+                    async with engine.connect():
+                        pass
+                await connection.invalidate()
+
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+            return monitor.stats()
+        finally:
+            await engine.dispose()
+
+    stats = asyncio.run(scenario())
+    assert stats["timeouts"] == 1
+    assert stats["invalidations"] == 1
+    # Вместо сброшенного соединения пул открыл новое
+    assert stats["connects"] == 2
+    assert stats["connection_age_s"]["count"] == 1
@@ -0,0 +1,48 @@
+import asyncio
+from decimal import Decimal
+
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.app.services.products_service import DevicesService
+from backend.core.models import TereaCategoryModel, TereaModel
+
+
+def test_filters_are_applied_in_database(fresh_catalog_cache):
+    filters = ProductFilters(price_min=Decimal(5020), in_stock=True, flavor=["Ментол"], sort="price_asc")
+    response = asyncio.run(DevicesService.get_terea_list(filters=filters))
+
+    # Ментол есть у terea-0, 2, 4, 6; terea-0 дешевле 5020
+    assert [terea.ref for terea in response.terea] == ["terea-2", "terea-4", "terea-6"]
+    assert response.total == 3
+
+
+def test_category_only_filter_is_served_from_snapshot(fresh_catalog_cache):
+    snapshot = asyncio.run(fresh_catalog_cache.get_snapshot())
+    category_id = next(iter(snapshot.terea_categories))
+    response = asyncio.run(DevicesService.get_terea_list(filters=ProductFilters(category_id=category_id)))
+
+    assert {terea.category.id for terea in response.terea} == {category_id}
+    assert response.total == len(snapshot.by_category["terea"][category_id])
+
+
+def test_category_newer_than_snapshot_is_resolved(fresh_catalog_cache, catalog_db):
+    async def scenario():
+        stale = await fresh_catalog_cache.get_snapshot()
+        async with catalog_db() as session:
+            category = TereaCategoryModel(category_name="Япония")
+            session.add(category)
+            await session.flush()
+            session.add(TereaModel(
+                name="Terea Japan Smooth", description="Новинка", image="/img/j.webp", imagePack=None,
+                price=Decimal(7000), pricePack=None, has_capsule=0, flavor={"Табачный вкус"}, country="Япония",
+                brend="Terea", strength="Средние", nalichie=1, new=1, hit=0, ref="terea-japan", type="terea",
+                terea_id=category.id
+            ))
+            await session.commit()
+
+        response = await DevicesService.get_terea_list(filters=ProductFilters(price_min=Decimal(6000)))
+        return stale, response
+
+    stale, response = asyncio.run(scenario())
+    assert [terea.ref for terea in response.terea] == ["terea-japan"]
+    assert response.terea[0].category.category_name == "Япония"
+    assert fresh_catalog_cache.snapshot.version == stale.version + 1
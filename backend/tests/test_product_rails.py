@@ -0,0 +1,42 @@
+import asyncio
+from decimal import Decimal
+
+from backend.app.services.products_service import DevicesService
+from backend.core.models import OrderModel, OrderedProductModel
+
+
+def _sell(session_factory, sales: dict) -> None:
+    async def insert_order():
+        async with session_factory() as session:
+            session.add(OrderModel(
+                is_first_order=1, customer_name="Покупатель", phone_number="+79991234567", is_delivery=0,
+                total_amount=Decimal(0),
+                ordered_items=[
+                    OrderedProductModel(product_name=name, quantity=quantity, price_at_time_of_order=Decimal(0))
+                    for name, quantity in sales.items()
+                ]
+            ))
+            await session.commit()
+
+    asyncio.run(insert_order())
+
+
+def test_best_sellers_rank_sales_then_hits(fresh_catalog_cache, catalog_db):
+    # Terea Sienna 3 продаётся лучше всех, но её нет в наличии
+    _sell(catalog_db, {"Terea Sienna 5": 10, "IQOS Iluma One 2": 3, "Terea Sienna 3": 50})
+
+    response = asyncio.run(DevicesService.get_best_sellers(limit=48))
+    assert [product.product.ref for product in response.products] == [
+        "terea-5", "iqos-2",
+        "iqos-3", "device-3", "terea-2", "terea-1", "iqos-1", "device-1", "terea-0",
+    ]
+
+
+def test_new_arrivals_in_stock_newest_first(fresh_catalog_cache):
+    response = asyncio.run(DevicesService.get_new_products(limit=48))
+    assert [product.product.ref for product in response.products] == [
+        "terea-7", "terea-5", "iqos-4", "iqos-3", "device-3", "iqos-2", "terea-1", "iqos-1", "iqos-0",
+    ]
+
+    limited = asyncio.run(DevicesService.get_new_products(limit=3))
+    assert [product.product.ref for product in limited.products] == ["terea-7", "terea-5", "iqos-4"]
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from backend.app.api.schemas import GetProductsBatchRequest
+from backend.app.api.schemas.all_products_schemas import PRODUCTS_BATCH_LIMIT
+from backend.app.services.products_service import DevicesService
+
+
+def test_batch_resolves_refs_and_type_id_pairs(fresh_catalog_cache):
+    response = asyncio.run(DevicesService.get_products_batch(GetProductsBatchRequest(
+        refs=["terea-1", "iqos-0", "terea-1", "missing"],
+        items=[{"type": "devices", "id": 2}, {"type": "iqos", "id": 999}]
+    )))
+
+    assert list(response.products) == ["terea-1", "iqos-0", "devices:2"]
+    assert (response.products["terea-1"].type, response.products["terea-1"].product.ref) == ("terea", "terea-1")
+    assert response.products["devices:2"].product.id == 2
+    assert response.missing_refs == ["missing"]
+    assert [(item.type, item.id) for item in response.missing_items] == [("iqos", 999)]
+
+
+@pytest.mark.parametrize("batch", [
+    GetProductsBatchRequest(),
+    GetProductsBatchRequest.model_construct(refs=[f"terea-{i}" for i in range(PRODUCTS_BATCH_LIMIT + 1)], items=[]),
+])
+def test_empty_or_oversized_batch_is_rejected(fresh_catalog_cache, batch):
+    with pytest.raises(ValueError):
+        asyncio.run(DevicesService.get_products_batch(batch))
@@ -0,0 +1,82 @@
+import asyncio
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select, update
+
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.app.repositories.products_repository import ProductsRepository
+from backend.app.services.products_service import DevicesService
+from backend.core.models import ProductModel, TereaModel
+
+
+async def _rows(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(ProductModel.type, ProductModel.ref, ProductModel.name))
+        return {(product_type, ref): name for product_type, ref, name in result.all()}
+
+
+def test_rebuild_fills_products_from_all_sources(catalog_db):
+    asyncio.run(ProductsRepository.rebuild())
+    rows = asyncio.run(_rows(catalog_db))
+
+    assert len(rows) == 18
+    assert rows[("terea", "terea-0")] == "Terea Sienna 0"
+    assert rows[("iqos", "iqos-4")] == "IQOS Iluma One 4"
+
+
+def test_rebuild_repairs_missed_syncs(catalog_db):
+    async def scenario():
+        await ProductsRepository.rebuild()
+        async with catalog_db() as session:
+            # Правка мимо админки: витрина о ней не знает
+            await session.execute(update(TereaModel).where(TereaModel.ref == "terea-0").values(name="Terea Amber"))
+            await session.execute(delete(TereaModel).where(TereaModel.ref == "terea-1"))
+            await session.execute(delete(ProductModel).where(ProductModel.ref == "iqos-2"))
+            await session.commit()
+        await ProductsRepository.rebuild()
+        return await _rows(catalog_db)
+
+    rows = asyncio.run(scenario())
+    assert rows[("terea", "terea-0")] == "Terea Amber"
+    assert ("terea", "terea-1") not in rows
+    assert ("iqos", "iqos-2") in rows
+    assert len(rows) == 17
+
+
+def test_sync_product_refreshes_single_row(catalog_db):
+    async def scenario():
+        await ProductsRepository.rebuild()
+        async with catalog_db() as session:
+            await session.execute(update(TereaModel).where(TereaModel.ref == "terea-2").values(price=Decimal(4000)))
+            terea_id = (await session.execute(select(TereaModel.id).where(TereaModel.ref == "terea-2"))).scalar_one()
+            await session.commit()
+        await ProductsRepository.sync_product("terea", terea_id)
+        async with catalog_db() as session:
+            return (await session.execute(
+                select(ProductModel.price).where(ProductModel.ref == "terea-2")
+            )).scalar_one()
+
+    assert asyncio.run(scenario()) == Decimal(4000)
+
+
+def test_snapshot_load_reconciles_products(fresh_catalog_cache, catalog_db):
+    async def scenario():
+        await fresh_catalog_cache.reload()
+        await fresh_catalog_cache._reconcile_task
+        async with catalog_db() as session:
+            return (await session.execute(select(func.count()).select_from(ProductModel))).scalar_one()
+
+    assert asyncio.run(scenario()) == 18
+
+
+def test_products_list_across_types(catalog_db):
+    asyncio.run(ProductsRepository.rebuild())
+    response = asyncio.run(DevicesService.get_products_list(
+        limit=4, filters=ProductFilters(price_min=Decimal(5000), sort="price_desc"), product_types=["terea", "iqos"]
+    ))
+
+    assert [(row.type, row.ref) for row in response.products] == [
+        ("iqos", "iqos-4"), ("iqos", "iqos-3"), ("iqos", "iqos-2"), ("iqos", "iqos-1")
+    ]
+    assert response.total == 13
+    assert response.next_cursor is not None
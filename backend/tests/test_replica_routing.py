@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from backend.core import db_helper as db_helper_module
+from backend.core.db_helper import DatabaseHelper
+
+
+@pytest.fixture
+def helper(tmp_path):
+    helper = DatabaseHelper(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.sqlite3'}",
+        replica_urls=[
+            f"sqlite+aiosqlite:///{tmp_path / 'replica-1.sqlite3'}",
+            f"sqlite+aiosqlite:///{tmp_path / 'replica-2.sqlite3'}",
+        ],
+        replica_max_lag=5.0,
+        replica_check_interval=5.0,
+        pool_warmup=0,
+    )
+    yield helper
+    asyncio.run(helper.dispose())
+
+
+def _read_bind(helper: DatabaseHelper):
+    return helper.read_session_factory().bind
+
+
+def _check_replicas(helper: DatabaseHelper):
+    # Соединения пула привязаны к event loop, поэтому закрываем их в том же asyncio.run
+    async def scenario():
+        try:
+            return await helper.check_replicas()
+        finally:
+            await helper.dispose()
+
+    return asyncio.run(scenario())
+
+
+def test_reads_round_robin_over_healthy_replicas(helper):
+    binds = [_read_bind(helper) for _ in range(4)]
+    assert binds == [*helper.replica_engines, *helper.replica_engines]
+
+
+def test_without_healthy_replicas_reads_go_to_primary(helper):
+    helper._healthy_replicas = []
+    assert _read_bind(helper) is helper.engine
+
+
+def test_read_your_writes_window(helper, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(db_helper_module.time, "monotonic", lambda: now[0])
+
+    helper.mark_written()
+    assert _read_bind(helper) is helper.engine
+
+    # Окно - допустимое отставание плюс интервал проверки реплик
+    now[0] += helper.replica_max_lag + helper.replica_check_interval - 0.1
+    assert _read_bind(helper) is helper.engine
+    now[0] += 0.2
+    assert _read_bind(helper) in helper.replica_engines
+
+
+def test_reading_primary_scope(helper):
+    with helper.reading_primary():
+        assert _read_bind(helper) is helper.engine
+    assert _read_bind(helper) in helper.replica_engines
+
+
+def test_lagging_replica_is_excluded(helper, monkeypatch):
+    lagging = helper.replica_engines[0].url.database
+    real_lag = DatabaseHelper._replica_lag
+
+    async def fake_lag(connection):
+        await real_lag(connection)
+        return 30.0 if connection.engine.url.database == lagging else 1.0
+
+    monkeypatch.setattr(DatabaseHelper, "_replica_lag", staticmethod(fake_lag))
+    assert _check_replicas(helper) == [1]
+    assert {_read_bind(helper) for _ in range(3)} == {helper.replica_engines[1]}
+    assert helper.pool_stats()["replica-0"]["healthy"] is False
+
+
+def test_stopped_or_unreachable_replica_is_excluded(helper, monkeypatch):
+    stopped = helper.replica_engines[0].url.database
+
+    async def lag(connection):
+        if connection.engine.url.database == stopped:
+            return None
+        raise ConnectionRefusedError("replica is down")
+
+    monkeypatch.setattr(DatabaseHelper, "_replica_lag", staticmethod(lag))
+    assert _check_replicas(helper) == []
+    assert _read_bind(helper) is helper.engine
+
+
+def test_catalog_snapshot_is_built_from_primary(fresh_catalog_cache, tmp_path, monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from backend.app.repositories.products_repository import DevicesRepository
+    from backend.core.models import BaseModel
+    from conftest import create_sqlite_engine
+
+    # Пустая реплика, которая ещё не получила каталог
+    replica = create_sqlite_engine(tmp_path / "replica.sqlite3")
+    monkeypatch.setattr(db_helper_module.db_helper, "replica_engines", [replica])
+    monkeypatch.setattr(db_helper_module.db_helper, "replica_session_factories", [async_sessionmaker(bind=replica)])
+    monkeypatch.setattr(db_helper_module.db_helper, "_healthy_replicas", [0])
+
+    async def scenario():
+        async with replica.begin() as connection:
+            await connection.run_sync(BaseModel.metadata.create_all)
+        replica_terea = (await DevicesRepository.select_catalog())[2]
+        snapshot = await fresh_catalog_cache.reload()
+        await replica.dispose()
+        return replica_terea, snapshot
+
+    replica_terea, snapshot = asyncio.run(scenario())
+    assert replica_terea == []
+    assert len(snapshot.terea) == 8
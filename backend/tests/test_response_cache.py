@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from backend.app.cache import response_cache as response_cache_module
+from backend.app.cache.response_cache import ResponseCache
+
+
+class Body(BaseModel):
+    value: str
+
+
+class FakeCatalogCache:
+    def __init__(self, version: int, fingerprint: str):
+        self.snapshot = SimpleNamespace(version=version, fingerprint=fingerprint)
+
+    async def get_snapshot(self):
+        return self.snapshot
+
+
+def make_request(path: str = "/api/terea", query: str = "limit=10", headers: dict | None = None) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    })
+
+
+def get(cache: ResponseCache, request: Request, builds: list, value: str = "terea"):
+    async def build():
+        builds.append(1)
+        return Body(value=value)
+
+    return asyncio.run(cache.get_or_build(request, build))
+
+
+def test_etag_revalidation_returns_304(monkeypatch):
+    monkeypatch.setattr(response_cache_module, "catalog_cache", FakeCatalogCache(1, "fingerprint-1"))
+    cache, builds = ResponseCache(max_entries=8), []
+
+    first = get(cache, make_request(), builds)
+    assert first.status_code == 200
+    assert "last-modified" not in first.headers
+    etag = first.headers["etag"]
+
+    revalidated = get(cache, make_request(headers={"If-None-Match": f'W/{etag}'}), builds)
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert len(builds) == 1
+
+
+def test_wildcard_if_none_match_requires_existing_resource(monkeypatch):
+    monkeypatch.setattr(response_cache_module, "catalog_cache", FakeCatalogCache(1, "fingerprint-1"))
+    cache = ResponseCache(max_entries=8)
+
+    async def missing():
+        raise ValueError("Продукт не найден")
+
+    # Отсутствующий продукт не превращается в 304: ошибка доходит до обработчика и становится 404
+    with pytest.raises(ValueError, match="не найден"):
+        asyncio.run(cache.get_or_build(make_request("/api/by-ref/missing", "", {"If-None-Match": "*"}), missing))
+
+    builds = []
+    existing = get(cache, make_request(headers={"If-None-Match": "*"}), builds)
+    assert existing.status_code == 304
+    assert len(builds) == 1
+
+
+def test_if_modified_since_alone_does_not_revalidate(monkeypatch):
+    monkeypatch.setattr(response_cache_module, "catalog_cache", FakeCatalogCache(1, "fingerprint-1"))
+    response = get(ResponseCache(max_entries=8), make_request(headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}), [])
+    assert response.status_code == 200
+
+
+def test_etag_depends_on_content_not_on_worker(monkeypatch):
+    # Два воркера с разными номерами версий, но одинаковым каталогом, отдают один ETag
+    monkeypatch.setattr(response_cache_module, "catalog_cache", FakeCatalogCache(3, "fingerprint-1"))
+    first_worker = get(ResponseCache(max_entries=8), make_request(), [])
+    monkeypatch.setattr(response_cache_module, "catalog_cache", FakeCatalogCache(7, "fingerprint-1"))
+    second_worker = get(ResponseCache(max_entries=8), make_request(), [])
+    assert first_worker.headers["etag"] == second_worker.headers["etag"]
+
+    monkeypatch.setattr(response_cache_module, "catalog_cache", FakeCatalogCache(8, "fingerprint-2"))
+    changed = get(ResponseCache(max_entries=8), make_request(headers={"If-None-Match": first_worker.headers["etag"]}), [])
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first_worker.headers["etag"]
+
+
+def test_bodies_are_cached_per_snapshot_version(monkeypatch):
+    catalog = FakeCatalogCache(1, "fingerprint-1")
+    monkeypatch.setattr(response_cache_module, "catalog_cache", catalog)
+    cache, builds = ResponseCache(max_entries=8), []
+
+    assert get(cache, make_request(), builds).body == b'{"value":"terea"}'
+    get(cache, make_request(), builds)
+    get(cache, make_request(query="limit=20"), builds)
+    assert len(builds) == 2
+
+    catalog.snapshot = SimpleNamespace(version=2, fingerprint="fingerprint-2")
+    assert get(cache, make_request(), builds, value="changed").body == b'{"value":"changed"}'
+    assert len(builds) == 3
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    monkeypatch.setattr(response_cache_module, "catalog_cache", FakeCatalogCache(1, "fingerprint-1"))
+    cache, builds = ResponseCache(max_entries=2), []
+
+    for query in ("page=1", "page=2", "page=1", "page=3", "page=1", "page=2"):
+        get(cache, make_request(query=query), builds)
+    # page=2 вытеснена при добавлении page=3 и строится заново
+    assert len(builds) == 4
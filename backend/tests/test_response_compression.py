@@ -0,0 +1,79 @@
+import asyncio
+import gzip
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from backend.app.cache import response_cache as response_cache_module
+from backend.app.cache.response_cache import MIN_COMPRESS_SIZE, ResponseCache, negotiate_encoding
+
+
+class Body(BaseModel):
+    value: str
+
+
+class FakeCatalogCache:
+    snapshot = SimpleNamespace(version=1, fingerprint="fingerprint-1")
+
+    async def get_snapshot(self):
+        return self.snapshot
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    # Настоящий brotli может быть не установлен; для согласования важен только набор кодировок
+    compressors = {**response_cache_module.COMPRESSORS, "br": lambda body: b"br:" + body}
+    monkeypatch.setattr(response_cache_module, "COMPRESSORS", compressors)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, "identity"),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("*", "br"),
+    ("identity, gzip;q=0", "identity"),
+    ("br;q=0, gzip;q=0", "identity"),
+])
+def test_negotiate_encoding(with_brotli, accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, MIN_COMPRESS_SIZE) == expected
+
+
+def test_small_bodies_are_not_compressed():
+    assert negotiate_encoding("gzip", MIN_COMPRESS_SIZE - 1) == "identity"
+
+
+def test_gzip_variant_is_built_once_and_has_own_etag(monkeypatch):
+    monkeypatch.setattr(response_cache_module, "catalog_cache", FakeCatalogCache())
+    calls = []
+    gzip_compress = response_cache_module.COMPRESSORS["gzip"]
+
+    def counting_gzip(body: bytes) -> bytes:
+        calls.append(1)
+        return gzip_compress(body)
+
+    monkeypatch.setitem(response_cache_module.COMPRESSORS, "gzip", counting_gzip)
+    cache = ResponseCache(max_entries=8)
+    value = "terea " * MIN_COMPRESS_SIZE
+
+    def get(accept_encoding: str):
+        async def build():
+            return Body(value=value)
+
+        request = Request({
+            "type": "http", "method": "GET", "path": "/api/terea", "query_string": b"",
+            "headers": [(b"accept-encoding", accept_encoding.encode())],
+        })
+        return asyncio.run(cache.get_or_build(request, build))
+
+    plain = get("identity")
+    compressed = get("gzip")
+    get("gzip")
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(compressed.body) == plain.body
+    assert compressed.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert len(calls) == 1
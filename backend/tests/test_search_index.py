@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.cache.russian_stemmer import stem
+from backend.app.cache.search_index import SearchIndex, normalize, terms
+from backend.app.services.products_service import DevicesService
+
+
+@pytest.mark.parametrize("word, expected", [
+    # Эталон - Snowball Russian (NLTK SnowballStemmer("russian"))
+    ("ментоловые", "ментолов"),
+    ("ментоловый", "ментолов"),
+    ("крепкие", "крепк"),
+    ("табачного", "табачн"),
+    ("нагревателя", "нагревател"),
+    ("стиков", "стик"),
+    ("iluma", "iluma"),
+])
+def test_stem_matches_snowball(word, expected):
+    assert stem(word) == expected
+
+
+def test_normalize_folds_case_and_yo():
+    assert normalize("Зелёный IQOS-Iluma") == ["зеленый", "iqos", "iluma"]
+    assert terms("Крепкие стики") == ["крепк", "стик"]
+
+
+def product(product_id: int, name: str, description: str = "", **fields):
+    return SimpleNamespace(id=product_id, name=name, description=description, **fields)
+
+
+def test_name_match_ranks_above_description_match():
+    index = SearchIndex([
+        ("terea", product(1, "Terea Amber", "ментоловые нотки в послевкусии")),
+        ("terea", product(2, "Terea Ментоловый")),
+    ])
+    assert index.search("ментоловая") == [("terea", 2), ("terea", 1)]
+
+
+def test_documents_matching_more_words_come_first():
+    index = SearchIndex([
+        ("terea", product(1, "Terea Sienna", "табачный")),
+        ("terea", product(2, "Terea Ментол", "табачный")),
+        ("iqos", product(3, "IQOS Iluma Ментол")),
+    ])
+    assert index.search("ментол табачный") == [("terea", 2), ("iqos", 3), ("terea", 1)]
+    assert index.search("ментол табачный", product_types=["iqos"]) == [("iqos", 3)]
+
+
+def test_prefix_and_typo_fallback():
+    index = SearchIndex([
+        ("iqos", product(1, "IQOS Iluma Prime")),
+        ("terea", product(2, "Terea Sienna")),
+    ])
+    assert index.search("ilu") == [("iqos", 1)]
+    assert index.search("sienan") == [("terea", 2)]
+    assert index.search("xyz") == []
+
+
+def test_rebuild_reanalyses_only_changed_products():
+    unchanged, changed = product(1, "Terea Sienna"), product(2, "Terea Amber")
+    previous = SearchIndex([("terea", unchanged), ("terea", changed)])
+    rebuilt = SearchIndex([("terea", unchanged), ("terea", product(2, "Terea Ментол"))], previous)
+
+    assert rebuilt._term_weights[("terea", 1)][1] is previous._term_weights[("terea", 1)][1]
+    assert rebuilt._term_weights[("terea", 2)][1] is not previous._term_weights[("terea", 2)][1]
+    assert rebuilt.search("amber") == []
+    assert rebuilt.search("ментол") == [("terea", 2)]
+
+
+def test_search_endpoint_over_snapshot(fresh_catalog_cache):
+    response = asyncio.run(DevicesService.search_products("нагреватели iluma"))
+    # Оба слова есть только у iqos (нагреватель в описании), крышки для Iluma идут следом
+    assert [item.type for item in response.products] == ["iqos"] * 5 + ["devices"] * 5
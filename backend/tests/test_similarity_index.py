@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from backend.app.cache.similarity_index import SCORES, SimilarityIndex
+from backend.app.services.products_service import DevicesService
+
+
+def brute_force(product_type, products, product, top_k):
+    scored = sorted(
+        ((SCORES[product_type](product, other) + (0.5 if other.nalichie else 0.0), other.id)
+         for other in products if other.id != product.id),
+        reverse=True
+    )
+    return tuple(other_id for _, other_id in scored[:top_k])
+
+
+@pytest.mark.parametrize("product_type", ["terea", "iqos", "devices"])
+def test_index_matches_full_ranking(fresh_catalog_cache, product_type):
+    products = asyncio.run(fresh_catalog_cache.get_snapshot()).get_products(product_type)
+    index = SimilarityIndex(product_type, products, top_k=3)
+
+    for product in products:
+        assert index.get(product.id) == brute_force(product_type, products, product, 3)
+
+
+def test_similar_are_precomputed_and_unknown_ids_are_none(fresh_catalog_cache):
+    products = asyncio.run(fresh_catalog_cache.get_snapshot()).terea
+    index = SimilarityIndex("terea", products, top_k=3)
+
+    # Все списки готовы после сборки и не меняются при запросах
+    assert set(index._similar) == {product.id for product in products}
+    assert index.get(products[0].id) is index.get(products[0].id)
+    assert index.get(-1) is None
+    with pytest.raises(TypeError):
+        index._similar[-1] = ()
+
+
+def test_terea_neighbours_share_flavor_and_strength(fresh_catalog_cache):
+    snapshot = asyncio.run(fresh_catalog_cache.get_snapshot())
+    terea_0 = snapshot.find_by_ref("terea-0")[1]
+
+    rail = asyncio.run(DevicesService.get_similar("terea", terea_0.id, limit=2))
+    # terea-6: тот же вкус (Ментол) и та же крепость; terea-4 - тот же вкус
+    assert [item.product.ref for item in rail.products] == ["terea-6", "terea-4"]
+
+
+def test_similar_for_unknown_product_is_not_found(fresh_catalog_cache):
+    with pytest.raises(ValueError, match="не найден"):
+        asyncio.run(DevicesService.get_similar("terea", -1, limit=2))
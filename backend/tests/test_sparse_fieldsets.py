@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from backend.app.api.schemas.filters_schemas import ProductFilters
+from backend.app.api.schemas.terea_schemas import TEREA_CARD_FIELDS
+from backend.app.services.products_service import DevicesService
+
+
+def test_card_view_drops_description(fresh_catalog_cache):
+    response = asyncio.run(DevicesService.get_terea_list(limit=3, view="card"))
+
+    assert len(response.terea) == 3
+    for terea in response.terea:
+        assert list(terea) == list(TEREA_CARD_FIELDS)
+        assert "description" not in terea
+
+
+def test_fields_from_snapshot_and_filtered_query(fresh_catalog_cache):
+    snapshot_page = asyncio.run(DevicesService.get_iqos_list(limit=2, fields=["price", "name", "price"]))
+    assert [list(iqos) for iqos in snapshot_page.iqos] == [["id", "name", "price"]] * 2
+
+    # Отфильтрованная страница читается из БД только нужными колонками, категория подставляется из снапшота
+    filtered = asyncio.run(DevicesService.get_terea_list(
+        limit=10, fields=["name", "category"], filters=ProductFilters(strength=["Легкие"], sort="price_asc")
+    ))
+    assert filtered.terea == [
+        {"id": 1, "name": "Terea Sienna 0", "category": {"id": 1, "category_name": "Армения"}},
+        {"id": 4, "name": "Terea Sienna 3", "category": {"id": 1, "category_name": "Армения"}},
+        {"id": 7, "name": "Terea Sienna 6", "category": {"id": 2, "category_name": "Казахстан"}},
+    ]
+
+
+def test_unknown_field_is_rejected(fresh_catalog_cache):
+    with pytest.raises(ValueError, match="Неизвестные поля: secret"):
+        asyncio.run(DevicesService.get_devices(fields=["name", "secret"]))
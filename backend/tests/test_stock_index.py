@@ -0,0 +1,35 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from backend.app.api.schemas import IqosSchema
+from backend.app.cache.stock_index import StockIndex
+from backend.app.services.products_service import DevicesService
+
+
+def test_stock_by_ref(fresh_catalog_cache):
+    response = asyncio.run(DevicesService.get_stock(["terea-3", "terea-2", "iqos-1", "device-1", "missing", "terea-2"]))
+
+    # [наличие, цена, цена блока, цена со скидкой]; у девайсов нет ни блока, ни скидки
+    assert response.stock == {
+        "terea-3": (0, 5030, 510, None),
+        "terea-2": (1, 5020, 510, None),
+        "iqos-1": (1, 9500, None, None),
+        "device-1": (1, 2090, None, None),
+    }
+    assert response.missing == ["missing"]
+
+
+def test_sale_price_is_kept():
+    iqos = IqosSchema.model_construct(ref="iqos-sale", nalichie=1, price=Decimal(9990), sale_price=Decimal(8990))
+    index = StockIndex([iqos])
+
+    assert len(index) == 1
+    assert index.get("iqos-sale") == (1, 9990, None, 8990)
+    assert index.get("iqos") is None and index.get("iqos-z") is None
+
+
+def test_empty_refs_are_rejected(fresh_catalog_cache):
+    with pytest.raises(ValueError, match="хотя бы один ref"):
+        asyncio.run(DevicesService.get_stock([]))
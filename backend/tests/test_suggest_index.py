@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+from backend.app.cache.suggest_index import SuggestIndex
+from backend.app.services.products_service import DevicesService
+
+
+def _terea(name: str, ref: str, hit: int = 0, nalichie: int = 1, **attributes) -> tuple:
+    return "terea", SimpleNamespace(name=name, ref=ref, hit=hit, nalichie=nalichie, **attributes)
+
+
+def test_prefix_matches_any_word_of_name():
+    index = SuggestIndex([_terea("Terea Sienna", "sienna"), _terea("Terea Amber", "amber")], sales={})
+
+    assert [entry[4] for entry in index.suggest("sien", 10)] == ["sienna"]
+    assert sorted(entry[4] for entry in index.suggest("Terea", 10)) == ["amber", "sienna"]
+    assert index.suggest("xyz", 10) == []
+    assert index.suggest("  ", 10) == []
+
+
+def test_popular_products_first():
+    index = SuggestIndex([
+        _terea("Terea Amber", "amber"),
+        _terea("Terea Amber Hit", "amber-hit", hit=1),
+        _terea("Terea Amber Gold", "amber-gold"),
+    ], sales={"Terea Amber Gold": 3})
+
+    assert [entry[4] for entry in index.suggest("amb", 2)] == ["amber-gold", "amber-hit"]
+
+
+def test_repeated_word_yields_one_suggestion():
+    index = SuggestIndex([_terea("Sienna Sienna", "double")], sales={})
+    assert len(index.suggest("sienna", 10)) == 1
+
+
+def test_attribute_values_are_suggested():
+    index = SuggestIndex([
+        _terea("Terea Green", "green", flavor={"Ментол"}, country="Казахстан"),
+        _terea("Terea Turquoise", "turquoise", flavor={"Ментол", "Фруктовый вкус"}, country="Армения"),
+    ], sales={})
+
+    [menthol] = index.suggest("мент", 10)
+    assert (menthol[1], menthol[2], menthol[3], menthol[4]) == ("Ментол", "flavor", "terea", None)
+    assert [entry[1:3] for entry in index.suggest("казах", 10)] == [("Казахстан", "country")]
+
+
+def test_suggest_endpoint_over_catalog(fresh_catalog_cache):
+    response = asyncio.run(DevicesService.suggest_products("ilu", limit=3))
+    assert len(response.suggestions) == 3
+    assert all(suggestion.kind == "product" and suggestion.type == "iqos" for suggestion in response.suggestions)
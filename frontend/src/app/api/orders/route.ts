@@ -6,9 +6,15 @@ export async function POST(req: NextRequest) {
   try {
     const body = await req.json();
 
+    const headers: Record<string, string> = { "Content-Type": "application/json" };
+    const idempotencyKey = req.headers.get("Idempotency-Key");
+    if (idempotencyKey) {
+      headers["Idempotency-Key"] = idempotencyKey;
+    }
+
     const res = await fetch(`${API_URL}/orders`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers,
       body: JSON.stringify(body),
     });
 
@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useCart } from "@/context/CartContext";
 import { useRouter } from "next/navigation";
 import Image from "next/image";
@@ -19,6 +19,23 @@ const MIN_ORDER_AMOUNT = 3500; // 3.5 тысячи рублей
 
 const site = "terea-store.ru";
 
+// crypto.randomUUID есть только в защищённом контексте (https, localhost), иначе собираем UUID v4 вручную
+function createIdempotencyKey(): string {
+  if (typeof crypto !== "undefined" && typeof crypto.randomUUID === "function") {
+    return crypto.randomUUID();
+  }
+  const bytes = new Uint8Array(16);
+  if (typeof crypto !== "undefined" && typeof crypto.getRandomValues === "function") {
+    crypto.getRandomValues(bytes);
+  } else {
+    for (let i = 0; i < bytes.length; i++) bytes[i] = Math.floor(Math.random() * 256);
+  }
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, "0")).join("");
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
+
 export default function CheckoutPage() {
   function encodeImageUrl(url: string): string {
     if (!url) return "https://placehold.net/600x600.png";
@@ -46,6 +63,9 @@ export default function CheckoutPage() {
   const router = useRouter();
 
   const [isSubmitting, setIsSubmitting] = useState(false);
+  // Ключ привязан к содержимому заказа: повторная отправка того же заказа не создаст дубль,
+  // а изменённый заказ уходит с новым ключом. Создаётся при первой отправке, а не на каждом рендере
+  const idempotencyKeyRef = useRef<{ key: string; body: string } | null>(null);
   const [deliveryMethod, setDeliveryMethod] =
     useState<DeliveryMethod>("delivery"); // По умолчанию доставка
   const [agreementChecked, setAgreementChecked] = useState(false); // Добавлено состояние для чекбокса
@@ -811,11 +831,19 @@ ${orderData.ordered_items
         })),
       };
 
+      const body = JSON.stringify(orderPayload);
+      if (!idempotencyKeyRef.current || idempotencyKeyRef.current.body !== body) {
+        idempotencyKeyRef.current = { key: createIdempotencyKey(), body };
+      }
+
       // 🔥 Отправляем заказ на бэкенд
       const res = await fetch("/api/orders", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(orderPayload),
+        headers: {
+          "Content-Type": "application/json",
+          "Idempotency-Key": idempotencyKeyRef.current.key,
+        },
+        body,
       });
 
       if (!res.ok) {
@@ -842,6 +870,7 @@ ${orderData.ordered_items
         // Продолжаем выполнение, так как основной заказ сохранен
       }
 
+      idempotencyKeyRef.current = null;
       clearCart();
       router.push("/order-success");
     } catch (error) {